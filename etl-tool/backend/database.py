@@ -4,10 +4,11 @@ PostgreSQL database connection and configuration
 import asyncpg
 import psycopg2
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
-from typing import Optional
+from typing import Dict, Optional
 from datetime import datetime, timedelta
 import os
 import json
+import orjson
 import logging
 from dotenv import load_dotenv
 
@@ -26,6 +27,115 @@ POSTGRES_DB = os.getenv("POSTGRES_DB", "etl_tool")
 # Global connection pool
 pool: Optional[asyncpg.Pool] = None
 
+# LISTEN/NOTIFY channel fired with the connector_id of newly inserted api_connector_data rows
+VIZ_REFRESH_CHANNEL = "viz_refresh"
+
+# Session settings sent at connection startup, so they survive the pool's RESET ALL.
+# The hot queries are small OLTP plans: JIT compilation only adds latency to them.
+SERVER_SETTINGS = {"jit": "off"}
+
+# Hot SQL statements of long-lived dedicated connections (name -> SQL text)
+PREPARED_SQL: Dict[str, str] = {}
+
+
+class PreparedConnection(asyncpg.Connection):
+    """Connection that keeps its explicitly prepared hot statements"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.statements: Dict[str, asyncpg.prepared_stmt.PreparedStatement] = {}
+
+
+def register_prepared_statement(name: str, sql: str):
+    """Register SQL text to be prepared on dedicated connections"""
+    PREPARED_SQL[name] = sql
+
+
+async def get_statement(conn, name: str):
+    """
+    Return the statement registered under name for a dedicated connection,
+    preparing it on first use (tables may not exist yet when the connection
+    opens) and reusing it for the connection's lifetime.
+    """
+    stmt = conn.statements.get(name)
+    if stmt is None:
+        stmt = await conn.prepare(PREPARED_SQL[name])
+        conn.statements[name] = stmt
+    return stmt
+
+
+async def _init_pool_connection(conn):
+    """Pool init hook: exchange jsonb in binary format (see _encode_jsonb)"""
+    await conn.set_type_codec(
+        "jsonb", encoder=_encode_jsonb, decoder=_decode_jsonb,
+        schema="pg_catalog", format="binary"
+    )
+
+
+async def prepare_statements(conn, names):
+    """Eagerly prepare registered statements on a long-lived connection"""
+    for name in names:
+        await get_statement(conn, name)
+
+
+def _dumps(value) -> bytes:
+    """Serialize to JSON bytes with orjson, falling back to the stdlib for what it rejects"""
+    try:
+        return orjson.dumps(value)
+    except TypeError:
+        # orjson is stricter than stdlib (integers beyond 64 bits)
+        return json.dumps(value).encode()
+
+
+def _encode_json(value) -> str:
+    """JSON/JSONB encoder: text that is already serialized passes through unchanged"""
+    if isinstance(value, str):
+        return value
+    return _dumps(value).decode()
+
+
+def _encode_jsonb(value) -> bytes:
+    """Binary JSONB encoder: version byte followed by the JSON text; dicts are serialized with _dumps"""
+    if isinstance(value, bytes):
+        return b"\x01" + value
+    if isinstance(value, str):
+        return b"\x01" + value.encode()
+    return b"\x01" + _dumps(value)
+
+
+def _decode_jsonb(data: bytes) -> str:
+    """Binary JSONB decoder for pooled connections: returns the JSON text, as the text codec did"""
+    return data[1:].decode()
+
+
+async def set_json_codecs(conn):
+    """Decode json/jsonb columns straight into Python objects with orjson"""
+    for typename in ("jsonb", "json"):
+        await conn.set_type_codec(
+            typename, encoder=_encode_json, decoder=orjson.loads, schema="pg_catalog"
+        )
+
+
+async def connect_dedicated(json_codecs: bool = False):
+    """
+    Open a standalone connection outside the pool for a long-lived task
+    (e.g. a LISTEN subscriber). Pooled connections keep returning JSON as
+    text because API handlers pass those values through as-is.
+    """
+    conn = await asyncpg.connect(
+        host=POSTGRES_HOST,
+        port=POSTGRES_PORT,
+        user=POSTGRES_USER,
+        password=POSTGRES_PASSWORD,
+        database=POSTGRES_DB,
+        timeout=10,
+        connection_class=PreparedConnection,
+        server_settings=SERVER_SETTINGS
+    )
+    if json_codecs:
+        await set_json_codecs(conn)
+    return conn
+
 
 async def connect_to_postgres():
     """Create database connection pool and initialize tables"""
@@ -44,7 +154,9 @@ async def connect_to_postgres():
             database=POSTGRES_DB,
             min_size=5,
             max_size=20,
-            timeout=10  # Connection timeout in seconds
+            timeout=10,  # Connection timeout in seconds
+            server_settings=SERVER_SETTINGS,
+            init=_init_pool_connection
         )
         
         # Test the connection
@@ -206,6 +318,15 @@ async def _initialize_tables():
             CREATE INDEX IF NOT EXISTS idx_websocket_messages_instrument 
             ON websocket_messages(instrument)
         """)
+        # Keyset pagination of /api/websocket/data (ORDER BY timestamp, id)
+        await conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_websocket_messages_timestamp_id
+            ON websocket_messages(timestamp DESC, id DESC)
+        """)
+        await conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_websocket_messages_exchange_instrument_timestamp_id
+            ON websocket_messages(exchange, instrument, timestamp DESC, id DESC)
+        """)
         # Removed indexes related to dropped columns
 
         # Create users table for authentication
@@ -293,6 +414,10 @@ async def _initialize_tables():
             CREATE INDEX IF NOT EXISTS idx_websocket_batches_timestamp_exchange 
             ON websocket_batches(timestamp DESC, exchange)
         """)
+        await conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_websocket_batches_timestamp_id
+            ON websocket_batches(timestamp DESC, id DESC)
+        """)
         
         # Create api_connectors table
         await conn.execute("""
@@ -458,6 +583,14 @@ async def _initialize_tables():
                 ) THEN
                     ALTER TABLE api_connector_data ADD COLUMN pipeline_run_id INTEGER;
                 END IF;
+
+                -- Ingestion run that wrote the row (one per fetch cycle)
+                IF NOT EXISTS (
+                    SELECT 1 FROM information_schema.columns
+                    WHERE table_name = 'api_connector_data' AND column_name = 'batch_id'
+                ) THEN
+                    ALTER TABLE api_connector_data ADD COLUMN batch_id UUID;
+                END IF;
             END $$;
         """)
         
@@ -489,6 +622,13 @@ async def _initialize_tables():
             WHERE delta_type IS NOT NULL
         """)
         
+        # Rows of one ingestion run are looked up by equality on batch_id
+        await conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_api_connector_data_batch_id
+            ON api_connector_data(connector_id, batch_id)
+            WHERE batch_id IS NOT NULL
+        """)
+        
         # Create indexes for api_connector_data
         await conn.execute("""
             CREATE INDEX IF NOT EXISTS idx_api_connector_data_connector_id 
@@ -502,6 +642,11 @@ async def _initialize_tables():
             CREATE INDEX IF NOT EXISTS idx_api_connector_data_updated_at 
             ON api_connector_data(connector_id, updated_at DESC)
         """)
+        # Latest-row and latest-batch lookups (WHERE connector_id = $1 ORDER BY timestamp DESC)
+        await conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_api_connector_data_connector_timestamp
+            ON api_connector_data(connector_id, timestamp DESC)
+        """)
         # Removed indexes related to dropped columns
         
         # Create api_connector_items table for granular individual items from API responses
@@ -802,6 +947,36 @@ async def _initialize_tables():
             CREATE INDEX IF NOT EXISTS idx_visualization_data_timestamp
             ON visualization_data(timestamp DESC)
         """)
+        # Keyset pagination: (timestamp, id) cursor per data_type
+        await conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_visualization_data_type_timestamp_id
+            ON visualization_data(data_type, timestamp DESC, id DESC)
+        """)
+
+        # Create coins table: latest state of each CoinGecko market coin, one column
+        # per field the crypto endpoints filter or sort on (everything else in extra)
+        await conn.execute("""
+            CREATE TABLE IF NOT EXISTS coins (
+                id TEXT PRIMARY KEY,
+                symbol TEXT,
+                name TEXT,
+                current_price NUMERIC,
+                market_cap NUMERIC,
+                total_volume NUMERIC,
+                position INTEGER NOT NULL,  -- Order of the coin in its batch
+                batch_id UUID NOT NULL,  -- Ingestion run that last wrote the coin
+                timestamp TIMESTAMP WITH TIME ZONE NOT NULL,
+                extra JSONB NOT NULL DEFAULT '{}'::jsonb
+            )
+        """)
+        await conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_coins_timestamp
+            ON coins(timestamp DESC)
+        """)
+        await conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_coins_batch_id
+            ON coins(batch_id, position)
+        """)
 
         # Create failed_api_calls table for observability
         await conn.execute("""
@@ -852,6 +1027,27 @@ async def _initialize_tables():
             ON delta_metadata(connector_id)
         """)
 
+        # Notify listeners (the visualization updater) when connector data lands:
+        # one statement-level trigger, one NOTIFY per distinct connector_id
+        await conn.execute(f"""
+            CREATE OR REPLACE FUNCTION notify_api_connector_data() RETURNS trigger AS $$
+            BEGIN
+                PERFORM pg_notify('{VIZ_REFRESH_CHANNEL}', connector_id)
+                FROM (SELECT DISTINCT connector_id FROM new_rows) AS inserted;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+        """)
+        await conn.execute("""
+            DROP TRIGGER IF EXISTS trg_api_connector_data_notify ON api_connector_data
+        """)
+        await conn.execute("""
+            CREATE TRIGGER trg_api_connector_data_notify
+            AFTER INSERT ON api_connector_data
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION notify_api_connector_data()
+        """)
+
         print("[OK] Initialized PostgreSQL tables with indexes")
 
 
@@ -1181,7 +1377,7 @@ async def get_pipeline_state(api_id: str, history_limit: int = 10):
         
         # 2. Fetch connector details for metadata
         connector = await conn.fetchrow(
-            "SELECT * FROM api_connectors WHERE connector_id = $1", 
+            "SELECT name, api_url, polling_interval FROM api_connectors WHERE connector_id = $1", 
             api_id
         )
         
@@ -1516,3 +1712,64 @@ async def get_max_updated_at(connector_id: str) -> Optional[datetime]:
             WHERE connector_id = $1
         """, connector_id)
         return result
+
+
+async def upsert_coins(batch_id: str, timestamp: datetime, coins_json: str) -> int:
+    """
+    Upsert a CoinGecko markets response into the coins table.
+    
+    The JSON array is split into columns server-side; coins without an id are
+    skipped and a repeated id keeps its first position.
+    
+    Args:
+        batch_id: Ingestion run the coins belong to
+        timestamp: Ingestion timestamp
+        coins_json: JSON array of coin objects
+    
+    Returns:
+        Number of coins written
+    """
+    if pool is None:
+        raise RuntimeError("Database pool not initialized")
+    
+    async with pool.acquire() as conn:
+        return await conn.fetchval("""
+            WITH src AS (
+                SELECT DISTINCT ON (elem.value ->> 'id')
+                       elem.value AS coin, elem.ord
+                FROM jsonb_array_elements($3::jsonb) WITH ORDINALITY AS elem(value, ord)
+                WHERE jsonb_typeof(elem.value) = 'object'
+                AND elem.value ->> 'id' IS NOT NULL
+                ORDER BY elem.value ->> 'id', elem.ord
+            ),
+            upserted AS (
+                INSERT INTO coins (
+                    id, symbol, name, current_price, market_cap, total_volume,
+                    position, batch_id, timestamp, extra
+                )
+                SELECT coin ->> 'id',
+                       coin ->> 'symbol',
+                       coin ->> 'name',
+                       CASE WHEN jsonb_typeof(coin -> 'current_price') = 'number' THEN (coin ->> 'current_price')::numeric END,
+                       CASE WHEN jsonb_typeof(coin -> 'market_cap') = 'number' THEN (coin ->> 'market_cap')::numeric END,
+                       CASE WHEN jsonb_typeof(coin -> 'total_volume') = 'number' THEN (coin ->> 'total_volume')::numeric END,
+                       ord,
+                       $1,
+                       $2,
+                       coin - ARRAY['id', 'symbol', 'name', 'current_price', 'market_cap', 'total_volume']
+                FROM src
+                ON CONFLICT (id)
+                DO UPDATE SET
+                    symbol = EXCLUDED.symbol,
+                    name = EXCLUDED.name,
+                    current_price = EXCLUDED.current_price,
+                    market_cap = EXCLUDED.market_cap,
+                    total_volume = EXCLUDED.total_volume,
+                    position = EXCLUDED.position,
+                    batch_id = EXCLUDED.batch_id,
+                    timestamp = EXCLUDED.timestamp,
+                    extra = EXCLUDED.extra
+                RETURNING 1
+            )
+            SELECT count(*) FROM upserted
+        """, batch_id, timestamp, coins_json)
@@ -10,6 +10,7 @@ from datetime import datetime, timedelta
 from typing import Callable, Dict, List, Any
 import requests
 import time
+import uuid
 
 from database import (
     complete_pipeline_run,
@@ -297,6 +298,7 @@ class JobScheduler:
                 "status_code": response.status_code,
                 "response_time_ms": response_time_ms,
                 "pipeline_run_id": pipeline_run_id,  # Add pipeline_run_id for delta tracking
+                "batch_id": str(uuid.uuid4()),  # Tags every row written by this fetch cycle
             }
             
             # Schedule async save on event loop
@@ -1,16 +1,18 @@
 from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, UploadFile, File, Query, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, ORJSONResponse, Response, StreamingResponse
 from fastapi.exception_handlers import http_exception_handler
 from starlette.exceptions import HTTPException as StarletteHTTPException
+from starlette.websockets import WebSocketState
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any, Set
+from typing import List, Optional, Dict, Any, Set, Callable, Tuple, Awaitable, AsyncIterator
 import uvicorn
-from datetime import datetime, timedelta
-import requests
+from datetime import datetime, timedelta, timezone
+import aiohttp
 import json
+import orjson
 from contextlib import asynccontextmanager
 import uuid
 import asyncio
@@ -18,11 +20,16 @@ import logging
 import os
 from pathlib import Path
 import pandas as pd
+import numpy as np
 import shutil
+import threading
 import time
+from decimal import Decimal
+import traceback
 
 from dotenv import load_dotenv
 load_dotenv(override=True)
+import base64
 import hashlib
 import secrets
 
@@ -42,6 +49,13 @@ from database import (
     get_pipeline_state,
     update_pipeline_counts,
     get_failed_api_calls,
+    initialize_scheduled_connectors,
+    register_prepared_statement,
+    get_statement,
+    prepare_statements,
+    connect_dedicated,
+    VIZ_REFRESH_CHANNEL,
+    _dumps,
 )
 from models.websocket_data import WebSocketMessage, WebSocketBatch
 from models.connector import (
@@ -50,8 +64,10 @@ from models.connector import (
 )
 from services.encryption import get_encryption_service
 from services.connector_manager import get_connector_manager
+from connectors.connector_factory import ConnectorFactory
 from services.message_processor import MessageProcessor
 from services.websocket_stream_manager import WebSocketStreamManager
+from services.ws_fields import find_price, first_price
 
 from job_scheduler import start_job_scheduler, stop_job_scheduler
 from job_scheduler.pipeline_tracker import start_pipeline_tracker
@@ -149,6 +165,12 @@ SCHEDULED_APIS = [
     }
 ]
 
+# Rows of one scheduler batch land within this much of the batch's latest timestamp
+VIZ_BATCH_WINDOW = timedelta(seconds=2)
+
+# Scheduled connector ids, for O(1) membership checks on every save
+_SCHEDULED_API_IDS = frozenset(api.get("connector_id") or api.get("id") for api in SCHEDULED_APIS)
+
 async def ensure_scheduled_connectors():
     pool = get_pool()
     async with pool.acquire() as conn:
@@ -247,7 +269,6 @@ async def lifespan(app: FastAPI):
     
     # Initialize scheduled connector records
     try:
-        from database import initialize_scheduled_connectors
         await initialize_scheduled_connectors()
     except Exception as e:
         logger.warning(f"[STARTUP] Could not initialize scheduled connectors: {e}")
@@ -264,7 +285,6 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.error(f"[STARTUP] ❌ Failed to start job scheduler: {e}")
             print(f"[STARTUP] ❌ Failed to start job scheduler: {e}")
-            import traceback
             traceback.print_exc()
     
     # Run scheduler starts in the event loop after a brief delay to ensure app is ready
@@ -278,15 +298,37 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"[STARTUP] ❌ Failed to start pipeline tracker: {e}")
 
+    # Shared HTTP client for outbound exchange lookups: pooled keep-alive connections
+    app.state.http = aiohttp.ClientSession(
+        timeout=aiohttp.ClientTimeout(total=10),
+        connector=aiohttp.TCPConnector(limit=100, limit_per_host=20)
+    )
+
+    # Start the visualization updater (driven by viz_refresh notifications)
+    stop_viz_updater = start_visualization_updater_thread()
+    logger.info("[STARTUP] ✅ Continuous visualization updater started (LISTEN viz_refresh)")
+
     yield
     
     # Shutdown: Stop schedulers and close PostgreSQL connection
+    await stop_viz_updater()
+    await app.state.http.close()
     try:
         stop_job_scheduler()
         logger.info("[SHUTDOWN] Job scheduler stopped successfully")
     except Exception as e:
         logger.error(f"[SHUTDOWN] Error stopping job scheduler: {e}")
     
+    try:
+        await stop_ws_save_flusher()
+    except Exception as e:
+        logger.error("[SHUTDOWN] Error stopping WebSocket save flusher: %s", e)
+    
+    try:
+        await stop_connector_status_flusher()
+    except Exception as e:
+        logger.error("[SHUTDOWN] Error stopping connector status flusher: %s", e)
+    
     await close_postgres_connection()
 
 
@@ -460,7 +502,464 @@ async def me(current_user=Depends(get_current_user)):
 
 
 
+# Hot statements, prepared once per pooled connection
+_SQL_INSERT_VIZ = """
+    INSERT INTO visualization_data (data_type, timestamp, data, metadata, updated_at)
+    VALUES ($1, $2, $3, $4, NOW())
+    ON CONFLICT (data_type, timestamp)
+    DO UPDATE SET
+        data = EXCLUDED.data,
+        metadata = EXCLUDED.metadata,
+        updated_at = NOW()
+"""
+
+_SQL_FETCH_VIZ_WINDOW = """
+    SELECT data, raw_response, timestamp
+    FROM api_connector_data
+    WHERE connector_id = $1
+    AND timestamp >= $2
+    AND timestamp <= $3
+    ORDER BY id
+"""
+
+# Rows written by one ingestion run; rows saved before batch_id existed use the window above
+_SQL_FETCH_VIZ_BATCH = """
+    SELECT data, raw_response, timestamp
+    FROM api_connector_data
+    WHERE connector_id = $1
+    AND batch_id = $2
+    ORDER BY id
+"""
+
+_SQL_INSERT_API_DATA = """
+    INSERT INTO api_connector_data (
+        connector_id, timestamp, exchange, instrument, price, data,
+        message_type, raw_response, status_code, response_time_ms, source_id, session_id, batch_id
+    ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13)
+    RETURNING id
+"""
+
+# One round trip for list payloads; per-row columns arrive as parallel arrays
+_SQL_INSERT_API_DATA_BATCH = """
+    INSERT INTO api_connector_data (
+        connector_id, timestamp, exchange, instrument, price, data,
+        message_type, raw_response, status_code, response_time_ms, source_id, session_id, batch_id
+    )
+    SELECT $1::varchar, $2::timestamptz, $3::varchar, r.instrument, r.price, r.data::jsonb,
+           $4::varchar, r.raw::jsonb, $5::int, $6::int, r.source_id, $7::varchar, $13::uuid
+    FROM unnest($8::varchar[], $9::numeric[], $10::text[], $11::text[], $12::varchar[])
+         WITH ORDINALITY AS r(instrument, price, data, raw, source_id, ord)
+    ORDER BY r.ord
+    RETURNING id
+"""
+
+_SQL_INSERT_WS_MESSAGE = """
+    INSERT INTO websocket_messages (
+        timestamp, exchange, instrument, price, data, message_type,
+        latency_ms, message_number, format, extract_time, transform_time,
+        load_time, total_time
+    ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13)
+    RETURNING id
+"""
+
+# Multi-row variant used by the /api/websocket/save flusher: one array per column
+_SQL_INSERT_WS_MESSAGES = """
+    INSERT INTO websocket_messages (
+        timestamp, exchange, instrument, price, data, message_type,
+        latency_ms, message_number, format, extract_time, transform_time,
+        load_time, total_time
+    )
+    SELECT ts, exchange, instrument, price, data, message_type,
+        latency_ms, message_number, format, extract_time, transform_time,
+        load_time, total_time
+    FROM unnest(
+        $1::timestamptz[], $2::varchar[], $3::varchar[], $4::numeric[], $5::jsonb[],
+        $6::varchar[], $7::int[], $8::int[], $9::varchar[], $10::numeric[],
+        $11::numeric[], $12::numeric[], $13::numeric[]
+    ) WITH ORDINALITY AS t(
+        ts, exchange, instrument, price, data, message_type,
+        latency_ms, message_number, format, extract_time, transform_time,
+        load_time, total_time, n
+    )
+    ORDER BY n
+    RETURNING id
+"""
+
+# Stream-manager variant without the client-side timing columns
+_SQL_INSERT_WS_MESSAGE_SHORT = """
+    INSERT INTO websocket_messages (
+        timestamp, exchange, instrument, price, data, message_type
+    ) VALUES ($1, $2, $3, $4, $5, $6)
+    RETURNING id
+"""
+
+# Monitoring views of visualization_data
+_SQL_VIZ_LIST = """
+    SELECT id, data_type, timestamp, data, metadata, created_at, updated_at
+    FROM visualization_data
+    ORDER BY timestamp DESC, id DESC
+    LIMIT $1 OFFSET $2
+"""
+
+_SQL_VIZ_LIST_BY_TYPE = """
+    SELECT id, data_type, timestamp, data, metadata, created_at, updated_at
+    FROM visualization_data
+    WHERE data_type = $1
+    ORDER BY timestamp DESC, id DESC
+    LIMIT $2 OFFSET $3
+"""
+
+# Same pages carrying the total row count (computed before LIMIT/OFFSET), so a
+# page with its total needs no separate COUNT round trip
+_SQL_VIZ_LIST_COUNTED = """
+    SELECT id, data_type, timestamp, data, metadata, created_at, updated_at,
+           COUNT(*) OVER () AS total_count
+    FROM visualization_data
+    ORDER BY timestamp DESC, id DESC
+    LIMIT $1 OFFSET $2
+"""
+
+_SQL_VIZ_LIST_BY_TYPE_COUNTED = """
+    SELECT id, data_type, timestamp, data, metadata, created_at, updated_at,
+           COUNT(*) OVER () AS total_count
+    FROM visualization_data
+    WHERE data_type = $1
+    ORDER BY timestamp DESC, id DESC
+    LIMIT $2 OFFSET $3
+"""
+
+# Keyset pages: rows strictly after the (timestamp, id) cursor, an index seek at any depth
+_SQL_VIZ_LIST_AFTER = """
+    SELECT id, data_type, timestamp, data, metadata, created_at, updated_at
+    FROM visualization_data
+    WHERE (timestamp, id) < ($1, $2)
+    ORDER BY timestamp DESC, id DESC
+    LIMIT $3
+"""
+
+_SQL_VIZ_LIST_BY_TYPE_AFTER = """
+    SELECT id, data_type, timestamp, data, metadata, created_at, updated_at
+    FROM visualization_data
+    WHERE data_type = $1
+    AND (timestamp, id) < ($2, $3)
+    ORDER BY timestamp DESC, id DESC
+    LIMIT $4
+"""
+
+_SQL_VIZ_COUNT = "SELECT COUNT(*) FROM visualization_data"
+
+_SQL_VIZ_COUNT_BY_TYPE = "SELECT COUNT(*) FROM visualization_data WHERE data_type = $1"
+
+_SQL_VIZ_LATEST = """
+    SELECT id, data_type, timestamp, data, metadata, created_at, updated_at
+    FROM visualization_data
+    WHERE data_type = $1
+    ORDER BY timestamp DESC
+    LIMIT 1
+"""
+
+# Latest row per connector in one round trip; LATERAL keeps each lookup a
+# LIMIT 1 index probe instead of sorting every row as DISTINCT ON would
+_SQL_LATEST_CONNECTOR_ROWS = """
+    SELECT latest.connector_id, latest.data, latest.raw_response, latest.timestamp, latest.batch_id
+    FROM unnest($1::varchar[]) AS wanted(connector_id)
+    CROSS JOIN LATERAL (
+        SELECT connector_id, data, raw_response, timestamp, batch_id
+        FROM api_connector_data
+        WHERE connector_id = wanted.connector_id
+        ORDER BY timestamp DESC
+        LIMIT 1
+    ) AS latest
+"""
+
+# Fallback-only statements (not prepared)
+_SQL_FETCH_ROW_AT = """
+    SELECT data, raw_response
+    FROM api_connector_data
+    WHERE connector_id = $1
+    AND timestamp = $2
+    LIMIT 1
+"""
+
+# Rebuild the markets snapshot server-side from the stored batch rows
+_SQL_REBUILD_MARKETS = """
+    WITH src AS (
+        SELECT id,
+               CASE WHEN data = '{}'::jsonb AND raw_response IS NOT NULL
+                    THEN raw_response ELSE data END AS payload
+        FROM api_connector_data
+        WHERE connector_id = $1
+        AND timestamp >= $2
+        AND timestamp <= $3
+    ),
+    coins AS (
+        SELECT src.id, elem.ord, elem.value AS coin
+        FROM src,
+             jsonb_array_elements(
+                 CASE
+                     WHEN jsonb_typeof(src.payload) = 'array' THEN src.payload
+                     WHEN jsonb_typeof(src.payload -> 'data') = 'array' THEN src.payload -> 'data'
+                     ELSE jsonb_build_array(src.payload)
+                 END
+             ) WITH ORDINALITY AS elem(value, ord)
+        WHERE jsonb_typeof(elem.value) = 'object'
+        AND (elem.value ? 'id' OR elem.value ? 'symbol' OR elem.value ? 'name' OR elem.value ? 'current_price')
+    )
+    INSERT INTO visualization_data (data_type, timestamp, data, metadata, updated_at)
+    SELECT 'markets', $4, jsonb_agg(coin ORDER BY id, ord),
+           jsonb_build_object('source', $1::text, 'total_coins', count(*)), NOW()
+    FROM coins
+    HAVING count(*) > 0
+    ON CONFLICT (data_type, timestamp)
+    DO UPDATE SET
+        data = EXCLUDED.data,
+        metadata = EXCLUDED.metadata,
+        updated_at = NOW()
+    RETURNING (metadata ->> 'total_coins')::int
+"""
+
+# One page of the latest markets snapshot: filter by id, sort and paginate server-side
+# so only the requested coins leave the database. Ties keep snapshot order.
+_SQL_MARKETS_PAGE = """
+    SELECT v.timestamp,
+           CASE WHEN jsonb_typeof(v.data) = 'array' THEN jsonb_array_length(v.data) ELSE 0 END AS total_coins,
+           COALESCE(p.matched, 0) AS matched_coins,
+           COALESCE(p.coins, '[]'::jsonb)::text AS coins
+    FROM (
+        SELECT data, timestamp
+        FROM visualization_data
+        WHERE data_type = 'markets'
+        ORDER BY timestamp DESC
+        LIMIT 1
+    ) v
+    CROSS JOIN LATERAL (
+        SELECT max(r.matched) AS matched,
+               jsonb_agg(
+                   CASE WHEN r.coin ? 'total_volume' AND NOT r.coin ? 'total_volume_24h'
+                        THEN r.coin || jsonb_build_object('total_volume_24h', r.coin -> 'total_volume')
+                        ELSE r.coin END
+                   ORDER BY r.rn
+               ) FILTER (WHERE r.rn > $4 AND r.rn <= $4 + $3) AS coins
+        FROM (
+            SELECT c.coin,
+                   count(*) OVER () AS matched,
+                   row_number() OVER (
+                       ORDER BY
+                           CASE WHEN $2 = 'market_cap_desc' THEN k.market_cap END DESC,
+                           CASE WHEN $2 = 'market_cap_asc' THEN k.market_cap END,
+                           CASE WHEN $2 = 'price_desc' THEN k.price END DESC,
+                           CASE WHEN $2 = 'price_asc' THEN k.price END,
+                           c.ord
+                   ) AS rn
+            FROM jsonb_array_elements(
+                     CASE WHEN jsonb_typeof(v.data) = 'array' THEN v.data ELSE '[]'::jsonb END
+                 ) WITH ORDINALITY AS c(coin, ord)
+            CROSS JOIN LATERAL (
+                SELECT CASE WHEN jsonb_typeof(c.coin -> 'market_cap') = 'number'
+                            THEN (c.coin ->> 'market_cap')::numeric ELSE 0 END AS market_cap,
+                       CASE WHEN jsonb_typeof(c.coin -> 'current_price') = 'number'
+                            THEN (c.coin ->> 'current_price')::numeric ELSE 0 END AS price
+            ) k
+            WHERE cardinality($1::text[]) = 0
+            OR lower(COALESCE(c.coin ->> 'id', '')) = ANY($1::text[])
+        ) r
+    ) p
+"""
+
+# One page of the latest batch in the coins table: plain column filter/sort, ties
+# keep batch order. Shared by the aggregated page and the row-per-coin cursor.
+_SQL_COINS_PAGE_CTES = """
+    WITH latest AS (
+        SELECT batch_id, timestamp
+        FROM coins
+        ORDER BY timestamp DESC
+        LIMIT 1
+    ),
+    page AS (
+        SELECT c.id,
+               c.extra || jsonb_build_object(
+                   'id', c.id,
+                   'symbol', c.symbol,
+                   'name', c.name,
+                   'current_price', c.current_price,
+                   'market_cap', c.market_cap,
+                   'total_volume', c.total_volume
+               ) || CASE WHEN c.total_volume IS NOT NULL AND NOT c.extra ? 'total_volume_24h'
+                         THEN jsonb_build_object('total_volume_24h', c.total_volume)
+                         ELSE '{}'::jsonb END AS coin,
+               count(*) OVER () AS matched,
+               row_number() OVER (
+                   ORDER BY
+                       CASE WHEN $2 = 'market_cap_desc' THEN COALESCE(c.market_cap, 0) END DESC,
+                       CASE WHEN $2 = 'market_cap_asc' THEN COALESCE(c.market_cap, 0) END,
+                       CASE WHEN $2 = 'price_desc' THEN COALESCE(c.current_price, 0) END DESC,
+                       CASE WHEN $2 = 'price_asc' THEN COALESCE(c.current_price, 0) END,
+                       c.position
+               ) AS rn
+        FROM coins c
+        JOIN latest ON c.batch_id = latest.batch_id
+        WHERE cardinality($1::text[]) = 0
+        OR lower(c.id) = ANY($1::text[])
+        ORDER BY rn
+        LIMIT $3 OFFSET $4
+    )
+"""
+
+# Same parameters and result columns as markets_page
+_SQL_COINS_PAGE = _SQL_COINS_PAGE_CTES + """
+    SELECT latest.timestamp,
+           (SELECT count(*) FROM coins WHERE batch_id = latest.batch_id) AS total_coins,
+           COALESCE(max(page.matched), 0) AS matched_coins,
+           COALESCE(jsonb_agg(page.coin ORDER BY page.rn) FILTER (WHERE page.id IS NOT NULL), '[]'::jsonb)::text AS coins
+    FROM latest
+    LEFT JOIN page ON true
+    GROUP BY latest.batch_id, latest.timestamp
+"""
+
+# The page as one JSON text row per coin, for streaming through a cursor
+_SQL_COINS_PAGE_ROWS = _SQL_COINS_PAGE_CTES + """
+    SELECT coin::text AS coin
+    FROM page
+    ORDER BY rn
+"""
+
+# Latest global_stats snapshot as JSON text ready to be sent as-is, or, when there
+# is none yet, the latest coingecko_global source row, in a single round trip
+_SQL_LATEST_GLOBAL_STATS = """
+    WITH viz AS (
+        SELECT 'visualization_data'::text AS source, data::text AS data, timestamp, NULL::text AS raw_response
+        FROM visualization_data
+        WHERE data_type = 'global_stats'
+        ORDER BY timestamp DESC
+        LIMIT 1
+    )
+    SELECT * FROM viz
+    UNION ALL
+    (
+        SELECT 'api_connector_data', data::text, timestamp, raw_response::text
+        FROM api_connector_data
+        WHERE connector_id = $1
+        AND NOT EXISTS (SELECT 1 FROM viz)
+        ORDER BY timestamp DESC
+        LIMIT 1
+    )
+"""
+
+# Rows of the latest batch of a connector (the ingestion run that wrote its newest
+# row), located and fetched in one statement. Rows saved before batch_id existed
+# fall back to the 1 second window around the newest row. Batches whose timestamp
+# is listed in $2 are already reconstructed in memory: only the timestamp comes back.
+_SQL_LATEST_BATCH_ROWS = """
+    WITH latest AS (
+        SELECT timestamp AS ts, batch_id
+        FROM api_connector_data
+        WHERE connector_id = $1
+        ORDER BY timestamp DESC
+        LIMIT 1
+    )
+    SELECT latest.ts, d.data, d.raw_response
+    FROM latest
+    LEFT JOIN LATERAL (
+        SELECT id, data, raw_response
+        FROM api_connector_data
+        WHERE connector_id = $1
+        AND batch_id = latest.batch_id
+        AND latest.ts <> ALL($2::timestamptz[])
+        UNION ALL
+        SELECT id, data, raw_response
+        FROM api_connector_data
+        WHERE connector_id = $1
+        AND latest.batch_id IS NULL
+        AND timestamp BETWEEN latest.ts - interval '1 second' AND latest.ts + interval '1 second'
+        AND latest.ts <> ALL($2::timestamptz[])
+    ) d ON true
+    ORDER BY d.id
+"""
+
+# Every row of a connector's latest ingestion run in one round trip: matched by
+# batch_id, or by a +/- $2 timestamp window for rows saved before batch_id existed
+_SQL_LATEST_BATCH_DATA = """
+    WITH latest AS (
+        SELECT timestamp AS ts, batch_id
+        FROM api_connector_data
+        WHERE connector_id = $1
+        ORDER BY timestamp DESC
+        LIMIT 1
+    )
+    SELECT d.data, d.raw_response, d.timestamp
+    FROM latest
+    JOIN LATERAL (
+        SELECT id, data, raw_response, timestamp
+        FROM api_connector_data
+        WHERE connector_id = $1
+        AND batch_id = latest.batch_id
+        UNION ALL
+        SELECT id, data, raw_response, timestamp
+        FROM api_connector_data
+        WHERE connector_id = $1
+        AND latest.batch_id IS NULL
+        AND timestamp BETWEEN latest.ts - $2::interval AND latest.ts + $2::interval
+    ) d ON true
+    ORDER BY d.id
+"""
+
+# Active connectors with their pipeline_steps counts and latest activity in one
+# statement. The COUNT(*) fallbacks only run for connectors without a
+# pipeline_steps row (CASE evaluates the subqueries lazily).
+_SQL_ACTIVE_ETL_APIS = """
+    SELECT
+        c.connector_id, c.name, c.api_url, c.polling_interval, c.exchange_name,
+        d.timestamp AS last_data_at, d.status_code, d.response_time_ms,
+        i.timestamp AS last_item_at,
+        CASE WHEN ps.pipeline_name IS NULL
+            THEN (SELECT COUNT(*) FROM api_connector_data WHERE connector_id = c.connector_id)
+            ELSE ps.extract_count
+        END AS total_data,
+        CASE WHEN ps.pipeline_name IS NULL
+            THEN (SELECT COUNT(*) FROM api_connector_items WHERE connector_id = c.connector_id)
+            ELSE ps.transform_count
+        END AS total_items
+    FROM api_connectors c
+    LEFT JOIN pipeline_steps ps ON ps.pipeline_name = c.connector_id
+    LEFT JOIN LATERAL (
+        SELECT timestamp, status_code, response_time_ms
+        FROM api_connector_data
+        WHERE connector_id = c.connector_id
+        ORDER BY timestamp DESC
+        LIMIT 1
+    ) d ON true
+    LEFT JOIN LATERAL (
+        SELECT timestamp
+        FROM api_connector_items
+        WHERE connector_id = c.connector_id
+        ORDER BY timestamp DESC
+        LIMIT 1
+    ) i ON true
+    WHERE c.status IN ('active', 'running', 'started', 'enabled')
+    ORDER BY c.connector_id
+"""
+
+# Write-behind api_connectors status updates, one row per connector in $1/$2
+_SQL_UPDATE_CONNECTOR_STATUSES = """
+    UPDATE api_connectors AS a
+    SET status = v.status, updated_at = NOW()
+    FROM unnest($1::text[], $2::text[]) AS v(connector_id, status)
+    WHERE a.connector_id = v.connector_id
+"""
+
+# Prepared on the dedicated visualization updater connection; pooled
+# connections rely on asyncpg's own statement cache
+register_prepared_statement("insert_viz", _SQL_INSERT_VIZ)
+register_prepared_statement("fetch_viz_window", _SQL_FETCH_VIZ_WINDOW)
+register_prepared_statement("fetch_viz_batch", _SQL_FETCH_VIZ_BATCH)
+register_prepared_statement("latest_connector_rows", _SQL_LATEST_CONNECTOR_ROWS)
+
+
 # WebSocket connection manager for real-time UI updates
+BROADCAST_SEND_TIMEOUT = 5.0  # seconds before a slow client is dropped
+BROADCAST_BATCH_SIZE = 64  # sends started per event-loop turn during fan-out
+
+
 class ConnectionManager:
     def __init__(self):
         self.active_connections: Set[WebSocket] = set()
@@ -474,26 +973,48 @@ class ConnectionManager:
         self.active_connections.discard(websocket)
         logger.info(f"WebSocket client disconnected. Total connections: {len(self.active_connections)}")
     
+    async def _safe_send(self, connection: WebSocket, payload: str) -> Optional[WebSocket]:
+        """Send a pre-serialized payload to one client; return it back if the send failed"""
+        try:
+            await asyncio.wait_for(connection.send_text(payload), timeout=BROADCAST_SEND_TIMEOUT)
+            return None
+        except Exception as e:
+            logger.error("Error broadcasting to client: %s", e)
+            return connection
+    
     async def broadcast(self, message: dict):
         """Broadcast message to all connected clients"""
+        await self.broadcast_bytes(orjson.dumps(message, default=str))
+    
+    async def broadcast_bytes(self, payload: bytes):
+        """Broadcast an already-serialized JSON payload to all connected clients"""
         if not self.active_connections:
             logger.debug("No active WebSocket connections to broadcast to")
             return
         
+        # Prune sockets that already closed instead of awaiting a send that must fail
+        for connection in [c for c in self.active_connections if c.application_state == WebSocketState.DISCONNECTED]:
+            self.disconnect(connection)
+        
         logger.info(f"Broadcasting to {len(self.active_connections)} WebSocket client(s)")
-        disconnected = set()
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-                logger.debug(f"Message broadcasted successfully to client")
-            except Exception as e:
- 
-                logger.error(f"Error broadcasting to client: {e}")
-                disconnected.add(connection)
+        # Frontend parses text frames, so decode once and reuse for every client
+        text = payload.decode()
+        connections = list(self.active_connections)
+        sends = []
+        for start in range(0, len(connections), BROADCAST_BATCH_SIZE):
+            sends.extend(
+                asyncio.create_task(self._safe_send(connection, text))
+                for connection in connections[start:start + BROADCAST_BATCH_SIZE]
+            )
+            # Yield between batches so other I/O is not starved by a large fan-out;
+            # batches still overlap, so a slow client never delays the next batch
+            await asyncio.sleep(0)
+        failed = await asyncio.gather(*sends)
         
         # Remove disconnected clients
-        for conn in disconnected:
-            self.disconnect(conn)
+        for conn in failed:
+            if conn is not None:
+                self.disconnect(conn)
 
 connection_manager = ConnectionManager()
 
@@ -558,17 +1079,6 @@ async def save_api_items_to_database(connector_id: str, api_name: str, response_
             else:
                 logger.warning(f"[ITEMS] ⚠️ No items inserted for {connector_id}")
             
-            # Update visualization_data table for coingecko APIs
-            # This ensures visualization_data is updated when scheduler saves data
-            if connector_id in ["coingecko_top", "coingecko_global"]:
-                try:
-                    # Schedule visualization update in background
-                    loop = asyncio.get_event_loop()
-                    loop.create_task(update_visualization_data(connector_id, response_data, timestamp, response_data))
-                    logger.debug(f"[ITEMS] Scheduled visualization_data update for {connector_id}")
-                except Exception as viz_error:
-                    logger.warning(f"[ITEMS] Could not schedule visualization_data update for {connector_id}: {viz_error}")
-            
             # Update pipeline counts immediately after saving items (real-time count updates)
             # Schedule in background to avoid blocking, but ensure it runs
             if items_inserted > 0:
@@ -581,7 +1091,6 @@ async def save_api_items_to_database(connector_id: str, api_name: str, response_
     
     except Exception as e:
         logger.error(f"[ITEMS] ❌ Error saving API items: {e}")
-        import traceback
         traceback.print_exc()
 
 
@@ -735,236 +1244,297 @@ def _extract_api_items(connector_id: str, response_data: dict) -> List[dict]:
     return items if items else [{"coin_name": connector_id, "coin_symbol": connector_id, "price": 0.0, "raw_item": response_data}]
 
 
+def _loads(value: Any) -> Any:
+    """Decode JSON text (str/bytes); anything else, or invalid JSON, is returned unchanged"""
+    if not isinstance(value, (str, bytes, bytearray)):
+        return value
+    try:
+        return orjson.loads(value)
+    except orjson.JSONDecodeError:
+        # orjson is stricter than stdlib (NaN/Infinity, huge ints)
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+
+
+def _parse_timestamp(value: Any, default: Optional[datetime] = None) -> datetime:
+    """Parse an ISO-8601 timestamp, falling back to default or the current UTC time"""
+    if isinstance(value, datetime):
+        return value
+    fallback = default or datetime.now(timezone.utc)
+    if not value:
+        return fallback
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        # Python < 3.11 rejects the 'Z' suffix
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return fallback
+    except TypeError:
+        return fallback
+
+
+def _normalize_global_stats(result: dict):
+    """Alias CoinGecko's total_volume as total_volume_24h, which the frontend reads"""
+    inner = result.get("data")
+    if not isinstance(inner, dict):
+        inner = result
+    if "total_volume" in inner:
+        inner.setdefault("total_volume_24h", inner["total_volume"])
+
+
+def _is_coin(item: Any) -> bool:
+    """Check whether an object looks like a single CoinGecko market entry"""
+    return isinstance(item, dict) and bool(
+        item.get("id") or item.get("symbol") or item.get("name") or item.get("current_price") is not None
+    )
+
+
+def _dedupe_coins(coins: List[dict]) -> List[dict]:
+    """Drop repeated coins (by id, else symbol), keeping first position and latest values"""
+    return list({(c.get("id") or c.get("symbol") or id(c)): c for c in coins}.values())
+
+
+def _coins_from_list(data: Any) -> Optional[List[dict]]:
+    """Extractor for payloads that are a bare list of coins"""
+    if not isinstance(data, list):
+        return None
+    return [item for item in data if _is_coin(item)]
+
+
+def _coins_from_nested(data: Any) -> Optional[List[dict]]:
+    """Extractor for payloads wrapping the coin list under the "data" key"""
+    if not isinstance(data, dict) or not isinstance(data.get("data"), list):
+        return None
+    return [item for item in data["data"] if isinstance(item, dict)]
+
+
+# connector_id -> extractor specialised for the payload shape last seen from it
+_EXTRACT_CACHE: Dict[str, Callable[[Any], Optional[List[dict]]]] = {}
+
+
+def _extract_coins(data: Any, raw: Any = None, connector_id: Optional[str] = None) -> List[dict]:
+    """
+    Reconstruct the list of coin dicts from a stored coingecko_top payload.
+    Handles a list of coins, a single coin dict, a dict wrapping the list
+    (under "data" or any other key) and falls back to raw_response.
+    Payloads matching the shape last seen for connector_id skip the probing.
+    """
+    data = _loads(data)
+
+    extractor = _EXTRACT_CACHE.get(connector_id)
+    if extractor is not None:
+        coins = extractor(data)
+        if coins:
+            return coins
+
+    raw = _loads(raw)
+
+    coins = []
+
+    # Priority 1: data is a list (entire list stored in one row)
+    if isinstance(data, list):
+        coins = _coins_from_list(data)
+        if coins and connector_id:
+            _EXTRACT_CACHE[connector_id] = _coins_from_list
+
+    # Priority 2: data is a dict
+    elif isinstance(data, dict):
+        # Check if this is a single coin object
+        if _is_coin(data):
+            coins = [data]
+        # Check if data contains a nested list/array
+        elif isinstance(data.get("data"), list):
+            coins = _coins_from_nested(data)
+            if coins and connector_id:
+                _EXTRACT_CACHE[connector_id] = _coins_from_nested
+        # Check for other nested structures
+        else:
+            for value in data.values():
+                if isinstance(value, list):
+                    coins = [item for item in value if isinstance(item, dict) and (item.get("id") or item.get("symbol") or item.get("name"))]
+                    break
+
+    # Priority 3: raw_response contains the data
+    if not coins and raw:
+        if isinstance(raw, list):
+            coins = [item for item in raw if isinstance(item, dict)]
+        elif isinstance(raw, dict) and raw.get("id"):
+            coins = [raw]
+
+    return coins
+
+
+# Running follow-up job tasks; the event loop only keeps weak references to tasks
+_background_job_tasks: Set[asyncio.Task] = set()
+
+
+async def _run_background_jobs(tag: str, connector_id: str, jobs: List[Any]):
+    """Run independent follow-up coroutines concurrently and log any failures"""
+    results = await asyncio.gather(*jobs, return_exceptions=True)
+    for result in results:
+        if isinstance(result, Exception):
+            logger.error("[%s] ❌ Background update failed for %s: %s", tag, connector_id, result)
+
+
+# visualization_update frame text by (data_type, sent by the auto-refresh updater)
+_VIZ_UPDATE_MESSAGES = {
+    ("markets", False): "Market data updated",
+    ("markets", True): "Market data updated (auto-refresh)",
+    ("global_stats", False): "Global stats updated",
+    ("global_stats", True): "Global stats updated (auto-refresh)",
+}
+
+
+def _encode_viz_update(
+    data_type: str, connector_id: str, timestamp: datetime, total_coins: int = None, auto_refresh: bool = False
+) -> bytes:
+    """Pre-encode the visualization_update WebSocket frame shared by every sender"""
+    message = {
+        "type": "visualization_update",
+        "data_type": data_type,
+        "connector_id": connector_id,
+        "timestamp": timestamp,
+    }
+    if data_type == "markets":
+        message["total_coins"] = total_coins
+    message["message"] = _VIZ_UPDATE_MESSAGES[data_type, auto_refresh]
+    return orjson.dumps(message)
+
+
+# Coin lists at least this long are JSON-encoded in a worker thread, off the event loop
+OFFLOAD_ENCODE_MIN_ITEMS = 256
+
+
+async def _encode_coins(coins_list: List[dict]) -> str:
+    """orjson-encode a coin list to JSON text; large lists are encoded in a worker thread"""
+    if len(coins_list) >= OFFLOAD_ENCODE_MIN_ITEMS:
+        return (await asyncio.to_thread(orjson.dumps, coins_list)).decode()
+    return orjson.dumps(coins_list).decode()
+
+
+async def _broadcast_viz_update(payload: bytes, connector_id: str):
+    """Broadcast a pre-encoded visualization update; failures are logged, not raised"""
+    try:
+        await connection_manager.broadcast_bytes(payload)
+        logger.debug("✅ [VIZ] Broadcasted WebSocket update from %s", connector_id)
+    except Exception as ws_err:
+        logger.warning("[VIZ] Could not broadcast visualization update: %s", ws_err)
+
+
+async def _update_markets(conn, connector_id: str, data: Any, timestamp: datetime,
+                         raw_response: Any = None) -> Optional[bytes]:
+    """Refresh the markets snapshot from a coingecko_top batch; returns the encoded update"""
+    # Reconstruct coins list from the data we just saved
+    coins_list = _dedupe_coins(_extract_coins(data, raw_response, connector_id))
+
+    # If still no coins, rebuild from the stored rows server-side:
+    # a single statement flattens the batch and upserts it
+    if not coins_list:
+        logger.warning("[VIZ] No coins found in data, querying database as fallback for %s", connector_id)
+        time_lower = timestamp - VIZ_BATCH_WINDOW
+        time_upper = timestamp + VIZ_BATCH_WINDOW
+
+        total_coins = await conn.fetchval(
+            _SQL_REBUILD_MARKETS, connector_id, time_lower, time_upper, timestamp
+        )
+    else:
+        # Encode everything up front; the frame goes out once the upsert has committed
+        total_coins = len(coins_list)
+        coins_json = await _encode_coins(coins_list)
+        await conn.execute(
+            _SQL_INSERT_VIZ,
+            "markets",
+            timestamp,
+            coins_json,
+            orjson.dumps({"source": connector_id, "total_coins": total_coins}).decode()
+        )
+
+    if total_coins:
+        logger.info("✅ [VIZ] Updated visualization_data: markets (%s coins) at %s", total_coins, timestamp)
+        return _encode_viz_update("markets", connector_id, timestamp, total_coins)
+    logger.warning("[VIZ] No coins found to save for %s", connector_id)
+    return None
+
+
+async def _update_global(conn, connector_id: str, data: Any, timestamp: datetime,
+                         raw_response: Any = None) -> Optional[bytes]:
+    """Refresh the global_stats snapshot from a coingecko_global response; returns the encoded update"""
+    # Parse data if it's a string
+    data = _loads(data)
+    raw_response = _loads(raw_response)
+
+    result = None
+
+    # Try data field first
+    if isinstance(data, dict):
+        result = data
+    # Try raw_response as fallback
+    elif raw_response and isinstance(raw_response, dict):
+        result = raw_response
+
+    # If still no result, query database as fallback
+    if not result:
+        logger.warning("[VIZ] No data found, querying database as fallback for %s", connector_id)
+        row = await conn.fetchrow(_SQL_FETCH_ROW_AT, connector_id, timestamp)
+
+        if row:
+            viz_data = row["data"]
+            row_raw = row["raw_response"]
+
+            viz_data = _loads(viz_data)
+            row_raw = _loads(row_raw)
+
+            result = viz_data if isinstance(viz_data, dict) else (row_raw if isinstance(row_raw, dict) else None)
+
+    if result:
+        # Normalize field names
+        _normalize_global_stats(result)
+
+        # Save to visualization_data; the frame goes out once the upsert has committed
+        await conn.execute(
+            _SQL_INSERT_VIZ,
+            "global_stats",
+            timestamp,
+            orjson.dumps(result).decode(),
+            orjson.dumps({"source": connector_id}).decode()
+        )
+        logger.info("✅ [VIZ] Updated visualization_data: global_stats at %s", timestamp)
+        return _encode_viz_update("global_stats", connector_id, timestamp)
+    logger.warning("[VIZ] No global stats data found to save for %s", connector_id)
+    return None
+
+
+# Visualization refresh handlers keyed by connector_id
+_VIZ_HANDLERS = {
+    "coingecko_top": _update_markets,
+    "coingecko_global": _update_global,
+}
+
+
 async def update_visualization_data(connector_id: str, data: Any, timestamp: datetime, raw_response: Any = None):
     """
     Update visualization_data table when new data arrives.
     This ensures visualization_data is always up-to-date for real-time monitoring.
     Uses the data parameter directly instead of querying the database again.
     """
+    handler = _VIZ_HANDLERS.get(connector_id)
+    if handler is None:
+        return
     try:
         pool = get_pool()
         async with pool.acquire() as conn:
-            # Handle coingecko_top (markets data)
-            if connector_id == "coingecko_top":
-                # Parse data if it's a string
-                if isinstance(data, str):
-                    try:
-                        data = json.loads(data)
-                    except:
-                        pass
-                
-                if isinstance(raw_response, str):
-                    try:
-                        raw_response = json.loads(raw_response)
-                    except:
-                        pass
-                
-                # Reconstruct coins list from the data we just saved
-                coins_list = []
-                
-                # Priority 1: data is a list (entire list stored in one row)
-                if isinstance(data, list):
-                    for item in data:
-                        if isinstance(item, dict) and (item.get("id") or item.get("symbol") or item.get("name") or item.get("current_price") is not None):
-                            coins_list.append(item)
-                
-                # Priority 2: data is a dict
-                elif isinstance(data, dict):
-                    # Check if this is a single coin object
-                    if data.get("id") or data.get("symbol") or data.get("name") or data.get("current_price") is not None:
-                        coins_list.append(data)
-                    # Check if data contains a nested list/array
-                    elif "data" in data and isinstance(data["data"], list):
-                        coins_list.extend([item for item in data["data"] if isinstance(item, dict)])
-                    # Check for other nested structures
-                    elif any(isinstance(v, list) for v in data.values()):
-                        for key, value in data.items():
-                            if isinstance(value, list):
-                                coins_list.extend([item for item in value if isinstance(item, dict) and (item.get("id") or item.get("symbol") or item.get("name"))])
-                                break
-                
-                # Priority 3: raw_response contains the data
-                if not coins_list and raw_response:
-                    if isinstance(raw_response, list):
-                        coins_list.extend([item for item in raw_response if isinstance(item, dict)])
-                    elif isinstance(raw_response, dict) and raw_response.get("id"):
-                        coins_list.append(raw_response)
-                
-                # If still no coins, try querying database as fallback
-                if not coins_list:
-                    logger.warning(f"[VIZ] No coins found in data, querying database as fallback for {connector_id}")
-                    from datetime import timedelta
-                    time_lower = timestamp - timedelta(seconds=2)
-                    time_upper = timestamp + timedelta(seconds=2)
-                    
-                    rows = await conn.fetch("""
-                        SELECT data, raw_response
-                        FROM api_connector_data
-                        WHERE connector_id = $1
-                        AND timestamp >= $2
-                        AND timestamp <= $3
-                        ORDER BY id
-                    """, connector_id, time_lower, time_upper)
-                    
-                    for row in rows:
-                        row_data = row["data"]
-                        row_raw = row.get("raw_response")
-                        
-                        if isinstance(row_data, str):
-                            try:
-                                row_data = json.loads(row_data)
-                            except:
-                                pass
-                        
-                        if isinstance(row_raw, str):
-                            try:
-                                row_raw = json.loads(row_raw)
-                            except:
-                                pass
-                        
-                        if isinstance(row_data, list):
-                            for item in row_data:
-                                if isinstance(item, dict) and (item.get("id") or item.get("symbol") or item.get("name")):
-                                    coins_list.append(item)
-                        elif isinstance(row_data, dict):
-                            if row_data.get("id") or row_data.get("symbol") or row_data.get("name") or row_data.get("current_price") is not None:
-                                coins_list.append(row_data)
-                            elif "data" in row_data and isinstance(row_data["data"], list):
-                                coins_list.extend([item for item in row_data["data"] if isinstance(item, dict)])
-                        elif row_raw:
-                            if isinstance(row_raw, list):
-                                coins_list.extend([item for item in row_raw if isinstance(item, dict)])
-                            elif isinstance(row_raw, dict) and row_raw.get("id"):
-                                coins_list.append(row_raw)
-                
-                if coins_list:
-                    # Save to visualization_data
-                    await conn.execute("""
-                        INSERT INTO visualization_data (data_type, timestamp, data, metadata, updated_at)
-                        VALUES ($1, $2, $3, $4, NOW())
-                        ON CONFLICT (data_type, timestamp) 
-                        DO UPDATE SET 
-                            data = EXCLUDED.data,
-                            metadata = EXCLUDED.metadata,
-                            updated_at = NOW()
-                    """, 
-                        "markets",
-                        timestamp,
-                        json.dumps(coins_list),
-                        json.dumps({"source": connector_id, "total_coins": len(coins_list)})
-                    )
-                    logger.info(f"✅ [VIZ] Updated visualization_data: markets ({len(coins_list)} coins) at {timestamp}")
-                    
-                    # Broadcast update via WebSocket for real-time frontend updates
-                    try:
-                        await connection_manager.broadcast({
-                            "type": "visualization_update",
-                            "data_type": "markets",
-                            "connector_id": connector_id,
-                            "timestamp": timestamp.isoformat(),
-                            "total_coins": len(coins_list),
-                            "message": "Market data updated"
-                        })
-                        logger.debug(f"✅ [VIZ] Broadcasted WebSocket update for markets")
-                    except Exception as ws_err:
-                        logger.warning(f"[VIZ] Could not broadcast visualization update: {ws_err}")
-                else:
-                    logger.warning(f"[VIZ] No coins found to save for {connector_id}")
-            
-            # Handle coingecko_global (global stats)
-            elif connector_id == "coingecko_global":
-                # Parse data if it's a string
-                if isinstance(data, str):
-                    try:
-                        data = json.loads(data)
-                    except:
-                        pass
-                
-                if isinstance(raw_response, str):
-                    try:
-                        raw_response = json.loads(raw_response)
-                    except:
-                        pass
-                
-                result = None
-                
-                # Try data field first
-                if isinstance(data, dict):
-                    result = data
-                # Try raw_response as fallback
-                elif raw_response and isinstance(raw_response, dict):
-                    result = raw_response
-                
-                # If still no result, query database as fallback
-                if not result:
-                    logger.warning(f"[VIZ] No data found, querying database as fallback for {connector_id}")
-                    row = await conn.fetchrow("""
-                        SELECT data, raw_response
-                        FROM api_connector_data
-                        WHERE connector_id = $1
-                        AND timestamp = $2
-                        LIMIT 1
-                    """, connector_id, timestamp)
-                    
-                    if row:
-                        viz_data = row["data"]
-                        row_raw = row.get("raw_response")
-                        
-                        if isinstance(viz_data, str):
-                            try:
-                                viz_data = json.loads(viz_data)
-                            except:
-                                pass
-                        
-                        if isinstance(row_raw, str):
-                            try:
-                                row_raw = json.loads(row_raw)
-                            except:
-                                pass
-                        
-                        result = viz_data if isinstance(viz_data, dict) else (row_raw if isinstance(row_raw, dict) else None)
-                
-                if result:
-                    # Normalize field names
-                    if "data" in result and isinstance(result["data"], dict):
-                        if "total_volume" in result["data"] and "total_volume_24h" not in result["data"]:
-                            result["data"]["total_volume_24h"] = result["data"]["total_volume"]
-                    elif "total_volume" in result and "total_volume_24h" not in result:
-                        result["total_volume_24h"] = result["total_volume"]
-                    
-                    # Save to visualization_data
-                    await conn.execute("""
-                        INSERT INTO visualization_data (data_type, timestamp, data, metadata, updated_at)
-                        VALUES ($1, $2, $3, $4, NOW())
-                        ON CONFLICT (data_type, timestamp) 
-                        DO UPDATE SET 
-                            data = EXCLUDED.data,
-                            metadata = EXCLUDED.metadata,
-                            updated_at = NOW()
-                    """, 
-                        "global_stats",
-                        timestamp,
-                        json.dumps(result),
-                        json.dumps({"source": connector_id})
-                    )
-                    logger.info(f"✅ [VIZ] Updated visualization_data: global_stats at {timestamp}")
-                    
-                    # Broadcast update via WebSocket for real-time frontend updates
-                    try:
-                        await connection_manager.broadcast({
-                            "type": "visualization_update",
-                            "data_type": "global_stats",
-                            "connector_id": connector_id,
-                            "timestamp": timestamp.isoformat(),
-                            "message": "Global stats updated"
-                        })
-                        logger.debug(f"✅ [VIZ] Broadcasted WebSocket update for global_stats")
-                    except Exception as ws_err:
-                        logger.warning(f"[VIZ] Could not broadcast visualization update: {ws_err}")
-                else:
-                    logger.warning(f"[VIZ] No global stats data found to save for {connector_id}")
+            frame = await handler(conn, connector_id, data, timestamp, raw_response)
+        # Broadcast after commit, so clients re-fetch committed data, and only
+        # after the cached bodies are dropped, so the re-fetch misses the cache
+        _invalidate_response_cache()
+        if frame is not None:
+            await _broadcast_viz_update(frame, connector_id)
     except Exception as e:
-        logger.error(f"[VIZ] Failed to update visualization_data for {connector_id}: {e}", exc_info=True)
+        logger.error("[VIZ] Failed to update visualization_data for %s: %s", connector_id, e, exc_info=True)
 
 
 async def save_to_database(message: dict):
@@ -1005,76 +1575,33 @@ async def save_to_database(message: dict):
             }
             for k, v in required_fields.items():
                 if v in [None, "", {}, []]:
-                    logger.warning(f"[DB] Field '{k}' is missing or empty, using default value: {v}")
+                    logger.warning("[DB] Field '%s' is missing or empty, using default value: %s", k, v)
             
             # Parse timestamp
-            if timestamp_str:
-                try:
-                    timestamp = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                except:
-                    timestamp = datetime.utcnow()
-            else:
-                timestamp = datetime.utcnow()
+            timestamp = _parse_timestamp(timestamp_str)
             
             # Generate source_id and session_id
-            import hashlib
-            import uuid
-            source_id = hashlib.md5(f"{connector_id}_{timestamp}_{json.dumps(data)}".encode()).hexdigest()[:16]
+            # Serialize the payload once: it feeds the source_id hash and the insert
+            data_json = json.dumps(data)
+            source_id = hashlib.blake2b(
+                f"{connector_id}_{timestamp}_{data_json}".encode(), digest_size=8
+            ).hexdigest()
             session_id = message.get("session_id", str(uuid.uuid4()))
+            # Every row of this save belongs to one ingestion run
+            batch_id = message.get("batch_id") or str(uuid.uuid4())
             
-            # Helper to persist a single row so list payloads fan out into multiple records
-            async def _insert_row(row_data, row_raw, row_price, row_instrument, row_source_id_suffix=None):
+            # Run an insert, retrying once under a scheduled_ connector id on FK errors
+            async def _insert_with_fk_retry(insert):
                 nonlocal connector_id
-                row_source_id = source_id if row_source_id_suffix is None else f"{source_id}-{row_source_id_suffix}"
                 try:
-                    return await conn.fetchval(
-                        """
-                        INSERT INTO api_connector_data (
-                            connector_id, timestamp, exchange, instrument, price, data, 
-                            message_type, raw_response, status_code, response_time_ms, source_id, session_id
-                        ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12)
-                        RETURNING id
-                        """,
-                        connector_id,
-                        timestamp,
-                        exchange,
-                        row_instrument,
-                        row_price,
-                        json.dumps(row_data),
-                        message_type,
-                        json.dumps(row_raw) if row_raw is not None else None,
-                        status_code,
-                        response_time_ms,
-                        row_source_id,
-                        session_id,
-                    )
+                    return await insert(connector_id)
                 except Exception as fk_error:
                     error_msg = str(fk_error)
                     if "foreign key constraint" in error_msg.lower():
                         # Allow scheduled APIs without a connector record
                         try:
                             connector_id = f"scheduled_{connector_id}"
-                            return await conn.fetchval(
-                                """
-                                INSERT INTO api_connector_data (
-                                    connector_id, timestamp, exchange, instrument, price, data, 
-                                    message_type, raw_response, status_code, response_time_ms, source_id, session_id
-                                ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12)
-                                RETURNING id
-                                """,
-                                connector_id,
-                                timestamp,
-                                exchange,
-                                row_instrument,
-                                row_price,
-                                json.dumps(row_data),
-                                message_type,
-                                json.dumps(row_raw) if row_raw is not None else None,
-                                status_code,
-                                response_time_ms,
-                                row_source_id,
-                                session_id,
-                            )
+                            return await insert(connector_id)
                         except Exception as retry_error:
                             # Re-raise with more context
                             raise Exception(f"Foreign key constraint error (retry failed): {str(retry_error)}")
@@ -1082,30 +1609,80 @@ async def save_to_database(message: dict):
                         # Re-raise with more context about the database error
                         raise Exception(f"Database insert error: {error_msg}")
 
+            # Helper to persist a single row
+            async def _insert_row(row_data, row_raw, row_price, row_instrument, row_data_json=None):
+                if row_data_json is None:
+                    row_data_json = json.dumps(row_data)
+                # raw_response often aliases data: reuse the encoded payload
+                if row_raw is None:
+                    row_raw_json = None
+                elif row_raw is row_data:
+                    row_raw_json = row_data_json
+                else:
+                    row_raw_json = json.dumps(row_raw)
+                return await _insert_with_fk_retry(lambda cid: conn.fetchval(
+                    _SQL_INSERT_API_DATA,
+                    cid,
+                    timestamp,
+                    exchange,
+                    row_instrument,
+                    row_price,
+                    row_data_json,
+                    message_type,
+                    row_raw_json,
+                    status_code,
+                    response_time_ms,
+                    source_id,
+                    session_id,
+                    batch_id,
+                ))
+
+            # List payloads fan out into multiple records in a single INSERT ... SELECT unnest
+            async def _insert_rows(items):
+                instruments, prices, data_jsons, raw_jsons, source_ids = [], [], [], [], []
+                # A shared raw_response is serialized once, not once per row
+                if raw_response is None:
+                    shared_raw_json = None
+                elif raw_response is data:
+                    shared_raw_json = data_json
+                else:
+                    shared_raw_json = json.dumps(raw_response)
+                for idx, item in enumerate(items):
+                    row_data = item if isinstance(item, (dict, list)) else {"value": item}
+                    is_dict = isinstance(row_data, dict)
+                    row_data_json = json.dumps(row_data)
+                    instruments.append((row_data.get("symbol") if is_dict else instrument) or instrument)
+                    prices.append((row_data.get("price") if is_dict else price) or price)
+                    data_jsons.append(row_data_json)
+                    raw_jsons.append(shared_raw_json if shared_raw_json is not None else row_data_json)
+                    source_ids.append(f"{source_id}-{idx}")
+                rows = await _insert_with_fk_retry(lambda cid: conn.fetch(
+                    _SQL_INSERT_API_DATA_BATCH,
+                    cid,
+                    timestamp,
+                    exchange,
+                    message_type,
+                    status_code,
+                    response_time_ms,
+                    session_id,
+                    instruments,
+                    prices,
+                    data_jsons,
+                    raw_jsons,
+                    source_ids,
+                    batch_id,
+                ))
+                return [row["id"] for row in rows]
+
             inserted_ids = []
             records_saved = 0
 
             if isinstance(data, list):
-                for idx, item in enumerate(data):
-                    row_data = item if isinstance(item, (dict, list)) else {"value": item}
-                    row_raw = raw_response if raw_response is not None else row_data
-                    row_price = (
-                        row_data.get("price")
-                        if isinstance(row_data, dict)
-                        else price
-                    ) or price
-                    row_instrument = (
-                        row_data.get("symbol")
-                        if isinstance(row_data, dict)
-                        else instrument
-                    ) or instrument
-                    row_id = await _insert_row(row_data, row_raw, row_price, row_instrument, idx)
-                    inserted_ids.append(row_id)
-                    records_saved += 1
+                if data:
+                    inserted_ids = await _insert_rows(data)
+                records_saved = len(inserted_ids)
             else:
-                row_data = data
-                row_raw = raw_response
-                row_id = await _insert_row(row_data, row_raw, price, instrument)
+                row_id = await _insert_row(data, raw_response, price, instrument, row_data_json=data_json)
                 inserted_ids.append(row_id)
                 records_saved = 1
 
@@ -1113,16 +1690,17 @@ async def save_to_database(message: dict):
             # REST APIs should NOT write to websocket_messages - removed backward compatibility insert
 
             logger.info(
-                f"[DB] ✅ Saved {records_saved} record(s) to database for connector_id={connector_id}, exchange={exchange}, timestamp={timestamp}"
-            )
-            print(
-                f"[DB] ✅ Saved {records_saved} record(s) to database for connector_id={connector_id}, exchange={exchange}"
+                "[DB] ✅ Saved %s record(s) to database for connector_id=%s, exchange=%s, timestamp=%s",
+                records_saved, connector_id, exchange, timestamp,
             )
             
             # For manually run integrated APIs, also save to api_connector_items
             # Scheduled APIs already save via scheduler callback, so skip them here
-            is_scheduled_api = connector_id in [api.get("connector_id", api.get("id")) for api in SCHEDULED_APIS]
+            is_scheduled_api = connector_id in _SCHEDULED_API_IDS
             is_manual_integrated = not is_scheduled_api and message_type in ["api_response", "scheduled_api_call"]
+
+            # Follow-up work runs in one background task (don't block main save)
+            background_jobs = []
             
             if is_manual_integrated and isinstance(data, (list, dict)):
                 # Get API name from api_connectors table
@@ -1137,34 +1715,17 @@ async def save_to_database(message: dict):
                 except:
                     pass
                 
-                # Schedule items save in background (don't block main save)
-                try:
-                    # Use asyncio.create_task to run in background
-                    loop = asyncio.get_event_loop()
-                    loop.create_task(save_api_items_to_database(connector_id, api_name, data, response_time_ms))
-                except Exception as items_error:
-                    logger.warning(f"[DB] Could not schedule items save for manual API {connector_id}: {items_error}")
+                background_jobs.append(save_api_items_to_database(connector_id, api_name, data, response_time_ms))
 
-            # Update visualization_data table in background for real-time updates
-            # This ensures visualization_data is always up-to-date when new data arrives
-            if connector_id in ["coingecko_top", "coingecko_global"]:
-                try:
-                    # Schedule visualization update in background (don't block main save)
-                    # Pass raw_response so we can use it if data is not in expected format
-                    loop = asyncio.get_event_loop()
-                    loop.create_task(update_visualization_data(connector_id, data, timestamp, raw_response))
-                    logger.debug(f"[DB] Scheduled visualization_data update for {connector_id}")
-                except Exception as viz_error:
-                    logger.error(f"[DB] Could not schedule visualization_data update for {connector_id}: {viz_error}", exc_info=True)
+            # visualization_data is refreshed by the LISTEN updater: the insert above
+            # fires a viz_refresh notification for this connector_id
 
             # Update pipeline counts immediately after saving (real-time count updates)
-            # Schedule in background to avoid blocking, but ensure it runs
-            try:
-                # Use create_task to run async without blocking
-                loop = asyncio.get_event_loop()
-                loop.create_task(update_pipeline_counts(connector_id))
-            except Exception as count_error:
-                logger.error(f"[DB] ❌ Could not schedule pipeline count update for {connector_id}: {count_error}", exc_info=True)
+            background_jobs.append(update_pipeline_counts(connector_id))
+
+            task = asyncio.create_task(_run_background_jobs("DB", connector_id, background_jobs))
+            _background_job_tasks.add(task)
+            task.add_done_callback(_background_job_tasks.discard)
 
             # Return metadata (include all IDs so callers can log details/counts)
             return {
@@ -1186,8 +1747,7 @@ async def save_to_database(message: dict):
     except Exception as e:
         error_type = type(e).__name__
         error_message = str(e)
-        logger.error(f"Error saving to database: {e}", exc_info=True)
-        import traceback
+        logger.error("Error saving to database: %s", e, exc_info=True)
         traceback.print_exc()
         # Return error details instead of None
         return {
@@ -1223,7 +1783,6 @@ async def broadcast_to_websocket(message: dict):
             logger.warning(f"[WARNING] Broadcast without database save: connector_id={message.get('connector_id')}")
     except Exception as e:
         logger.error(f"Error in broadcast_to_websocket: {e}")
-        import traceback
         traceback.print_exc()
 
 message_processor = MessageProcessor(
@@ -1237,174 +1796,239 @@ connector_manager = get_connector_manager(message_processor)
 
 # ==================== Job Scheduler Setup ====================
 
-async def continuous_visualization_updater():
+# Safety-net resync when no notification arrives (e.g. missed during a listener reconnect)
+VIZ_RESYNC_INTERVAL = 60.0
+
+# connector_id -> source timestamp of the last snapshot the updater committed
+_last_seen: Dict[str, datetime] = {}
+
+
+async def _auto_refresh_markets(conn, latest_row) -> Optional[Tuple[bytes, datetime]]:
+    """Rebuild the markets snapshot from the latest coingecko_top batch; returns (encoded update, source timestamp)"""
+
+    if latest_row:
+        latest_timestamp = latest_row["timestamp"]
+        # Nothing new since the last snapshot: skip the rebuild, upsert and broadcast
+        if _last_seen.get("coingecko_top") == latest_timestamp:
+            return None
+        batch_id = latest_row["batch_id"]
+        if batch_id is not None:
+            fetch_batch = await get_statement(conn, "fetch_viz_batch")
+            rows = await fetch_batch.fetch("coingecko_top", batch_id)
+        else:
+            time_lower = latest_timestamp - VIZ_BATCH_WINDOW
+            time_upper = latest_timestamp + VIZ_BATCH_WINDOW
+            fetch_window = await get_statement(conn, "fetch_viz_window")
+            rows = await fetch_window.fetch("coingecko_top", time_lower, time_upper)
+
+        if rows:
+            coins_list = []
+            for row in rows:
+                coins_list.extend(_extract_coins(row["data"], row["raw_response"], "coingecko_top"))
+            # Overlapping rows in the window can repeat the same coin
+            coins_list = _dedupe_coins(coins_list)
+
+            if coins_list:
+                # Update visualization_data
+                # Pre-encoded text passes straight through the connection's JSONB codec
+                coins_json = await _encode_coins(coins_list)
+                insert_viz = await get_statement(conn, "insert_viz")
+                await insert_viz.fetch(
+                    "markets",
+                    latest_timestamp,
+                    coins_json,
+                    {"source": "coingecko_top", "total_coins": len(coins_list), "auto_update": True}
+                )
+
+                # WebSocket frame, encoded once and broadcast by the caller once committed
+                frame = _encode_viz_update(
+                    "markets", "coingecko_top", latest_timestamp, len(coins_list), auto_refresh=True
+                )
+                return frame, latest_timestamp
+    return None
+
+
+async def _auto_refresh_global(conn, global_row) -> Optional[Tuple[bytes, datetime]]:
+    """Rebuild the global_stats snapshot from the latest coingecko_global row; returns (encoded update, source timestamp)"""
+    if global_row:
+        # The updater's connection decodes JSONB columns into dicts already
+        viz_data = global_row["data"]
+        raw_response = global_row["raw_response"]
+        timestamp = global_row["timestamp"]
+        if _last_seen.get("coingecko_global") == timestamp:
+            return None
+
+        result = viz_data if isinstance(viz_data, dict) else (raw_response if isinstance(raw_response, dict) else None)
+
+        if result:
+            # Normalize field names
+            _normalize_global_stats(result)
+
+            # Update visualization_data
+            insert_viz = await get_statement(conn, "insert_viz")
+            await insert_viz.fetch(
+                "global_stats",
+                timestamp,
+                result,
+                {"source": "coingecko_global", "auto_update": True}
+            )
+
+            # WebSocket frame, encoded once and broadcast by the caller once committed
+            frame = _encode_viz_update("global_stats", "coingecko_global", timestamp, auto_refresh=True)
+            return frame, timestamp
+    return None
+
+
+# Statements the refreshers run on every wake-up, prepared when the updater connects
+_AUTO_REFRESH_STATEMENTS = ("latest_connector_rows", "fetch_viz_batch", "fetch_viz_window", "insert_viz")
+
+# Snapshot refreshers keyed by the connector_id carried in viz_refresh notifications
+_AUTO_REFRESHERS = {
+    "coingecko_top": _auto_refresh_markets,
+    "coingecko_global": _auto_refresh_global,
+}
+
+
+async def _broadcast_frames(frames: List[bytes]):
+    """Broadcast pre-encoded frames concurrently"""
+    _invalidate_response_cache()
+    await asyncio.gather(
+        *(connection_manager.broadcast_bytes(frame) for frame in frames),
+        return_exceptions=True
+    )
+
+
+async def continuous_visualization_updater(serving_loop: Optional[asyncio.AbstractEventLoop] = None):
     """
-    Background task that continuously updates visualization_data every 5 seconds.
-    This ensures frontend always has fresh data even if scheduler is slow.
+    Background task that keeps visualization_data in sync with api_connector_data.
+    Refreshes are pushed by the insert trigger's viz_refresh notifications, with a
+    periodic resync in case a notification is missed.
+    When run on its own loop, serving_loop is the loop owning the WebSocket clients.
     """
-    await asyncio.sleep(5)  # Wait 5 seconds after startup before starting
-    
+    pending: Set[str] = set()
+    wakeup = asyncio.Event()
+
+    def _on_notify(connection, pid, channel, payload):
+        if payload in _AUTO_REFRESHERS:
+            pending.add(payload)
+            wakeup.set()
+
     while True:
+        conn = None
         try:
-            pool = get_pool()
-            async with pool.acquire() as conn:
-                # Update markets data (coingecko_top)
-                latest_row = await conn.fetchrow("""
-                    SELECT timestamp
-                    FROM api_connector_data
-                    WHERE connector_id = 'coingecko_top'
-                    ORDER BY timestamp DESC
-                    LIMIT 1
-                """)
-                
-                if latest_row:
-                    latest_timestamp = latest_row["timestamp"]
-                    from datetime import timedelta
-                    time_lower = latest_timestamp - timedelta(seconds=2)
-                    time_upper = latest_timestamp + timedelta(seconds=2)
-                    
-                    rows = await conn.fetch("""
-                        SELECT data, raw_response, timestamp
-                        FROM api_connector_data
-                        WHERE connector_id = 'coingecko_top'
-                        AND timestamp >= $1
-                        AND timestamp <= $2
-                        ORDER BY id
-                    """, time_lower, time_upper)
-                    
-                    if rows:
-                        coins_list = []
-                        for row in rows:
-                            row_data = row["data"]
-                            row_raw = row.get("raw_response")
-                            
-                            if isinstance(row_data, str):
-                                try:
-                                    row_data = json.loads(row_data)
-                                except:
-                                    pass
-                            
-                            if isinstance(row_raw, str):
-                                try:
-                                    row_raw = json.loads(row_raw)
-                                except:
-                                    pass
-                            
-                            if isinstance(row_data, list):
-                                for item in row_data:
-                                    if isinstance(item, dict) and (item.get("id") or item.get("symbol") or item.get("name") or item.get("current_price") is not None):
-                                        coins_list.append(item)
-                            elif isinstance(row_data, dict):
-                                if row_data.get("id") or row_data.get("symbol") or row_data.get("name") or row_data.get("current_price") is not None:
-                                    coins_list.append(row_data)
-                                elif "data" in row_data and isinstance(row_data["data"], list):
-                                    coins_list.extend([item for item in row_data["data"] if isinstance(item, dict)])
-                            elif row_raw:
-                                if isinstance(row_raw, list):
-                                    coins_list.extend([item for item in row_raw if isinstance(item, dict)])
-                                elif isinstance(row_raw, dict) and row_raw.get("id"):
-                                    coins_list.append(row_raw)
-                        
-                        if coins_list:
-                            # Update visualization_data
-                            await conn.execute("""
-                                INSERT INTO visualization_data (data_type, timestamp, data, metadata, updated_at)
-                                VALUES ($1, $2, $3, $4, NOW())
-                                ON CONFLICT (data_type, timestamp) 
-                                DO UPDATE SET 
-                                    data = EXCLUDED.data,
-                                    metadata = EXCLUDED.metadata,
-                                    updated_at = NOW()
-                            """, 
-                                "markets",
-                                latest_timestamp,
-                                json.dumps(coins_list),
-                                json.dumps({"source": "coingecko_top", "total_coins": len(coins_list), "auto_update": True})
-                            )
-                            
-                            # Broadcast WebSocket update
-                            try:
-                                await connection_manager.broadcast({
-                                    "type": "visualization_update",
-                                    "data_type": "markets",
-                                    "connector_id": "coingecko_top",
-                                    "timestamp": latest_timestamp.isoformat(),
-                                    "total_coins": len(coins_list),
-                                    "message": "Market data updated (auto-refresh)"
-                                })
-                            except:
-                                pass
-                
-                # Update global stats (coingecko_global)
-                global_row = await conn.fetchrow("""
-                    SELECT data, raw_response, timestamp
-                    FROM api_connector_data
-                    WHERE connector_id = 'coingecko_global'
-                    ORDER BY timestamp DESC
-                    LIMIT 1
-                """)
-                
-                if global_row:
-                    viz_data = global_row["data"]
-                    raw_response = global_row.get("raw_response")
-                    timestamp = global_row["timestamp"]
-                    
-                    if isinstance(viz_data, str):
-                        try:
-                            viz_data = json.loads(viz_data)
-                        except:
-                            pass
-                    
-                    if isinstance(raw_response, str):
+            # LISTEN needs a connection held for the lifetime of the subscription;
+            # it is opened outside the pool so it can carry the orjson JSONB codec
+            conn = await connect_dedicated(json_codecs=True)
+            await prepare_statements(conn, _AUTO_REFRESH_STATEMENTS)
+            await conn.add_listener(VIZ_REFRESH_CHANNEL, _on_notify)
+            # Wake immediately if the pinned connection drops, instead of at the next resync
+            conn.add_termination_listener(lambda connection: wakeup.set())
+            # Notifications may have been missed while unsubscribed, and the last
+            # session's final commit may not have landed: rebuild everything
+            _last_seen.clear()
+            pending.update(_AUTO_REFRESHERS)
+            # Fixed-rate resync deadline: a steady stream of notifications must not
+            # keep pushing the full resync back, and an overrun fires it right away
+            loop = asyncio.get_running_loop()
+            next_resync = loop.time() + VIZ_RESYNC_INTERVAL
+
+            while not conn.is_closed():
+                if not pending:
+                    try:
+                        await asyncio.wait_for(wakeup.wait(), timeout=max(0.0, next_resync - loop.time()))
+                    except asyncio.TimeoutError:
+                        pass
+                if loop.time() >= next_resync:
+                    pending.update(_AUTO_REFRESHERS)
+                    next_resync += VIZ_RESYNC_INTERVAL
+                    # After a long stall, skip missed ticks rather than resyncing back to back
+                    if next_resync <= loop.time():
+                        next_resync = loop.time() + VIZ_RESYNC_INTERVAL
+                wakeup.clear()
+                if conn.is_closed():
+                    break
+                due = list(pending)
+                pending.clear()
+                updates = []
+                refreshed = {}
+                # One transaction (a single commit) per wake-up; each refresher runs
+                # in its own savepoint so a failure only rolls back its own snapshot
+                async with conn.transaction():
+                    # Latest source row for every due connector in a single query
+                    latest_connector_rows = await get_statement(conn, "latest_connector_rows")
+                    latest = {row["connector_id"]: row for row in await latest_connector_rows.fetch(due)}
+                    for connector_id in due:
                         try:
-                            raw_response = json.loads(raw_response)
-                        except:
-                            pass
-                    
-                    result = viz_data if isinstance(viz_data, dict) else (raw_response if isinstance(raw_response, dict) else None)
-                    
-                    if result:
-                        # Normalize field names
-                        if "data" in result and isinstance(result["data"], dict):
-                            if "total_volume" in result["data"] and "total_volume_24h" not in result["data"]:
-                                result["data"]["total_volume_24h"] = result["data"]["total_volume"]
-                        elif "total_volume" in result and "total_volume_24h" not in result:
-                            result["total_volume_24h"] = result["total_volume"]
-                        
-                        # Update visualization_data
-                        await conn.execute("""
-                            INSERT INTO visualization_data (data_type, timestamp, data, metadata, updated_at)
-                            VALUES ($1, $2, $3, $4, NOW())
-                            ON CONFLICT (data_type, timestamp) 
-                            DO UPDATE SET 
-                                data = EXCLUDED.data,
-                                metadata = EXCLUDED.metadata,
-                                updated_at = NOW()
-                        """, 
-                            "global_stats",
-                            timestamp,
-                            json.dumps(result),
-                            json.dumps({"source": "coingecko_global", "auto_update": True})
+                            async with conn.transaction():
+                                update = await _AUTO_REFRESHERS[connector_id](conn, latest.get(connector_id))
+                            if update:
+                                updates.append(update[0])
+                                refreshed[connector_id] = update[1]
+                        except Exception as e:
+                            logger.warning("[AUTO-UPDATE] Error refreshing %s: %s", connector_id, e)
+                # Only committed snapshots count as seen: a rolled-back one is rebuilt next time
+                _last_seen.update(refreshed)
+                # Broadcast after commit, concurrently, so clients re-fetch committed data
+                if updates:
+                    if serving_loop is None:
+                        await _broadcast_frames(updates)
+                    else:
+                        # WebSocket clients can only be written from the serving loop
+                        await asyncio.wrap_future(
+                            asyncio.run_coroutine_threadsafe(_broadcast_frames(updates), serving_loop)
                         )
-                        
-                        # Broadcast WebSocket update
-                        try:
-                            await connection_manager.broadcast({
-                                "type": "visualization_update",
-                                "data_type": "global_stats",
-                                "connector_id": "coingecko_global",
-                                "timestamp": timestamp.isoformat(),
-                                "message": "Global stats updated (auto-refresh)"
-                            })
-                        except:
-                            pass
         except Exception as e:
             logger.warning(f"[AUTO-UPDATE] Error in continuous visualization updater: {e}")
-        
-        # Wait 5 seconds before next update
+        finally:
+            if conn is not None:
+                try:
+                    await conn.close()
+                except Exception:
+                    pass
+
+        # Back off before re-subscribing
         await asyncio.sleep(5)
 
 
+def start_visualization_updater_thread():
+    """
+    Run continuous_visualization_updater on its own event loop in a daemon thread,
+    so its DB round trips and JSON work never queue behind HTTP/WebSocket serving.
+    Returns an async stop() callable for shutdown.
+    """
+    serving_loop = asyncio.get_running_loop()
+    updater_loop = asyncio.new_event_loop()
+
+    def _run():
+        asyncio.set_event_loop(updater_loop)
+        task = updater_loop.create_task(continuous_visualization_updater(serving_loop))
+        try:
+            updater_loop.run_until_complete(task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            # Let async generators and to_thread work (_encode_coins) finish before closing
+            try:
+                updater_loop.run_until_complete(updater_loop.shutdown_asyncgens())
+                updater_loop.run_until_complete(updater_loop.shutdown_default_executor())
+            finally:
+                updater_loop.close()
+
+    def _cancel_all():
+        for task in asyncio.all_tasks(updater_loop):
+            task.cancel()
+
+    thread = threading.Thread(target=_run, name="viz-updater", daemon=True)
+    thread.start()
+
+    async def stop():
+        if thread.is_alive():
+            updater_loop.call_soon_threadsafe(_cancel_all)
+            await asyncio.to_thread(thread.join, 10)
+
+    return stop
+
+
 @app.on_event("startup")
 async def startup_job_scheduler():
     """Start job scheduler on application startup."""
@@ -1416,13 +2040,8 @@ async def startup_job_scheduler():
         _job_scheduler = start_job_scheduler(loop, save_to_database, save_api_items_to_database)
         logger.info("[STARTUP] Job scheduler initialized and running")
         logger.info("[STARTUP] WebSocket Stream Manager initialized (persistence-first flow)")
-        
-        # Start continuous visualization updater (runs every 5 seconds)
-        asyncio.create_task(continuous_visualization_updater())
-        logger.info("[STARTUP] ✅ Continuous visualization updater started (updates every 5 seconds)")
     except Exception as e:
         logger.error(f"[STARTUP] Failed to start job scheduler: {e}")
-        import traceback
         traceback.print_exc()
 
 
@@ -1462,6 +2081,16 @@ class JobStatusResponse(BaseModel):
     error: Optional[str] = None
 
 
+# Job dicts come from the in-process JobManager, so they are trusted: responses
+# project them onto the JobStatusResponse fields and skip per-job model validation
+_JOB_STATUS_FIELDS = tuple(JobStatusResponse.model_fields)
+
+
+def _job_status(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Project a job dict onto the JobStatusResponse fields"""
+    return {field: job.get(field) for field in _JOB_STATUS_FIELDS}
+
+
 @app.get("/")
 async def root():
     """Serve frontend index.html or return API info"""
@@ -1484,14 +2113,7 @@ async def create_job(job_request: ETLJobRequest):
             destination_config=job_request.destination_config,
             transformations=job_request.transformations
         )
-        return JobStatusResponse(
-            job_id=job["job_id"],
-            name=job["name"],
-            status=job["status"],
-            progress=job["progress"],
-            created_at=job["created_at"],
-            updated_at=job["updated_at"]
-        )
+        return ORJSONResponse(content=_job_status(job))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -1500,7 +2122,7 @@ async def create_job(job_request: ETLJobRequest):
 async def get_jobs():
     """Get all ETL jobs"""
     jobs = job_manager.get_all_jobs()
-    return [JobStatusResponse(**job) for job in jobs]
+    return ORJSONResponse(content=[_job_status(job) for job in jobs])
 
 
 @app.get("/api/jobs/{job_id}", response_model=JobStatusResponse)
@@ -1509,7 +2131,7 @@ async def get_job(job_id: str):
     job = job_manager.get_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
-    return JobStatusResponse(**job)
+    return ORJSONResponse(content=_job_status(job))
 
 
 @app.post("/api/jobs/{job_id}/run")
@@ -1536,13 +2158,12 @@ async def delete_job(job_id: str):
 async def get_okx_instruments():
     """Fetch all available trading instruments from OKX"""
     try:
-        response = requests.get(
+        async with app.state.http.get(
             "https://www.okx.com/api/v5/public/instruments",
-            params={"instType": "SPOT"},
-            timeout=10
-        )
-        response.raise_for_status()
-        data = response.json()
+            params={"instType": "SPOT"}
+        ) as response:
+            response.raise_for_status()
+            data = await response.json(loads=orjson.loads)
         
         if data.get("code") == "0" and data.get("data"):
             instruments = []
@@ -1557,7 +2178,7 @@ async def get_okx_instruments():
             return {"instruments": instruments, "count": len(instruments)}
         else:
             raise HTTPException(status_code=500, detail="Failed to fetch OKX instruments")
-    except requests.exceptions.RequestException as e:
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
         raise HTTPException(status_code=500, detail=f"Error fetching OKX instruments: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
@@ -1567,12 +2188,9 @@ async def get_okx_instruments():
 async def get_binance_symbols():
     """Fetch all available trading symbols from Binance"""
     try:
-        response = requests.get(
-            "https://api.binance.com/api/v3/exchangeInfo",
-            timeout=10
-        )
-        response.raise_for_status()
-        data = response.json()
+        async with app.state.http.get("https://api.binance.com/api/v3/exchangeInfo") as response:
+            response.raise_for_status()
+            data = await response.json(loads=orjson.loads)
         
         if data.get("symbols"):
             symbols = []
@@ -1588,7 +2206,7 @@ async def get_binance_symbols():
             return {"symbols": symbols, "count": len(symbols)}
         else:
             raise HTTPException(status_code=500, detail="Failed to fetch Binance symbols")
-    except requests.exceptions.RequestException as e:
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
         raise HTTPException(status_code=500, detail=f"Error fetching Binance symbols: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
@@ -1598,56 +2216,202 @@ async def get_binance_symbols():
 # All external API data must first be persisted by backend services (scheduler/connectors) before consumption
 
 
-@app.get("/api/crypto/global-stats")
-async def get_global_crypto_stats():
+# In-process response cache for the crypto read endpoints: serialized bodies keyed
+# by endpoint + query params, expired after a short TTL and cleared on every
+# visualization refresh so clients re-fetching after an update see the new snapshot
+RESPONSE_CACHE_TTL = 15.0
+RESPONSE_CACHE_MAX_ENTRIES = 256
+# key -> [expires_at (monotonic), body, hits]
+_RESPONSE_CACHE: Dict[str, list] = {}
+# Bumped on every invalidation: a body computed from data read before the bump is not cached
+_response_cache_generation = 0
+
+# Pre-encoded so responses append them in one step
+_NO_STORE_RAW_HEADERS = [
+    (b"cache-control", b"no-store, no-cache, must-revalidate, max-age=0"),
+    (b"pragma", b"no-cache"),
+    (b"expires", b"0"),
+]
+_NO_STORE_HEADERS = {name.decode(): value.decode() for name, value in _NO_STORE_RAW_HEADERS}
+
+
+class NoStoreORJSONResponse(ORJSONResponse):
+    """ORJSONResponse that clients must not cache; bytes/str content is sent as already-encoded JSON"""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        if isinstance(content, str):
+            return content.encode("utf-8")
+        return super().render(content)
+
+    def init_headers(self, headers: Optional[Dict[str, str]] = None) -> None:
+        super().init_headers(headers)
+        self.raw_headers.extend(_NO_STORE_RAW_HEADERS)
+
+
+def _wants_fresh(request: Request) -> bool:
+    """True when the client sent Cache-Control: no-cache"""
+    return "no-cache" in request.headers.get("cache-control", "")
+
+
+def _cached_response(key: str) -> Optional[NoStoreORJSONResponse]:
+    """Return the cached body for key as a response, or None when missing or expired"""
+    entry = _RESPONSE_CACHE.get(key)
+    if entry is None:
+        return None
+    if entry[0] <= time.monotonic():
+        _RESPONSE_CACHE.pop(key, None)
+        return None
+    entry[2] += 1
+    return NoStoreORJSONResponse(content=entry[1], headers={"X-Cache": "hit"})
+
+
+def _store_body(key: str, body: bytes, generation: int):
     """
-    Fetch global cryptocurrency market statistics from database.
-    Data must first be persisted by backend scheduler (connector_id: coingecko_global).
-    Enforces architecture: API → Database → Backend → Frontend
-    
-    Reads normalized rows from database and reconstructs the expected aggregated object format.
+    Cache an encoded response body, evicting the least frequently used entry when
+    full. generation is _response_cache_generation from before the data was read;
+    a body built across an invalidation may be stale and is not stored.
     """
-    try:
-        pool = get_pool()
-        connector_id = "coingecko_global"
-        
+    if generation != _response_cache_generation:
+        return
+    if key not in _RESPONSE_CACHE and len(_RESPONSE_CACHE) >= RESPONSE_CACHE_MAX_ENTRIES:
+        _RESPONSE_CACHE.pop(min(_RESPONSE_CACHE, key=lambda k: _RESPONSE_CACHE[k][2]), None)
+    _RESPONSE_CACHE[key] = [time.monotonic() + RESPONSE_CACHE_TTL, body, 0]
+
+
+def _store_response(key: str, response: Response, generation: int):
+    """Cache a rendered response body (see _store_body)"""
+    _store_body(key, response.body, generation)
+
+
+def _invalidate_response_cache():
+    """Drop cached crypto responses after the visualization snapshots change"""
+    global _response_cache_generation
+    _response_cache_generation += 1
+    _RESPONSE_CACHE.clear()
+
+
+# Cache misses currently being computed, keyed like _RESPONSE_CACHE plus the cache
+# generation they started in: requests after an invalidation do not join older misses
+_INFLIGHT_RESPONSES: Dict[Tuple[str, int], asyncio.Future] = {}
+
+
+async def _coalesced(key: str, build: Callable[[], Awaitable[Response]]) -> Response:
+    """
+    Run build() once for concurrent requests sharing key: the first request
+    does the database work and the others reuse its response body (or error).
+    """
+    key = (key, _response_cache_generation)
+    inflight = _INFLIGHT_RESPONSES.get(key)
+    if inflight is not None:
+        try:
+            body = await asyncio.shield(inflight)
+            return NoStoreORJSONResponse(content=body)
+        except asyncio.CancelledError:
+            # The leading request was cancelled, not this one: do the work here
+            if not inflight.cancelled():
+                raise
+
+    future = asyncio.get_running_loop().create_future()
+    _INFLIGHT_RESPONSES[key] = future
+    try:
+        response = await build()
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        # Mark retrieved: without waiting requests nobody else will consume it
+        future.exception()
+        raise
+    else:
+        future.set_result(response.body)
+        return response
+    finally:
+        if _INFLIGHT_RESPONSES.get(key) is future:
+            del _INFLIGHT_RESPONSES[key]
+
+
+# Snapshot writes issued by the crypto read endpoints run in the background, off
+# the response path; at most VIZ_WRITE_MAX_PENDING at a time, extra ones are dropped
+VIZ_WRITE_MAX_PENDING = 4
+_pending_viz_writes: Set[asyncio.Task] = set()
+# data_type -> timestamp of the snapshot last written from a read endpoint
+_last_viz_write: Dict[str, datetime] = {}
+
+
+async def _write_viz_snapshot(data_type: str, timestamp: datetime, data: Any, metadata: dict):
+    """Upsert a visualization_data snapshot rebuilt by a read endpoint; data may be pre-encoded JSON bytes"""
+    try:
+        pool = get_pool()
         async with pool.acquire() as conn:
-            # Try visualization_data table first (optimized for visualization)
-            viz_row = await conn.fetchrow("""
-                SELECT data, timestamp, metadata
-                FROM visualization_data
-                WHERE data_type = 'global_stats'
-                ORDER BY timestamp DESC
-                LIMIT 1
-            """)
-            
-            if viz_row:
-                # Use visualization_data (already processed and ready)
-                data = viz_row["data"]
-                if isinstance(data, str):
-                    try:
-                        data = json.loads(data)
-                    except:
-                        pass
-                
-                logger.info(f"Returning global stats from visualization_data (timestamp: {viz_row['timestamp']})")
-                response = JSONResponse(content=data)
-                response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
-                response.headers["Pragma"] = "no-cache"
-                response.headers["Expires"] = "0"
+            await conn.execute(
+                _SQL_INSERT_VIZ,
+                data_type,
+                timestamp,
+                data.decode() if isinstance(data, bytes) else orjson.dumps(data).decode(),
+                orjson.dumps(metadata).decode()
+            )
+        logger.debug("Saved %s to visualization_data table (timestamp: %s)", data_type, timestamp)
+    except Exception as save_err:
+        # Let a later request retry this snapshot
+        if _last_viz_write.get(data_type) == timestamp:
+            del _last_viz_write[data_type]
+        logger.warning("Failed to save %s to visualization_data: %s", data_type, save_err)
+
+
+def _schedule_viz_write(data_type: str, timestamp: datetime, data: Any, metadata: dict):
+    """Write a snapshot in the background unless it was already written or too many writes are pending"""
+    if _last_viz_write.get(data_type) == timestamp:
+        return
+    if len(_pending_viz_writes) >= VIZ_WRITE_MAX_PENDING:
+        logger.debug("Skipping %s snapshot write: %d writes pending", data_type, len(_pending_viz_writes))
+        return
+    _last_viz_write[data_type] = timestamp
+    task = asyncio.create_task(_write_viz_snapshot(data_type, timestamp, data, metadata))
+    _pending_viz_writes.add(task)
+    task.add_done_callback(_pending_viz_writes.discard)
+
+
+@app.get("/api/crypto/global-stats")
+async def get_global_crypto_stats(request: Request):
+    """
+    Fetch global cryptocurrency market statistics from database.
+    Data must first be persisted by backend scheduler (connector_id: coingecko_global).
+    Enforces architecture: API → Database → Backend → Frontend
+    
+    Reads normalized rows from database and reconstructs the expected aggregated object format.
+    """
+    cache_key = "global_stats"
+    if not _wants_fresh(request):
+        cached = _cached_response(cache_key)
+        if cached is not None:
+            return cached
+    return await _coalesced(cache_key, lambda: _load_global_crypto_stats(cache_key))
+
+
+async def _load_global_crypto_stats(cache_key: str) -> Response:
+    """Build the global stats response from the database and cache it under cache_key"""
+    generation = _response_cache_generation
+    try:
+        pool = get_pool()
+        connector_id = "coingecko_global"
+        
+        async with pool.acquire() as conn:
+            # Try visualization_data table first (optimized for visualization), falling
+            # back to the latest api_connector_data row within the same statement
+            row = await conn.fetchrow(_SQL_LATEST_GLOBAL_STATS, connector_id)
+            
+            if row and row["source"] == "visualization_data":
+                # The snapshot is stored normalized, so its JSON text is sent without decoding
+                logger.info("Returning global stats from visualization_data (timestamp: %s)", row['timestamp'])
+                response = NoStoreORJSONResponse(content=row["data"])
+                _store_response(cache_key, response, generation)
                 return response
             
             # Fallback to api_connector_data if visualization_data not available
-            # Get the most recent global stats data from database
             # Global stats is stored as a single row with the full response
-            row = await conn.fetchrow("""
-                SELECT data, timestamp, raw_response
-                FROM api_connector_data
-                WHERE connector_id = $1
-                ORDER BY timestamp DESC
-                LIMIT 1
-            """, connector_id)
-            
             if not row:
                 raise HTTPException(
                     status_code=404,
@@ -1656,22 +2420,11 @@ async def get_global_crypto_stats():
             
             # Extract data from JSONB column - could be stored as dict or string
             data = row["data"]
-            raw_response = row.get("raw_response")
+            raw_response = row["raw_response"]
             
             # Handle string JSON (if stored as string)
-            if isinstance(data, str):
-                try:
-                    import json
-                    data = json.loads(data)
-                except:
-                    pass
-            
-            if isinstance(raw_response, str):
-                try:
-                    import json
-                    raw_response = json.loads(raw_response)
-                except:
-                    pass
+            data = _loads(data)
+            raw_response = _loads(raw_response)
             
             # Reconstruct the expected format
             result = None
@@ -1689,47 +2442,149 @@ async def get_global_crypto_stats():
                            f"Found data type: {type(data).__name__}, raw_response type: {type(raw_response).__name__}"
                 )
                 
-                # Normalize field names - CoinGecko uses 'total_volume' but frontend expects 'total_volume_24h'
-                if "data" in result and isinstance(result["data"], dict):
-                    if "total_volume" in result["data"] and "total_volume_24h" not in result["data"]:
-                        result["data"]["total_volume_24h"] = result["data"]["total_volume"]
-                elif "total_volume" in result and "total_volume_24h" not in result:
-                    result["total_volume_24h"] = result["total_volume"]
+            # Normalize field names - CoinGecko uses 'total_volume' but frontend expects 'total_volume_24h'
+            _normalize_global_stats(result)
                 
-            # Save to visualization_data table for easy monitoring
-            try:
-                await conn.execute("""
-                    INSERT INTO visualization_data (data_type, timestamp, data, metadata, updated_at)
-                    VALUES ($1, $2, $3, $4, NOW())
-                    ON CONFLICT (data_type, timestamp) 
-                    DO UPDATE SET 
-                        data = EXCLUDED.data,
-                        metadata = EXCLUDED.metadata,
-                        updated_at = NOW()
-                """, 
-                    "global_stats",
-                    row["timestamp"],
-                    json.dumps(result),
-                    json.dumps({"source": connector_id, "coins_count": None})
-                )
-                logger.debug(f"Saved global stats to visualization_data table")
-            except Exception as save_err:
-                logger.warning(f"Failed to save to visualization_data: {save_err}")
+            # Serialized once: the same bytes are the response body and the snapshot
+            body = orjson.dumps(result)
+            
+            # Save to visualization_data table for easy monitoring (in the background)
+            _schedule_viz_write("global_stats", row["timestamp"], body, {"source": connector_id, "coins_count": None})
             
-                logger.info(f"Returning global stats from database (timestamp: {row['timestamp']})")
-                return JSONResponse(content=result)
+            logger.info("Returning global stats from database (timestamp: %s)", row['timestamp'])
+            response = NoStoreORJSONResponse(content=body)
+            _store_response(cache_key, response, generation)
+            return response
                 
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error fetching global stats from database: {e}")
-        import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Error fetching global stats: {str(e)}")
 
 
+# Markets sort orders: order -> (coin field, descending)
+# Pages larger than one cursor chunk (rows) are streamed from the coins table
+MARKETS_STREAM_CHUNK_ROWS = 100
+
+_COIN_SORT_KEYS = {
+    "market_cap_desc": ("market_cap", True),
+    "market_cap_asc": ("market_cap", False),
+    "price_desc": ("current_price", True),
+    "price_asc": ("current_price", False),
+}
+
+# Coin lists at least this long are sorted with numpy; Timsort wins below it
+NUMPY_SORT_MIN_ITEMS = 256
+
+
+def _sort_coins(coins: List[dict], order: str) -> List[dict]:
+    """Sort coins for a markets order (missing values count as 0, ties keep their order)"""
+    sort_key = _COIN_SORT_KEYS.get(order)
+    if sort_key is None:
+        return coins
+    field, descending = sort_key
+    if len(coins) < NUMPY_SORT_MIN_ITEMS:
+        coins.sort(key=lambda coin: coin.get(field) or 0, reverse=descending)
+        return coins
+    keys = np.fromiter((coin.get(field) or 0 for coin in coins), dtype=np.float64, count=len(coins))
+    # A stable argsort of the negated keys keeps ties in order, like sort(reverse=True)
+    order_idx = np.argsort(-keys if descending else keys, kind="stable")
+    return [coins[i] for i in order_idx.tolist()]
+
+
+# Coins reconstructed from api_connector_data, keyed by (connector_id, batch timestamp)
+# and kept in least-recently-used order
+COINS_CACHE_MAX_ENTRIES = 16
+_COINS_CACHE: Dict[Tuple[str, datetime], Tuple[List[dict], int]] = {}
+_COINS_CACHE_LOCK = asyncio.Lock()
+
+
+def _reconstruct_coins(rows: List[Any], connector_id: str) -> List[dict]:
+    """
+    Reconstruct the list by extracting coin data from each row. Handles both
+    one coin per row and a full list in one row; _extract_coins dispatches on
+    the payload shape and remembers the shape last seen for the connector.
+    """
+    return [
+        coin
+        for row in rows
+        for coin in _extract_coins(row["data"], row["raw_response"], connector_id)
+    ]
+
+
+async def _load_market_coins(conn, connector_id: str, rows: List[Any]) -> Tuple[List[dict], int]:
+    """Reconstruct the coins list from the rows of one batch; returns (coins, source row count)"""
+    # Decoding every row's JSON is CPU-bound: run it in a worker thread so the
+    # event loop keeps serving other requests meanwhile
+    coins_list = await asyncio.to_thread(_reconstruct_coins, rows, connector_id)
+    
+    if not coins_list or len(coins_list) == 0:
+        # Try to read from visualization_data table as fallback
+        try:
+            viz_row = await conn.fetchrow("""
+                SELECT data, timestamp
+                FROM visualization_data
+                WHERE data_type = 'markets'
+                ORDER BY timestamp DESC
+                LIMIT 1
+            """)
+            
+            if viz_row and viz_row["data"]:
+                viz_data = _loads(viz_row["data"])
+                if isinstance(viz_data, list):
+                    coins_list = viz_data
+                    logger.info("Using fallback: loaded %s coins from visualization_data table", len(coins_list))
+                elif isinstance(viz_data, dict) and "data" in viz_data and isinstance(viz_data["data"], list):
+                    coins_list = viz_data["data"]
+                    logger.info("Using fallback: loaded %s coins from visualization_data table", len(coins_list))
+        except Exception as viz_err:
+            logger.debug("Could not read from visualization_data: %s", viz_err)
+        
+        # If still no coins, log detailed error
+        if not coins_list or len(coins_list) == 0:
+            # Log detailed information for debugging
+            sample_data = None
+            sample_raw = None
+            data_type = None
+            if rows:
+                first_row = rows[0]
+                data_type = type(first_row.get("data")).__name__
+                data_val = first_row.get("data")
+                if data_val:
+                    if isinstance(data_val, str):
+                        sample_data = data_val[:500]
+                    else:
+                        sample_data = str(data_val)[:500]
+                raw_val = first_row.get("raw_response")
+                if raw_val:
+                    if isinstance(raw_val, str):
+                        sample_raw = raw_val[:500]
+                    else:
+                        sample_raw = str(raw_val)[:500]
+            
+            logger.error(
+                "Could not reconstruct coins list for %s. "
+                "Found %s rows but extracted 0 coins. "
+                "Data type: %s, "
+                "Sample data preview: %s, "
+                "Sample raw_response preview: %s",
+                connector_id, len(rows), data_type, sample_data, sample_raw
+            )
+            raise HTTPException(
+                status_code=500,
+                detail=f"Could not reconstruct coins list from database. "
+                       f"Found {len(rows)} rows but extracted 0 coins. "
+                       f"Data format may be unexpected. Check logs for details."
+            )
+
+    return coins_list, len(rows)
+
+
 @app.get("/api/crypto/markets")
 async def get_crypto_markets(
+    request: Request,
     ids: str = Query(..., description="Comma-separated list of coin IDs"),
     vs_currency: str = Query("usd", description="Target currency"),
     order: str = Query("market_cap_desc", description="Order by"),
@@ -1746,253 +2601,148 @@ async def get_crypto_markets(
     Reads normalized rows from database (one row per coin) and reconstructs the expected list format.
     Backend handles grouping, ordering, limiting, and aggregating before responding.
     """
+    cache_key = f"mkts:{ids}:{order}:{per_page}:{page}"
+    if not _wants_fresh(request):
+        cached = _cached_response(cache_key)
+        if cached is not None:
+            return cached
+    # Parsed once per request; an empty set means no id filter
+    requested_ids = frozenset(part.strip().lower() for part in ids.split(",") if part.strip())
+    if per_page > MARKETS_STREAM_CHUNK_ROWS:
+        # The connection, cursor and first chunk are set up before the response
+        # starts, so their errors get the same 500 as the regular path
+        try:
+            streamed = await _stream_crypto_markets(cache_key, requested_ids, order, per_page, page)
+        except Exception as e:
+            logger.error("Error fetching markets from database: %s", e)
+            raise HTTPException(status_code=500, detail=f"Error fetching markets: {str(e)}")
+        if streamed is not None:
+            return streamed
+    return await _coalesced(cache_key, lambda: _load_crypto_markets(cache_key, requested_ids, order, per_page, page))
+
+
+async def _stream_crypto_markets(cache_key: str, requested_ids: frozenset, order: str, per_page: int, page: int) -> Optional[Response]:
+    """
+    Serve a large markets page from the coins table through a server-side cursor,
+    streaming it chunk by chunk. Returns None when the page has no coins so the
+    caller falls back to the regular (snapshot-aware) path.
+    """
+    generation = _response_cache_generation
+    pool = get_pool()
+    conn = await pool.acquire()
+    # Cursors only live inside a transaction; it is read-only and rolled back at the end
+    transaction = conn.transaction(readonly=True)
+
+    async def release():
+        try:
+            await transaction.rollback()
+        finally:
+            await pool.release(conn)
+
+    try:
+        await transaction.start()
+        cursor = await conn.cursor(
+            _SQL_COINS_PAGE_ROWS, list(requested_ids), order, per_page, (page - 1) * per_page
+        )
+        first = await cursor.fetch(MARKETS_STREAM_CHUNK_ROWS)
+    except BaseException:
+        await release()
+        raise
+
+    # The whole page fitted in the first chunk: answer it like any other page
+    if len(first) < MARKETS_STREAM_CHUNK_ROWS:
+        await release()
+        if not first:
+            return None
+        body = b"[" + ",".join(row["coin"] for row in first).encode() + b"]"
+        _store_body(cache_key, body, generation)
+        return NoStoreORJSONResponse(content=body)
+
+    async def chunks():
+        # Kept for the response cache once the page was sent completely
+        parts = [b"[", ",".join(row["coin"] for row in first).encode()]
+        try:
+            yield parts[0] + parts[1]
+            while True:
+                rows = await cursor.fetch(MARKETS_STREAM_CHUNK_ROWS)
+                if not rows:
+                    break
+                chunk = b"," + ",".join(row["coin"] for row in rows).encode()
+                parts.append(chunk)
+                yield chunk
+            parts.append(b"]")
+            yield b"]"
+        finally:
+            await release()
+        _store_body(cache_key, b"".join(parts), generation)
+
+    logger.info("Streaming markets data from coins table (page %s, per_page %s)", page, per_page)
+    return StreamingResponse(chunks(), media_type="application/json", headers=_NO_STORE_HEADERS)
+
+
+async def _load_crypto_markets(cache_key: str, requested_ids: frozenset, order: str, per_page: int, page: int) -> Response:
+    """Build one page of the markets response from the database and cache it under cache_key"""
+    generation = _response_cache_generation
     try:
         pool = get_pool()
         connector_id = "coingecko_top"
         
         async with pool.acquire() as conn:
-            # Try visualization_data table first (optimized for visualization)
-            viz_row = await conn.fetchrow("""
-                SELECT data, timestamp, metadata
-                FROM visualization_data
-                WHERE data_type = 'markets'
-                ORDER BY timestamp DESC
-                LIMIT 1
-            """)
-            
-            if viz_row:
-                # Use visualization_data (already processed and ready)
-                coins_list = viz_row["data"]
-                if isinstance(coins_list, str):
-                    try:
-                        coins_list = json.loads(coins_list)
-                    except:
-                        pass
-                
-                if isinstance(coins_list, list) and len(coins_list) > 0:
-                    latest_timestamp = viz_row["timestamp"]
-                    # Filter by requested coin IDs if provided
-                    if ids:
-                        requested_ids = [id.strip().lower() for id in ids.split(",")]
-                        coins_list = [
-                            coin for coin in coins_list
-                            if coin.get("id", "").lower() in requested_ids
-                        ]
-                    
-                    # Normalize field names
-                    for coin in coins_list:
-                        if isinstance(coin, dict):
-                            if "total_volume" in coin and "total_volume_24h" not in coin:
-                                coin["total_volume_24h"] = coin["total_volume"]
-                    
-                    # Apply sorting
-                    if order == "market_cap_desc":
-                        coins_list.sort(key=lambda x: x.get("market_cap", 0) or 0, reverse=True)
-                    elif order == "market_cap_asc":
-                        coins_list.sort(key=lambda x: x.get("market_cap", 0) or 0, reverse=False)
-                    elif order == "price_desc":
-                        coins_list.sort(key=lambda x: x.get("current_price", 0) or 0, reverse=True)
-                    elif order == "price_asc":
-                        coins_list.sort(key=lambda x: x.get("current_price", 0) or 0, reverse=False)
-                    
-                    # Apply pagination
-                    start_idx = (page - 1) * per_page
-                    end_idx = start_idx + per_page
-                    paginated_coins = coins_list[start_idx:end_idx]
-                    
-                    logger.info(f"Returning markets data from visualization_data (timestamp: {latest_timestamp}, coins: {len(coins_list)}, filtered: {len(paginated_coins)})")
-                    response = JSONResponse(content=paginated_coins)
-                    response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
-                    response.headers["Pragma"] = "no-cache"
-                    response.headers["Expires"] = "0"
-                    return response
-            
-            # Fallback to api_connector_data if visualization_data not available
-            # Get the most recent timestamp to find all rows from the same batch
-            latest_row = await conn.fetchrow("""
-                SELECT timestamp
-                FROM api_connector_data
-                WHERE connector_id = $1
-                ORDER BY timestamp DESC
-                LIMIT 1
-            """, connector_id)
-            
-            if not latest_row:
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"No data found for {connector_id}. Ensure the scheduler is running and has fetched data."
-                )
-            
-            latest_timestamp = latest_row["timestamp"]
-            
-            # Get all rows from the most recent batch (within 1 second of latest timestamp)
-            # This handles the case where list items are saved as separate rows
-            # Calculate time bounds in Python to avoid PostgreSQL interval arithmetic issues
-            from datetime import timedelta
-            time_lower = latest_timestamp - timedelta(seconds=1)
-            time_upper = latest_timestamp + timedelta(seconds=1)
+            # Try the coins table first: one row per coin of the latest ingestion run,
+            # filtered, sorted and sliced in SQL, arriving as JSON text
+            table_page = await conn.fetchrow(_SQL_COINS_PAGE, list(requested_ids), order, per_page, (page - 1) * per_page)
+            
+            if table_page and table_page["total_coins"] > 0:
+                logger.info("Returning markets data from coins table (timestamp: %s, coins: %s)",
+                            table_page['timestamp'], table_page['matched_coins'])
+                response = NoStoreORJSONResponse(content=table_page["coins"])
+                _store_response(cache_key, response, generation)
+                return response
             
-            rows = await conn.fetch("""
-                SELECT data, raw_response
-                FROM api_connector_data
-                WHERE connector_id = $1
-                AND timestamp >= $2
-                AND timestamp <= $3
-                ORDER BY id
-            """, connector_id, time_lower, time_upper)
+            # Then visualization_data (optimized for visualization), paged the same way
+            viz_page = await conn.fetchrow(_SQL_MARKETS_PAGE, list(requested_ids), order, per_page, (page - 1) * per_page)
             
-            if not rows:
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"No data found for {connector_id}. Ensure the scheduler is running and has fetched data."
+            if viz_page and viz_page["total_coins"] > 0:
+                logger.info(
+                    "Returning markets data from visualization_data (timestamp: %s, coins: %s, filtered: %s)",
+                    viz_page['timestamp'], viz_page['matched_coins'],
+                    min(max(viz_page['matched_coins'] - (page - 1) * per_page, 0), per_page)
                 )
+                response = NoStoreORJSONResponse(content=viz_page["coins"])
+                _store_response(cache_key, response, generation)
+                return response
             
-            # Reconstruct the list by extracting coin data from each row
-            # Handle both cases: 
-            # 1. Multiple rows (one coin per row) - normalized storage
-            # 2. Single row with full list in data field
-            coins_list = []
-            
-            for row in rows:
-                data = row["data"]
-                raw_response = row.get("raw_response")
-                
-                # Handle string JSON (if stored as string)
-                if isinstance(data, str):
-                    try:
-                        data = json.loads(data)
-                    except:
-                        pass
-                
-                if isinstance(raw_response, str):
-                    try:
-                        raw_response = json.loads(raw_response)
-                    except:
-                        pass
-                
-                # Priority 1: data is a list (entire list stored in one row)
-                if isinstance(data, list):
-                    for item in data:
-                        if isinstance(item, dict):
-                            # Validate it's a coin object
-                            if item.get("id") or item.get("symbol") or item.get("name") or item.get("current_price") is not None:
-                                coins_list.append(item)
-                    continue
-                
-                # Priority 2: data is a dict
-                if isinstance(data, dict):
-                    # Check if this is a single coin object
-                    if data.get("id") or data.get("symbol") or data.get("name") or data.get("current_price") is not None:
-                        coins_list.append(data)
-                        continue
-                    # Check if data contains a nested list/array
-                    elif "data" in data and isinstance(data["data"], list):
-                        for item in data["data"]:
-                            if isinstance(item, dict):
-                                coins_list.append(item)
-                        continue
-                    # Check for other nested structures
-                    elif any(isinstance(v, list) for v in data.values()):
-                        for key, value in data.items():
-                            if isinstance(value, list):
-                                for item in value:
-                                    if isinstance(item, dict) and (item.get("id") or item.get("symbol") or item.get("name")):
-                                        coins_list.append(item)
-                                break
-                        continue
-            
-                # Priority 3: raw_response contains the data
-                if raw_response:
-                    if isinstance(raw_response, list):
-                        for item in raw_response:
-                            if isinstance(item, dict) and (item.get("id") or item.get("symbol") or item.get("name") or item.get("current_price") is not None):
-                                coins_list.append(item)
-                        continue
-                    elif isinstance(raw_response, dict):
-                        # Check if it's a single coin
-                        if raw_response.get("id") or raw_response.get("symbol") or raw_response.get("name") or raw_response.get("current_price") is not None:
-                            coins_list.append(raw_response)
-                            continue
-                        # Check if it contains a list
-                        elif "data" in raw_response and isinstance(raw_response["data"], list):
-                            for item in raw_response["data"]:
-                                if isinstance(item, dict):
-                                    coins_list.append(item)
-                            continue
-                        # Check for nested lists
-                    elif any(isinstance(v, list) for v in raw_response.values()):
-                            for key, value in raw_response.items():
-                                if isinstance(value, list):
-                                    for item in value:
-                                        if isinstance(item, dict) and (item.get("id") or item.get("symbol") or item.get("name")):
-                                            coins_list.append(item)
-                                break
-                            continue
-            
-            if not coins_list or len(coins_list) == 0:
-                # Try to read from visualization_data table as fallback
-                try:
-                    viz_row = await conn.fetchrow("""
-                        SELECT data, timestamp
-                        FROM visualization_data
-                        WHERE data_type = 'markets'
-                        ORDER BY timestamp DESC
-                        LIMIT 1
-                    """)
-                    
-                    if viz_row and viz_row.get("data"):
-                        viz_data = viz_row["data"]
-                        if isinstance(viz_data, list):
-                            coins_list = viz_data
-                            logger.info(f"Using fallback: loaded {len(coins_list)} coins from visualization_data table")
-                        elif isinstance(viz_data, dict) and "data" in viz_data and isinstance(viz_data["data"], list):
-                            coins_list = viz_data["data"]
-                            logger.info(f"Using fallback: loaded {len(coins_list)} coins from visualization_data table")
-                except Exception as viz_err:
-                    logger.debug(f"Could not read from visualization_data: {viz_err}")
+            # Fallback to api_connector_data if visualization_data not available.
+            # Reuse the coins reconstructed for a batch by an earlier request; the lock
+            # lets one request rebuild a new batch while concurrent ones wait for it
+            async with _COINS_CACHE_LOCK:
+                # Find the latest batch and fetch its rows unless already reconstructed
+                known_timestamps = [ts for cid, ts in _COINS_CACHE if cid == connector_id]
+                rows = await conn.fetch(_SQL_LATEST_BATCH_ROWS, connector_id, known_timestamps)
                 
-                # If still no coins, log detailed error
-                if not coins_list or len(coins_list) == 0:
-                    # Log detailed information for debugging
-                    sample_data = None
-                    sample_raw = None
-                    data_type = None
-                    if rows:
-                        first_row = rows[0]
-                        data_type = type(first_row.get("data")).__name__
-                        data_val = first_row.get("data")
-                        if data_val:
-                            if isinstance(data_val, str):
-                                sample_data = data_val[:500]
-                            else:
-                                sample_data = str(data_val)[:500]
-                        raw_val = first_row.get("raw_response")
-                        if raw_val:
-                            if isinstance(raw_val, str):
-                                sample_raw = raw_val[:500]
-                            else:
-                                sample_raw = str(raw_val)[:500]
-                    
-                    logger.error(
-                        f"Could not reconstruct coins list for {connector_id}. "
-                        f"Found {len(rows)} rows but extracted 0 coins. "
-                        f"Data type: {data_type}, "
-                        f"Sample data preview: {sample_data}, "
-                        f"Sample raw_response preview: {sample_raw}"
+                if not rows:
+                    raise HTTPException(
+                        status_code=404,
+                        detail=f"No data found for {connector_id}. Ensure the scheduler is running and has fetched data."
                     )
-                raise HTTPException(
-                    status_code=500,
-                        detail=f"Could not reconstruct coins list from database. "
-                               f"Found {len(rows)} rows but extracted 0 coins. "
-                               f"Data format may be unexpected. Check logs for details."
-                )
-            
+                
+                latest_timestamp = rows[0]["ts"]
+                coins_key = (connector_id, latest_timestamp)
+                cached = _COINS_CACHE.pop(coins_key, None)
+                if cached is None:
+                    cached = await _load_market_coins(conn, connector_id, rows)
+                    if len(_COINS_CACHE) >= COINS_CACHE_MAX_ENTRIES:
+                        _COINS_CACHE.pop(next(iter(_COINS_CACHE)))
+                # Re-inserted last so the dict's insertion order stays least recently used first
+                _COINS_CACHE[coins_key] = cached
+            # Copy the list (not the coins): sorting below must not reorder the cached batch
+            coins_list, row_count = list(cached[0]), cached[1]
+
             # Filter by requested coin IDs if provided
-            if ids:
-                requested_ids = [id.strip().lower() for id in ids.split(",")]
+            if requested_ids:
                 coins_list = [
                     coin for coin in coins_list
-                    if coin.get("id", "").lower() in requested_ids
+                    if (coin.get("id") or "").lower() in requested_ids
                 ]
             
             # Normalize field names - CoinGecko uses 'total_volume' but frontend expects 'total_volume_24h'
@@ -2002,14 +2752,7 @@ async def get_crypto_markets(
                         coin["total_volume_24h"] = coin["total_volume"]
             
             # Apply sorting
-            if order == "market_cap_desc":
-                coins_list.sort(key=lambda x: x.get("market_cap", 0) or 0, reverse=True)
-            elif order == "market_cap_asc":
-                coins_list.sort(key=lambda x: x.get("market_cap", 0) or 0, reverse=False)
-            elif order == "price_desc":
-                coins_list.sort(key=lambda x: x.get("current_price", 0) or 0, reverse=True)
-            elif order == "price_asc":
-                coins_list.sort(key=lambda x: x.get("current_price", 0) or 0, reverse=False)
+            coins_list = _sort_coins(coins_list, order)
             
             # Apply pagination
             start_idx = (page - 1) * per_page
@@ -2017,34 +2760,20 @@ async def get_crypto_markets(
             paginated_coins = coins_list[start_idx:end_idx]
             
             # Save full coins list to visualization_data table for easy monitoring
-            # Store the complete list (before pagination) for monitoring purposes
-            try:
-                await conn.execute("""
-                    INSERT INTO visualization_data (data_type, timestamp, data, metadata, updated_at)
-                    VALUES ($1, $2, $3, $4, NOW())
-                    ON CONFLICT (data_type, timestamp) 
-                    DO UPDATE SET 
-                        data = EXCLUDED.data,
-                        metadata = EXCLUDED.metadata,
-                        updated_at = NOW()
-                """, 
-                    "markets",
-                    latest_timestamp,
-                    json.dumps(coins_list),  # Store full list
-                    json.dumps({
-                        "source": connector_id,
-                        "total_coins": len(coins_list),
-                        "filtered_coins": len(paginated_coins),
-                        "page": page,
-                        "per_page": per_page
-                    })
-                )
-                logger.debug(f"Saved markets data to visualization_data table ({len(coins_list)} coins)")
-            except Exception as save_err:
-                logger.warning(f"Failed to save to visualization_data: {save_err}")
+            # Store the complete batch (before filtering and pagination), in the background
+            _schedule_viz_write("markets", latest_timestamp, cached[0], {
+                "source": connector_id,
+                "total_coins": len(cached[0]),
+                "filtered_coins": len(paginated_coins),
+                "page": page,
+                "per_page": per_page
+            })
             
-            logger.info(f"Returning markets data from database (timestamp: {latest_timestamp}, rows: {len(rows)}, coins: {len(coins_list)}, filtered: {len(paginated_coins)})")
-            return JSONResponse(content=paginated_coins)
+            logger.info("Returning markets data from database (timestamp: %s, rows: %s, coins: %s, filtered: %s)",
+                        latest_timestamp, row_count, len(coins_list), len(paginated_coins))
+            response = NoStoreORJSONResponse(content=paginated_coins)
+            _store_response(cache_key, response, generation)
+            return response
                 
     except HTTPException:
         raise
@@ -2054,6 +2783,10 @@ async def get_crypto_markets(
 
 
 # Diagnostic endpoint to inspect raw data storage
+# jsonb_typeof() name -> Python type json.loads produces
+_JSONB_PYTHON_TYPES = {"object": "dict", "array": "list", "string": "str", "number": "int", "boolean": "bool", "null": "NoneType"}
+
+
 @app.get("/api/crypto/debug/{connector_id}")
 async def debug_connector_data(connector_id: str):
     """
@@ -2064,11 +2797,15 @@ async def debug_connector_data(connector_id: str):
         pool = get_pool()
         
         async with pool.acquire() as conn:
-            # Get the most recent rows
+            # Get the most recent rows; payloads are truncated server-side so
+            # multi-MB raw responses are never shipped or parsed just for a preview
             rows = await conn.fetch("""
-                SELECT id, timestamp, data, raw_response, 
-                       pg_typeof(data) as data_type,
-                       pg_typeof(raw_response) as raw_response_type
+                SELECT id, timestamp,
+                       left(data::text, 200) AS data_preview,
+                       CASE WHEN jsonb_typeof(data) = 'number' AND data::text ~ '[.eE]' THEN 'float'
+                            ELSE jsonb_typeof(data)
+                       END AS data_json_type,
+                       left(raw_response::text, 200) AS raw_response_preview
                 FROM api_connector_data
                 WHERE connector_id = $1
                 ORDER BY timestamp DESC
@@ -2084,28 +2821,20 @@ async def debug_connector_data(connector_id: str):
             
             result = []
             for row in rows:
-                data = row["data"]
-                raw_response = row.get("raw_response")
-                
-                # Get type information
-                data_type = type(data).__name__
-                if isinstance(data, str):
-                    try:
-                        parsed = json.loads(data)
-                        data_type += f" (parses to {type(parsed).__name__})"
-                    except:
-                        data_type += " (invalid JSON)"
+                # Pooled connections return JSONB as text
+                data_type = f"str (parses to {_JSONB_PYTHON_TYPES.get(row['data_json_type'], row['data_json_type'])})"
+                raw_response_preview = row["raw_response_preview"]
                 
                 result.append({
                     "id": row["id"],
                     "timestamp": row["timestamp"].isoformat() if row["timestamp"] else None,
                     "data_type": data_type,
-                    "data_preview": str(data)[:200] if data else None,
-                    "data_is_list": isinstance(data, list),
-                    "data_is_dict": isinstance(data, dict),
-                    "data_is_string": isinstance(data, str),
-                    "raw_response_type": type(raw_response).__name__ if raw_response else None,
-                    "raw_response_preview": str(raw_response)[:200] if raw_response else None,
+                    "data_preview": row["data_preview"],
+                    "data_is_list": False,
+                    "data_is_dict": False,
+                    "data_is_string": True,
+                    "raw_response_type": "str" if raw_response_preview is not None else None,
+                    "raw_response_preview": raw_response_preview,
                 })
             
             return {
@@ -2116,76 +2845,195 @@ async def debug_connector_data(connector_id: str):
     
     except Exception as e:
         logger.error(f"Error in debug endpoint: {e}")
-        import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
 
 # Visualization Data Monitoring Endpoints
+def _encode_keyset_cursor(row) -> str:
+    """Opaque keyset cursor pointing just past row (any row with timestamp and id)"""
+    return base64.urlsafe_b64encode(f"{row['timestamp'].isoformat()}|{row['id']}".encode()).decode()
+
+
+def _decode_keyset_cursor(cursor: str) -> Tuple[datetime, int]:
+    """(timestamp, id) of a cursor from _encode_keyset_cursor; HTTP 400 when malformed"""
+    try:
+        ts, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().rsplit("|", 1)
+        return datetime.fromisoformat(ts), int(row_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+# Pages above this many rows are streamed, fetched from a cursor this many rows at a time
+VIZ_STREAM_MIN_LIMIT = 1000
+VIZ_STREAM_CHUNK_ROWS = 500
+
+
+def _viz_list_statement(data_type: Optional[str], cursor: Optional[str], limit: int, skip: int,
+                        include_total: bool) -> Tuple[str, tuple]:
+    """SQL and arguments for one /api/visualization/data page"""
+    if cursor:
+        cursor_ts, cursor_id = _decode_keyset_cursor(cursor)
+        if data_type:
+            return _SQL_VIZ_LIST_BY_TYPE_AFTER, (data_type, cursor_ts, cursor_id, limit)
+        return _SQL_VIZ_LIST_AFTER, (cursor_ts, cursor_id, limit)
+    if data_type:
+        return (_SQL_VIZ_LIST_BY_TYPE_COUNTED if include_total else _SQL_VIZ_LIST_BY_TYPE), (data_type, limit, skip)
+    return (_SQL_VIZ_LIST_COUNTED if include_total else _SQL_VIZ_LIST), (limit, skip)
+
+
+async def _viz_total(conn, data_type: Optional[str]) -> int:
+    """Number of visualization_data rows, optionally of one data_type"""
+    if data_type:
+        return await conn.fetchval(_SQL_VIZ_COUNT_BY_TYPE, data_type)
+    return await conn.fetchval(_SQL_VIZ_COUNT)
+
+
+def _viz_row(row) -> dict:
+    """API representation of a visualization_data row; orjson writes the datetimes as ISO 8601"""
+    return {
+        "id": row["id"],
+        "data_type": row["data_type"],
+        "timestamp": row["timestamp"],
+        "data": row["data"],
+        "metadata": row["metadata"],
+        "created_at": row["created_at"],
+        "updated_at": row["updated_at"]
+    }
+
+
+async def _start_stream(chunks: AsyncIterator[bytes]) -> StreamingResponse:
+    """
+    Stream a JSON body once its first chunk is ready. The generators only yield
+    after acquiring their connection and reading the first rows, so connection
+    and query errors still raise here, in the handler, instead of cutting off a
+    200 response mid-body.
+    """
+    first = await chunks.__anext__()
+
+    async def body():
+        try:
+            yield first
+            async for chunk in chunks:
+                yield chunk
+        finally:
+            await chunks.aclose()
+
+    return StreamingResponse(body(), media_type="application/json")
+
+
+async def _stream_visualization_data(statement: str, args: tuple, data_type: Optional[str], cursor: Optional[str],
+                                     limit: int, skip: int, include_total: bool):
+    """
+    Yield the /api/visualization/data response body (same JSON envelope) while
+    reading the page through a server-side cursor, so only one chunk of rows is
+    held in memory at a time. total and next_cursor trail the rows. Nothing is
+    yielded before the first chunk was read (see _start_stream).
+    """
+    pool = get_pool()
+    async with pool.acquire() as conn:
+        # Cursors only live inside a transaction
+        async with conn.transaction(readonly=True):
+            head = b'{"success":true,"data":['
+            buffer = []
+            sent = 0
+            total_count = None
+            last_row = None
+            async for row in conn.cursor(statement, *args, prefetch=VIZ_STREAM_CHUNK_ROWS):
+                if last_row is None and include_total and not cursor:
+                    total_count = row["total_count"]
+                buffer.append(orjson.dumps(_viz_row(row)))
+                last_row = row
+                if len(buffer) >= VIZ_STREAM_CHUNK_ROWS:
+                    yield head + (b"," if sent else b"") + b",".join(buffer)
+                    head = b""
+                    sent += len(buffer)
+                    buffer = []
+            if buffer:
+                yield head + (b"," if sent else b"") + b",".join(buffer)
+                head = b""
+                sent += len(buffer)
+
+            if include_total and total_count is None:
+                total_count = await _viz_total(conn, data_type) if skip > 0 or cursor else 0
+            trailer = orjson.dumps({
+                "total": total_count,
+                "limit": limit,
+                "skip": skip,
+                "next_cursor": _encode_keyset_cursor(last_row) if last_row is not None and sent == limit else None
+            })
+            # Close the data array and continue the envelope with the trailer's fields
+            yield head + b"]," + trailer[1:]
+
+
 @app.get("/api/visualization/data")
 async def get_visualization_data(
     data_type: Optional[str] = Query(None, description="Filter by data type: 'markets' or 'global_stats'"),
     limit: int = Query(10, description="Number of recent records to return"),
-    skip: int = Query(0, description="Number of records to skip")
+    skip: int = Query(0, description="Number of records to skip"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page (replaces skip)"),
+    include_total: bool = Query(False, description="Also return the total number of matching records")
 ):
     """
     Get visualization data from the dedicated visualization_data table.
     Useful for monitoring and debugging visualization data storage.
+    Deep pages should follow next_cursor rather than raise skip: a cursor
+    seeks straight to the page while OFFSET scans every skipped row.
+    The total is only computed with include_total=true ("total" is None
+    otherwise): counting visits every matching row, which tailing and
+    infinite-scroll callers do not need.
     """
     try:
+        statement, args = _viz_list_statement(data_type, cursor, limit, skip, include_total)
+        
+        # Large pages are streamed from a server-side cursor instead of materialized
+        if limit > VIZ_STREAM_MIN_LIMIT:
+            return await _start_stream(
+                _stream_visualization_data(statement, args, data_type, cursor, limit, skip, include_total)
+            )
+        
         pool = get_pool()
         
         async with pool.acquire() as conn:
-            query = """
-                SELECT id, data_type, timestamp, data, metadata, created_at, updated_at
-                FROM visualization_data
-            """
-            params = []
-            
-            if data_type:
-                query += " WHERE data_type = $1"
-                params.append(data_type)
-            
-            query += " ORDER BY timestamp DESC LIMIT $%d OFFSET $%d" % (len(params) + 1, len(params) + 2)
-            params.extend([limit, skip])
-            
-            rows = await conn.fetch(query, *params)
-            
-            # Get total count
-            count_query = "SELECT COUNT(*) FROM visualization_data"
-            if data_type:
-                count_query += " WHERE data_type = $1"
-                total_count = await conn.fetchval(count_query, data_type)
+            rows = await conn.fetch(statement, *args)
+            
+            # Total count rides along on every offset-page row; a page past the end
+            # (or a keyset page, which only sees later rows) counts separately
+            if not include_total:
+                total_count = None
+            elif rows and not cursor:
+                total_count = rows[0]["total_count"]
+            elif skip > 0 or cursor:
+                total_count = await _viz_total(conn, data_type)
             else:
-                total_count = await conn.fetchval(count_query)
-            
-            result = []
-            for row in rows:
-                result.append({
-                    "id": row["id"],
-                    "data_type": row["data_type"],
-                    "timestamp": row["timestamp"].isoformat() if row["timestamp"] else None,
-                    "data": row["data"],
-                    "metadata": row["metadata"],
-                    "created_at": row["created_at"].isoformat() if row["created_at"] else None,
-                    "updated_at": row["updated_at"].isoformat() if row["updated_at"] else None
-                })
+                total_count = 0
             
-            return {
+            return ORJSONResponse(content={
                 "success": True,
-                "data": result,
+                "data": [_viz_row(row) for row in rows],
                 "total": total_count,
                 "limit": limit,
-                "skip": skip
-            }
+                "skip": skip,
+                # A full page may have more rows after it
+                "next_cursor": _encode_keyset_cursor(rows[-1]) if rows and len(rows) == limit else None
+            })
     
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching visualization data: {e}")
-        import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Error fetching visualization data: {str(e)}")
 
 
+# Source rows per connector for trigger-update: (SQL, whether it returns the
+# whole latest batch rather than only the latest row)
+_TRIGGER_SPECS = {
+    "coingecko_top": (_SQL_LATEST_BATCH_DATA, True),
+    "coingecko_global": (_SQL_LATEST_CONNECTOR_ROWS, False),
+}
+
+
 @app.post("/api/visualization/trigger-update")
 async def trigger_visualization_update(connector_id: str = "coingecko_top"):
     """
@@ -2193,67 +3041,29 @@ async def trigger_visualization_update(connector_id: str = "coingecko_top"):
     This endpoint reads the latest data from api_connector_data and updates visualization_data.
     """
     try:
+        spec = _TRIGGER_SPECS.get(connector_id)
+        if spec is None:
+            raise HTTPException(status_code=400, detail=f"Unsupported connector_id: {connector_id}")
+        statement, batch = spec
+        
         pool = get_pool()
         async with pool.acquire() as conn:
-            if connector_id == "coingecko_top":
-                # Get latest timestamp
-                latest_row = await conn.fetchrow("""
-                    SELECT timestamp
-                    FROM api_connector_data
-                    WHERE connector_id = $1
-                    ORDER BY timestamp DESC
-                    LIMIT 1
-                """, connector_id)
-                
-                if not latest_row:
-                    raise HTTPException(status_code=404, detail=f"No data found for {connector_id}")
-                
-                latest_timestamp = latest_row["timestamp"]
-                from datetime import timedelta
-                time_lower = latest_timestamp - timedelta(seconds=2)
-                time_upper = latest_timestamp + timedelta(seconds=2)
-                
-                # Get all rows from latest batch
-                rows = await conn.fetch("""
-                    SELECT data, raw_response, timestamp
-                    FROM api_connector_data
-                    WHERE connector_id = $1
-                    AND timestamp >= $2
-                    AND timestamp <= $3
-                    ORDER BY id
-                """, connector_id, time_lower, time_upper)
-                
-                if not rows:
-                    raise HTTPException(status_code=404, detail=f"No rows found for {connector_id}")
-                
-                # Use the first row's data
-                first_row = rows[0]
-                data = first_row["data"]
-                raw_response = first_row.get("raw_response")
-                timestamp = first_row["timestamp"]
-                
-                # Trigger update
-                await update_visualization_data(connector_id, data, timestamp, raw_response)
-                
-                return {"status": "success", "message": f"Visualization data updated for {connector_id}", "rows_processed": len(rows)}
-            
-            elif connector_id == "coingecko_global":
-                row = await conn.fetchrow("""
-                    SELECT data, raw_response, timestamp
-                    FROM api_connector_data
-                    WHERE connector_id = $1
-                    ORDER BY timestamp DESC
-                    LIMIT 1
-                """, connector_id)
-                
-                if not row:
-                    raise HTTPException(status_code=404, detail=f"No data found for {connector_id}")
-                
-                await update_visualization_data(connector_id, row["data"], row["timestamp"], row.get("raw_response"))
-                
-                return {"status": "success", "message": f"Visualization data updated for {connector_id}"}
+            if batch:
+                rows = await conn.fetch(statement, connector_id, VIZ_BATCH_WINDOW)
             else:
-                raise HTTPException(status_code=400, detail=f"Unsupported connector_id: {connector_id}")
+                rows = await conn.fetch(statement, [connector_id])
+        
+        if not rows:
+            raise HTTPException(status_code=404, detail=f"No data found for {connector_id}")
+        
+        # Use the first row's data
+        first_row = rows[0]
+        await update_visualization_data(connector_id, first_row["data"], first_row["timestamp"], first_row["raw_response"])
+        
+        result = {"status": "success", "message": f"Visualization data updated for {connector_id}"}
+        if batch:
+            result["rows_processed"] = len(rows)
+        return result
     except HTTPException:
         raise
     except Exception as e:
@@ -2272,13 +3082,7 @@ async def get_latest_visualization_data(
         pool = get_pool()
         
         async with pool.acquire() as conn:
-            row = await conn.fetchrow("""
-                SELECT id, data_type, timestamp, data, metadata, created_at, updated_at
-                FROM visualization_data
-                WHERE data_type = $1
-                ORDER BY timestamp DESC
-                LIMIT 1
-            """, data_type)
+            row = await conn.fetchrow(_SQL_VIZ_LATEST, data_type)
             
             if not row:
                 raise HTTPException(
@@ -2286,24 +3090,191 @@ async def get_latest_visualization_data(
                     detail=f"No visualization data found for type: {data_type}"
                 )
             
-            return {
-                "success": True,
-                "data": {
-                    "id": row["id"],
-                    "data_type": row["data_type"],
-                    "timestamp": row["timestamp"].isoformat() if row["timestamp"] else None,
-                    "data": row["data"],
-                    "metadata": row["metadata"],
-                    "created_at": row["created_at"].isoformat() if row["created_at"] else None,
-                    "updated_at": row["updated_at"].isoformat() if row["updated_at"] else None
-                }
-            }
+            return ORJSONResponse(content={"success": True, "data": _viz_row(row)})
     
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error fetching latest visualization data: {e}")
-        raise HTTPException(status_code=500, detail=f"Error fetching latest visualization data: {str(e)}")
+        logger.error("Error fetching latest visualization data: %s", e)
+        raise HTTPException(status_code=500, detail=f"Error fetching latest visualization data: {str(e)}")
+
+
+# Price fields per WebSocket wire format, in lookup order
+_OKX_PRICE_FIELDS = ("px", "last")
+_BINANCE_PRICE_FIELDS = ("p", "c")
+
+
+# Symbol/stream name -> instrument; the handful of traded pairs repeat across every message
+SYMBOL_CACHE_MAX_ENTRIES = 1024
+_SYMBOL_CACHE: Dict[str, str] = {}
+_STREAM_SYMBOL_CACHE: Dict[str, str] = {}
+
+
+def _normalize_symbol(symbol: str) -> str:
+    """BTCUSDT-style 6 character symbols become BTC-USDT style instruments"""
+    instrument = _SYMBOL_CACHE.get(symbol)
+    if instrument is None:
+        instrument = f"{symbol[:3]}-{symbol[3:]}" if len(symbol) == 6 else symbol
+        if len(_SYMBOL_CACHE) < SYMBOL_CACHE_MAX_ENTRIES:
+            _SYMBOL_CACHE[symbol] = instrument
+    return instrument
+
+
+def _stream_instrument(stream: str) -> str:
+    """Instrument of a Binance stream name (e.g. btcusdt@trade)"""
+    instrument = _STREAM_SYMBOL_CACHE.get(stream)
+    if instrument is None:
+        instrument = _normalize_symbol(stream.partition("@")[0].upper())
+        if len(_STREAM_SYMBOL_CACHE) < SYMBOL_CACHE_MAX_ENTRIES:
+            _STREAM_SYMBOL_CACHE[stream] = instrument
+    return instrument
+
+
+def _extract_okx(raw: dict) -> Tuple[Optional[str], Optional[float]]:
+    """OKX push: {"arg": {"instId": ...}, "data": [{"instId": ..., "px" | "last": ...}]}"""
+    arg = raw.get("arg")
+    instrument = arg.get("instId") if isinstance(arg, dict) else None
+    price = None
+    data = raw.get("data")
+    if isinstance(data, list):
+        for item in data:
+            if isinstance(item, dict):
+                if not instrument:
+                    instrument = item.get("instId")
+                price = first_price(item, _OKX_PRICE_FIELDS)
+                if price is not None:
+                    break
+    return instrument, price
+
+
+def _extract_binance_stream(raw: dict) -> Tuple[Optional[str], Optional[float]]:
+    """Binance combined stream: {"stream": "btcusdt@trade", "data": {"s": ..., "p" | "c": ...}}"""
+    stream = raw.get("stream")
+    instrument = _stream_instrument(stream) if isinstance(stream, str) else None
+    data = raw.get("data")
+    if not isinstance(data, dict):
+        return instrument, None
+    if not instrument and isinstance(data.get("s"), str):
+        instrument = _normalize_symbol(data["s"])
+    return instrument, first_price(data, _BINANCE_PRICE_FIELDS)
+
+
+def _extract_binance_direct(raw: dict) -> Tuple[Optional[str], Optional[float]]:
+    """Binance raw stream: {"e": "trade" | "24hrTicker", "s": "BTCUSDT", "p" | "c": ...}"""
+    symbol = raw.get("s")
+    instrument = _normalize_symbol(symbol) if isinstance(symbol, str) and symbol else None
+    return instrument, first_price(raw, _BINANCE_PRICE_FIELDS)
+
+
+def _extract_generic_instrument(data_obj: Any) -> Optional[str]:
+    """Instrument lookup for messages of unknown shape"""
+    if not isinstance(data_obj, dict):
+        return None
+    symbol = data_obj.get("s")
+    if isinstance(symbol, str) and symbol:
+        return _normalize_symbol(symbol)
+    data = data_obj.get("data")
+    if isinstance(data, list) and data and isinstance(data[0], dict):
+        return data[0].get("instId")
+    if isinstance(data, dict):
+        return _extract_generic_instrument(data)
+    return None
+
+
+def _extract_ws_fields(raw: Any) -> Tuple[Optional[str], Optional[float]]:
+    """
+    (instrument, price) of a WebSocket message. Known wire formats are told apart
+    by a top-level key and read by a flat extractor; anything else, or a known
+    shape without a price, goes through the recursive search.
+    """
+    if isinstance(raw, dict):
+        if "arg" in raw:
+            instrument, price = _extract_okx(raw)
+        elif "stream" in raw:
+            instrument, price = _extract_binance_stream(raw)
+        elif "e" in raw or "s" in raw:
+            instrument, price = _extract_binance_direct(raw)
+        else:
+            return _extract_generic_instrument(raw), find_price(raw)
+        if price is None:
+            price = find_price(raw)
+        return instrument or _extract_generic_instrument(raw), price
+    return None, find_price(raw)
+
+
+# /api/websocket/save inserts are queued and written by one flusher task: whatever
+# accumulated while the previous write ran goes out as a single multi-row INSERT
+WS_SAVE_QUEUE_MAX = 10000
+WS_SAVE_BATCH_MAX = 500
+_ws_save_queue: Optional[asyncio.Queue] = None
+_ws_save_flusher: Optional[asyncio.Task] = None
+
+
+async def _insert_ws_rows(batch):
+    """Insert queued (row, future) pairs and resolve each future with its row id"""
+    rows = [row for row, _ in batch]
+    try:
+        async with get_pool().acquire() as conn:
+            if len(rows) == 1:
+                ids = [await conn.fetchval(_SQL_INSERT_WS_MESSAGE, *rows[0])]
+            else:
+                # ids come from one sequence in insertion (= ordinality) order
+                ids = sorted(r["id"] for r in await conn.fetch(_SQL_INSERT_WS_MESSAGES, *zip(*rows)))
+    except Exception as e:
+        if len(batch) == 1:
+            if not batch[0][1].done():
+                batch[0][1].set_exception(e)
+            return
+        # Retry one by one so a single bad message only fails its own request
+        for item in batch:
+            await _insert_ws_rows([item])
+        return
+    for (_, future), inserted_id in zip(batch, ids):
+        if not future.done():
+            future.set_result(inserted_id)
+
+
+async def _flush_ws_saves(queue: asyncio.Queue):
+    """Drain the save queue into multi-row inserts until cancelled"""
+    while True:
+        batch = [await queue.get()]
+        while len(batch) < WS_SAVE_BATCH_MAX and not queue.empty():
+            batch.append(queue.get_nowait())
+        try:
+            await _insert_ws_rows(batch)
+        except Exception as e:
+            logger.error("WebSocket save flusher error: %s", e)
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+
+async def _queue_ws_message(row: tuple):
+    """Queue one websocket_messages row for the flusher and wait for its id"""
+    global _ws_save_queue, _ws_save_flusher
+    if _ws_save_flusher is None or _ws_save_flusher.done():
+        _ws_save_queue = asyncio.Queue(maxsize=WS_SAVE_QUEUE_MAX)
+        _ws_save_flusher = asyncio.create_task(_flush_ws_saves(_ws_save_queue))
+    future = asyncio.get_running_loop().create_future()
+    await _ws_save_queue.put((row, future))
+    return await future
+
+
+async def stop_ws_save_flusher():
+    """Cancel the flusher and fail anything still queued"""
+    global _ws_save_flusher
+    if _ws_save_flusher is None:
+        return
+    _ws_save_flusher.cancel()
+    try:
+        await _ws_save_flusher
+    except asyncio.CancelledError:
+        pass
+    _ws_save_flusher = None
+    while not _ws_save_queue.empty():
+        _, future = _ws_save_queue.get_nowait()
+        if not future.done():
+            future.set_exception(RuntimeError("WebSocket save queue shut down"))
 
 
 # PostgreSQL WebSocket Data Endpoints
@@ -2311,214 +3282,32 @@ async def get_latest_visualization_data(
 async def save_websocket_message(message_data: Dict[str, Any]):
     """Save a single WebSocket message to PostgreSQL in real-time"""
     try:
-        pool = get_pool()
+        get_pool()  # fail fast before queueing when PostgreSQL is not connected
         
         # Extract instrument and price from message data
-        instrument = None
-        price = None
         raw_data = message_data.get("data", {})
-        
-        # Helper function to extract price - enhanced recursive search
-        def extract_price(data_obj, depth=0, max_depth=5):
-            """Extract price from various data formats with recursive search"""
-            if not data_obj or depth > max_depth:
-                return None
-            
-            if isinstance(data_obj, dict):
-                # Try different price field names first (most common cases)
-                for price_field in ["px", "p", "last", "c", "price", "close", "lastPrice", "tradePrice"]:
-                    if price_field in data_obj and data_obj[price_field] is not None:
-                        try:
-                            price_val = data_obj[price_field]
-                            # Handle string prices
-                            if isinstance(price_val, str):
-                                price_val = price_val.strip()
-                                if price_val and price_val != "null" and price_val != "None":
-                                    return float(price_val)
-                            # Handle numeric prices
-                            elif isinstance(price_val, (int, float)):
-                                return float(price_val)
-                        except (ValueError, TypeError):
-                            continue
-                
-                # If no direct price field, recursively search nested structures
-                # Check "data" field (common in OKX, Binance stream format)
-                if "data" in data_obj:
-                    nested_price = extract_price(data_obj["data"], depth + 1, max_depth)
-                    if nested_price is not None:
-                        return nested_price
-                
-                # Recursively search all values in the dict
-                for key, value in data_obj.items():
-                    if key not in ["arg", "stream", "event", "op", "id"]:  # Skip metadata fields
-                        nested_price = extract_price(value, depth + 1, max_depth)
-                        if nested_price is not None:
-                            return nested_price
-                            
-            elif isinstance(data_obj, list) and len(data_obj) > 0:
-                # Check first element (most common case)
-                nested_price = extract_price(data_obj[0], depth + 1, max_depth)
-                if nested_price is not None:
-                    return nested_price
-                # If first element doesn't have price, try all elements
-                for item in data_obj:
-                    nested_price = extract_price(item, depth + 1, max_depth)
-                    if nested_price is not None:
-                        return nested_price
-            
-            return None
-        
-        # Helper function to extract instrument
-        def extract_instrument(data_obj):
-            """Extract instrument from various data formats"""
-            if not data_obj:
-                return None
-            if isinstance(data_obj, dict):
-                # OKX format
-                if "arg" in data_obj and isinstance(data_obj["arg"], dict):
-                    inst_id = data_obj["arg"].get("instId")
-                    if inst_id:
-                        return inst_id
-                # Binance stream format
-                if "stream" in data_obj:
-                    stream = data_obj["stream"]
-                    symbol = stream.split("@")[0].upper()
-                    # Format as BTC-USDT if 6 chars, otherwise keep as is
-                    if len(symbol) == 6:
-                        return f"{symbol[:3]}-{symbol[3:]}"
-                    return symbol
-                # Binance direct format: { "e": "trade", "s": "BTCUSDT", ... }
-                if "s" in data_obj:
-                    symbol = data_obj["s"]
-                    if len(symbol) == 6:
-                        return f"{symbol[:3]}-{symbol[3:]}"
-                    return symbol
-                # OKX direct format in data array
-                if "data" in data_obj:
-                    if isinstance(data_obj["data"], list) and len(data_obj["data"]) > 0:
-                        trade = data_obj["data"][0]
-                        if "instId" in trade:
-                            return trade["instId"]
-                    elif isinstance(data_obj["data"], dict):
-                        return extract_instrument(data_obj["data"])
-            return None
-        
-        # Extract instrument and price
-        instrument = extract_instrument(raw_data)
-        price = extract_price(raw_data)
-        
-        # Special handling for OKX format: { "arg": {...}, "data": [...] }
-        if not price and isinstance(raw_data, dict):
-            if "arg" in raw_data and "data" in raw_data:
-                # OKX format - check data array
-                if isinstance(raw_data["data"], list) and len(raw_data["data"]) > 0:
-                    for trade_item in raw_data["data"]:
-                        if isinstance(trade_item, dict):
-                            # Try to extract price from trade item
-                            trade_price = extract_price(trade_item)
-                            if trade_price is not None:
-                                price = trade_price
-                                break
-                            # Also try direct field access
-                            for price_field in ["px", "p", "last", "c", "price"]:
-                                if price_field in trade_item and trade_item[price_field] is not None:
-                                    try:
-                                        price_val = trade_item[price_field]
-                                        if isinstance(price_val, str):
-                                            price_val = price_val.strip()
-                                            if price_val and price_val != "null":
-                                                price = float(price_val)
-                                                break
-                                        elif isinstance(price_val, (int, float)):
-                                            price = float(price_val)
-                                            break
-                                    except (ValueError, TypeError):
-                                        continue
-                        if price is not None:
-                            break
-        
-        # If still no instrument/price, try checking the root data structure
-        if not instrument or not price:
-            # Check if data is the actual trade data directly
-            if isinstance(raw_data, dict):
-                # Binance direct: { "e": "trade", "s": "BTCUSDT", "p": "50000" }
-                if raw_data.get("e") == "trade" and raw_data.get("s"):
-                    if not instrument:
-                        symbol = raw_data["s"]
-                        instrument = f"{symbol[:3]}-{symbol[3:]}" if len(symbol) == 6 else symbol
-                    if not price and raw_data.get("p"):
-                        try:
-                            price = float(raw_data["p"])
-                        except (ValueError, TypeError):
-                            pass
-                # Binance 24hrTicker: { "e": "24hrTicker", "s": "BTCUSDT", "c": "50000" }
-                elif raw_data.get("e") == "24hrTicker" and raw_data.get("s"):
-                    if not instrument:
-                        symbol = raw_data["s"]
-                        instrument = f"{symbol[:3]}-{symbol[3:]}" if len(symbol) == 6 else symbol
-                    if not price and raw_data.get("c"):
-                        try:
-                            price = float(raw_data["c"])
-                        except (ValueError, TypeError):
-                            pass
-                # OKX direct in data array
-                if raw_data.get("data") and isinstance(raw_data["data"], list):
-                    for trade in raw_data["data"]:
-                        if isinstance(trade, dict):
-                            if not instrument and trade.get("instId"):
-                                instrument = trade["instId"]
-                            if not price and trade.get("px"):
-                                try:
-                                    price = float(trade["px"])
-                                except (ValueError, TypeError):
-                                    pass
-                        if instrument and price:
-                            break
-                # Check nested data structure (Binance stream wrapper)
-                if not instrument and raw_data.get("data") and isinstance(raw_data["data"], dict):
-                    nested_data = raw_data["data"]
-                    if nested_data.get("s"):
-                        symbol = nested_data["s"]
-                        instrument = f"{symbol[:3]}-{symbol[3:]}" if len(symbol) == 6 else symbol
-                    if not price and nested_data.get("p"):
-                        try:
-                            price = float(nested_data["p"])
-                        except (ValueError, TypeError):
-                            pass
-                    if not price and nested_data.get("c"):
-                        try:
-                            price = float(nested_data["c"])
-                        except (ValueError, TypeError):
-                            pass
+        instrument, price = _extract_ws_fields(raw_data)
         
         # Prepare timestamp
-        timestamp = datetime.utcnow() if not message_data.get("timestamp") else datetime.fromisoformat(message_data["timestamp"].replace('Z', '+00:00')) if isinstance(message_data.get("timestamp"), str) else message_data["timestamp"]
+        timestamp = _parse_timestamp(message_data.get("timestamp"))
         
         # Use PostgreSQL INSERT with error handling
         try:
-            async with pool.acquire() as conn:
-                inserted_id = await conn.fetchval("""
-                    INSERT INTO websocket_messages (
-                        timestamp, exchange, instrument, price, data, message_type,
-                        latency_ms, message_number, format, extract_time, transform_time,
-                        load_time, total_time
-                    ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13)
-                    RETURNING id
-                """,
-                    timestamp,
-                    message_data.get("exchange", "custom"),
-                    instrument,
-                    price,
-                    json.dumps(raw_data),
-                    message_data.get("type", "trade"),
-                    message_data.get("totalTime") * 1000 if message_data.get("totalTime") else None,
-                    message_data.get("messageNumber"),
-                    message_data.get("format"),
-                    message_data.get("extractTime"),
-                    message_data.get("transformTime"),
-                    message_data.get("loadTime"),
-                    message_data.get("totalTime")
-                )
+            inserted_id = await _queue_ws_message((
+                timestamp,
+                message_data.get("exchange", "custom"),
+                instrument,
+                price,
+                _dumps(raw_data),  # JSON null for "data": null (data is NOT NULL)
+                message_data.get("type", "trade"),
+                message_data.get("totalTime") * 1000 if message_data.get("totalTime") else None,
+                message_data.get("messageNumber"),
+                message_data.get("format"),
+                message_data.get("extractTime"),
+                message_data.get("transformTime"),
+                message_data.get("loadTime"),
+                message_data.get("totalTime")
+            ))
             
             if price is None:
                 print(f"[WARNING] Saved message to PostgreSQL: instrument={instrument}, price=None (price not found in message), id={inserted_id}")
@@ -2534,12 +3323,10 @@ async def save_websocket_message(message_data: Dict[str, Any]):
             }
         except Exception as insert_error:
             print(f"[ERROR] Error inserting message to PostgreSQL: {insert_error}")
-            import traceback
             traceback.print_exc()
             raise HTTPException(status_code=500, detail=f"Error inserting message: {str(insert_error)}")
     except Exception as e:
         print(f"[ERROR] Error saving individual message: {e}")
-        import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Error saving message: {str(e)}")
 
@@ -2553,37 +3340,36 @@ async def save_websocket_to_db(message: dict) -> Optional[Dict[str, Any]]:
         pool = get_pool()
         raw_data = message.get("data", {})
         exchange = message.get("exchange", "custom")
-        instrument = message.get("instrument") or "-"
-        price = message.get("price") or 0.0
+        instrument = message.get("instrument")
+        price = message.get("price")
+        if instrument is None or price is None:
+            # Callers that did not extract the fields themselves share the endpoints' parser
+            parsed_instrument, parsed_price = _extract_ws_fields(raw_data)
+            instrument = instrument or parsed_instrument
+            price = price if price is not None else parsed_price
+        instrument = instrument or "-"
+        price = price or 0.0
         message_type = message.get("message_type", "trade")
-        timestamp_str = message.get("timestamp")
         
         # Parse timestamp
-        if timestamp_str:
-            try:
-                timestamp = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-            except:
-                timestamp = datetime.utcnow()
-        else:
-            timestamp = datetime.utcnow()
+        timestamp = _parse_timestamp(message.get("timestamp"))
         
         # Generate source_id and session_id
-        import hashlib
-        source_id = hashlib.md5(f"{message.get('connector_id', 'unknown')}_{timestamp}_{json.dumps(raw_data)}".encode()).hexdigest()[:16]
+        # Serialize the payload once: it feeds the source_id hash and the insert
+        payload = _dumps(raw_data)
+        source_id = hashlib.blake2b(
+            f"{message.get('connector_id', 'unknown')}_{timestamp}_".encode() + payload, digest_size=8
+        ).hexdigest()
         session_id = message.get("session_id", str(uuid.uuid4()))
         
         async with pool.acquire() as conn:
-            inserted_id = await conn.fetchval("""
-                INSERT INTO websocket_messages (
-                    timestamp, exchange, instrument, price, data, message_type
-                ) VALUES ($1, $2, $3, $4, $5, $6)
-                RETURNING id
-            """,
+            inserted_id = await conn.fetchval(
+                _SQL_INSERT_WS_MESSAGE_SHORT,
                 timestamp,
                 exchange,
                 instrument,
                 price,
-                json.dumps(raw_data),
+                payload,
                 message_type
             )
             
@@ -2599,7 +3385,6 @@ async def save_websocket_to_db(message: dict) -> Optional[Dict[str, Any]]:
             }
     except Exception as e:
         logger.error(f"Error saving WebSocket message to database: {e}")
-        import traceback
         traceback.print_exc()
         return None
 
@@ -2611,6 +3396,10 @@ websocket_stream_manager = WebSocketStreamManager(
 )
 
 
+# websocket_messages columns COPYed for each message of a saved batch
+_WS_BATCH_MESSAGE_COLUMNS = ("timestamp", "exchange", "instrument", "price", "data", "message_type", "latency_ms")
+
+
 @app.post("/api/websocket/save-batch")
 async def save_websocket_batch(batch: WebSocketBatch):
     """Save a batch of WebSocket messages to PostgreSQL - saves both batch and individual messages"""
@@ -2619,11 +3408,7 @@ async def save_websocket_batch(batch: WebSocketBatch):
         
         # Convert batch to dict and ensure timestamp is datetime
         batch_dict = batch.dict()
-        timestamp = batch_dict.get("timestamp")
-        if isinstance(timestamp, str):
-            timestamp = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-        elif timestamp is None:
-            timestamp = datetime.utcnow()
+        timestamp = _parse_timestamp(batch_dict.get("timestamp"))
         
         messages = batch_dict.get("messages", [])
         exchange = batch_dict.get("exchange", "custom")
@@ -2644,106 +3429,47 @@ async def save_websocket_batch(batch: WebSocketBatch):
                     batch_dict.get("total_messages"),
                     batch_dict.get("messages_per_second"),
                     batch_dict.get("instruments", []),
-                    json.dumps(messages),
-                    json.dumps(batch_dict.get("metrics", {}))
+                    messages,
+                    batch_dict.get("metrics", {})
                 )
                 
                 # 2. Save each individual message to websocket_messages table
-                saved_count = 0
+                rows = []
                 for msg in messages:
                     try:
                         # Extract instrument and price from message
-                        instrument = None
-                        price = None
                         raw_data = msg.get("data", {})
-                        
-                        # Extract instrument
-                        if isinstance(raw_data, dict):
-                            if "arg" in raw_data and isinstance(raw_data["arg"], dict):
-                                instrument = raw_data["arg"].get("instId")
-                            elif "stream" in raw_data:
-                                symbol = raw_data["stream"].split("@")[0].upper()
-                                if len(symbol) == 6:
-                                    instrument = f"{symbol[:3]}-{symbol[3:]}"
-                                else:
-                                    instrument = symbol
-                            elif "s" in raw_data:
-                                symbol = raw_data["s"]
-                                if len(symbol) == 6:
-                                    instrument = f"{symbol[:3]}-{symbol[3:]}"
-                                else:
-                                    instrument = symbol
-                        
-                        # Extract price
-                        def extract_price(data_obj, depth=0, max_depth=5):
-                            if not data_obj or depth > max_depth:
-                                return None
-                            if isinstance(data_obj, dict):
-                                for price_field in ["px", "p", "last", "c", "price", "close", "lastPrice", "tradePrice"]:
-                                    if price_field in data_obj and data_obj[price_field] is not None:
-                                        try:
-                                            price_val = data_obj[price_field]
-                                            if isinstance(price_val, str):
-                                                price_val = price_val.strip()
-                                                if price_val and price_val != "null" and price_val != "None":
-                                                    return float(price_val)
-                                            elif isinstance(price_val, (int, float)):
-                                                return float(price_val)
-                                        except (ValueError, TypeError):
-                                            continue
-                                if "data" in data_obj:
-                                    nested_price = extract_price(data_obj["data"], depth + 1, max_depth)
-                                    if nested_price is not None:
-                                        return nested_price
-                                for key, value in data_obj.items():
-                                    if key not in ["arg", "stream", "event", "op", "id"]:
-                                        nested_price = extract_price(value, depth + 1, max_depth)
-                                        if nested_price is not None:
-                                            return nested_price
-                            elif isinstance(data_obj, list) and len(data_obj) > 0:
-                                nested_price = extract_price(data_obj[0], depth + 1, max_depth)
-                                if nested_price is not None:
-                                    return nested_price
-                            return None
-                        
-                        price = extract_price(raw_data)
+                        instrument, price = _extract_ws_fields(raw_data)
                         
                         # Prepare message timestamp
-                        msg_timestamp = msg.get("timestamp")
-                        if isinstance(msg_timestamp, str):
-                            msg_timestamp = datetime.fromisoformat(msg_timestamp.replace('Z', '+00:00'))
-                        elif msg_timestamp is None:
-                            msg_timestamp = timestamp
+                        msg_timestamp = _parse_timestamp(msg.get("timestamp"), timestamp)
                         
-                        # Insert individual message to websocket_messages table
-                        # Note: Some messages might be saved twice (once individually, once in batch), but that's okay
-                        await conn.execute("""
-                            INSERT INTO websocket_messages (
-                                timestamp, exchange, instrument, price, data, message_type,
-                                latency_ms, message_number, format, extract_time, transform_time,
-                                load_time, total_time
-                            ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13)
-                        """,
+                        rows.append((
                             msg_timestamp,
                             exchange,
                             instrument,
                             price,
-                            json.dumps(raw_data),
+                            # Serialized here so "data": null is stored as JSON null
+                            # (data is NOT NULL) instead of failing the whole COPY
+                            _dumps(raw_data),
                             msg.get("message_type", "trade"),
-                            msg.get("latency_ms"),
-                            None,  # message_number not in batch messages
-                            None,  # format not in batch messages
-                            None,  # extract_time not in batch messages
-                            None,  # transform_time not in batch messages
-                            None,  # load_time not in batch messages
-                            None   # total_time not in batch messages
-                        )
-                        saved_count += 1
+                            msg.get("latency_ms")
+                            # message_number, format and timing columns are not in batch messages
+                        ))
                     except Exception as msg_error:
                         # Log but continue saving other messages
-                        print(f"[WARNING] Error saving individual message in batch: {msg_error}")
+                        logger.warning("Error saving individual message in batch: %s", msg_error)
                         continue
                 
+                # Insert individual messages to websocket_messages table with one binary COPY
+                # (messages that failed to parse were already left out above)
+                # Note: Some messages might be saved twice (once individually, once in batch), but that's okay
+                if rows:
+                    await conn.copy_records_to_table(
+                        "websocket_messages", records=rows, columns=_WS_BATCH_MESSAGE_COLUMNS
+                    )
+                saved_count = len(rows)
+                
                 print(f"[OK] Saved batch to PostgreSQL: {inserted_id} with {saved_count} individual messages")
         
         return {
@@ -2754,7 +3480,6 @@ async def save_websocket_batch(batch: WebSocketBatch):
         }
     except Exception as e:
         print(f"[ERROR] Error saving batch: {e}")
-        import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Error saving batch: {str(e)}")
 
@@ -2790,6 +3515,179 @@ async def get_postgres_status():
         return {"status": "disconnected", "error": str(e)}
 
 
+def _json_default(value):
+    """orjson fallback for NUMERIC columns, encoded as FastAPI's jsonable_encoder does"""
+    if isinstance(value, Decimal):
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+# /api/websocket/data query text per shape, built once at import: every request
+# of a shape sends the exact same SQL, so asyncpg's statement cache reuses the
+# connection's prepared statement instead of parsing and planning again
+_WS_DATA_TABLES = {"messages": "websocket_messages", "batches": "websocket_batches"}
+_WS_DATA_SORT_FIELDS = ("timestamp", "message_number", "price", "id")
+# Keyset pages need a non-null sort key
+_WS_KEYSET_SORT_FIELDS = ("timestamp", "id")
+
+
+def _websocket_where(exchange: bool, instrument: bool) -> Tuple[str, int]:
+    """WHERE clause for the exchange/instrument filters present, and the next $n"""
+    conditions = []
+    if exchange:
+        conditions.append(f"exchange = ${len(conditions) + 1}")
+    if instrument:
+        conditions.append(f"instrument = ${len(conditions) + 1}")
+    return ("WHERE " + " AND ".join(conditions) if conditions else ""), len(conditions) + 1
+
+
+def _websocket_page_sql(table_name: str, exchange: bool, instrument: bool, sort_field: str,
+                        descending: bool, keyset: bool) -> str:
+    """
+    Page query for one shape. Parameters: the filters, then the cursor
+    (timestamp, id / id only) for keyset pages, then LIMIT (and OFFSET).
+    """
+    where_clause, param_index = _websocket_where(exchange, instrument)
+    sort_direction = "DESC" if descending else "ASC"
+    # id breaks ties so pages never overlap or skip rows
+    order_clause = f"{sort_field} {sort_direction}" if sort_field == "id" else f"{sort_field} {sort_direction}, id {sort_direction}"
+    if keyset:
+        # Keyset page: seek past the cursor row instead of scanning skipped rows
+        op = "<" if descending else ">"
+        if sort_field == "id":
+            seek = f"id {op} ${param_index}"
+            param_index += 1
+        else:
+            seek = f"(timestamp, id) {op} (${param_index}, ${param_index + 1})"
+            param_index += 2
+        return f"""
+            SELECT * FROM {table_name}
+            {where_clause + " AND " if where_clause else "WHERE "}{seek}
+            ORDER BY {order_clause}
+            LIMIT ${param_index}
+        """
+    # Deferred join: page through narrow (sort key, id) tuples, then fetch
+    # only the selected wide rows instead of sorting and skipping them
+    return f"""
+        SELECT t.* FROM {table_name} t
+        JOIN (
+            SELECT id FROM {table_name}
+            {where_clause}
+            ORDER BY {order_clause}
+            LIMIT ${param_index} OFFSET ${param_index + 1}
+        ) page USING (id)
+        ORDER BY {order_clause}
+    """
+
+
+# (table, has exchange, has instrument, sort field, descending, keyset) -> SQL
+_WS_PAGE_SQL = {
+    (table_name, exchange, instrument, sort_field, descending, keyset):
+        _websocket_page_sql(table_name, exchange, instrument, sort_field, descending, keyset)
+    for table_name in _WS_DATA_TABLES.values()
+    for exchange in (False, True)
+    for instrument in (False, True)
+    for sort_field in _WS_DATA_SORT_FIELDS
+    for descending in (False, True)
+    for keyset in ((False, True) if sort_field in _WS_KEYSET_SORT_FIELDS else (False,))
+}
+# (table, has exchange, has instrument) -> SQL
+_WS_COUNT_SQL = {
+    (table_name, exchange, instrument): f"SELECT COUNT(*) FROM {table_name} {_websocket_where(exchange, instrument)[0]}"
+    for table_name in _WS_DATA_TABLES.values()
+    for exchange in (False, True)
+    for instrument in (False, True)
+}
+
+
+# /api/websocket/data totals: COUNT(*) visits every matching row, so results
+# are reused for a few seconds per (table, exchange, instrument)
+WS_COUNT_CACHE_TTL = 5.0
+WS_COUNT_CACHE_MAX_ENTRIES = 256
+# key -> (expires_at (monotonic), count)
+_WS_COUNT_CACHE: Dict[Tuple[str, Optional[str], Optional[str]], Tuple[float, int]] = {}
+
+
+async def _websocket_total(conn, table_name: str, exchange: Optional[str], instrument: Optional[str],
+                           exact: bool) -> int:
+    """
+    Row total for /api/websocket/data. Unfiltered totals come from the planner's
+    pg_class.reltuples estimate and filtered ones from a briefly cached COUNT(*);
+    exact=True always counts (and refreshes the cache).
+    """
+    if not exact and not exchange and not instrument:
+        estimate = await conn.fetchval(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = $1::regclass", table_name
+        )
+        # -1 / 0 until the table is first analyzed
+        if estimate and estimate > 0:
+            return estimate
+    key = (table_name, exchange, instrument)
+    now = time.monotonic()
+    if not exact:
+        entry = _WS_COUNT_CACHE.get(key)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+    params = [value for value in (exchange, instrument) if value]
+    total_count = await conn.fetchval(_WS_COUNT_SQL[table_name, bool(exchange), bool(instrument)], *params)
+    if key not in _WS_COUNT_CACHE and len(_WS_COUNT_CACHE) >= WS_COUNT_CACHE_MAX_ENTRIES:
+        _WS_COUNT_CACHE.clear()
+    _WS_COUNT_CACHE[key] = (now + WS_COUNT_CACHE_TTL, total_count)
+    return total_count
+
+
+# /api/websocket/data pages above this many rows are streamed, fetched from a
+# server-side cursor this many rows at a time
+WS_DATA_STREAM_MIN_LIMIT = 1000
+WS_DATA_STREAM_CHUNK_ROWS = 1000
+
+
+async def _stream_websocket_data(query: str, params: list, table_name: str, exchange: Optional[str],
+                                 instrument: Optional[str], exact_count: bool, cursor: Optional[str],
+                                 keyset: bool, limit: int, skip: int, collection_type: str):
+    """
+    Yield the /api/websocket/data response body (same JSON envelope) while
+    reading the page through a server-side cursor, so only one chunk of rows is
+    held in memory at a time. count, has_more and next_cursor trail the rows.
+    Nothing is yielded before the total and the first chunk were read (see
+    _start_stream).
+    """
+    pool = get_pool()
+    async with pool.acquire() as conn:
+        total_count = await _websocket_total(conn, table_name, exchange, instrument, exact_count)
+        # Cursors only live inside a transaction
+        async with conn.transaction(readonly=True):
+            head = b'{"messages":['
+            buffer = []
+            sent = 0
+            last_row = None
+            async for row in conn.cursor(query, *params, prefetch=WS_DATA_STREAM_CHUNK_ROWS):
+                buffer.append(orjson.dumps(dict(row), default=_json_default))
+                last_row = row
+                if len(buffer) >= WS_DATA_STREAM_CHUNK_ROWS:
+                    yield head + (b"," if sent else b"") + b",".join(buffer)
+                    head = b""
+                    sent += len(buffer)
+                    buffer = []
+            if buffer:
+                yield head + (b"," if sent else b"") + b",".join(buffer)
+                head = b""
+                sent += len(buffer)
+
+    trailer = orjson.dumps({
+        "count": sent,
+        "total": total_count,
+        "skip": skip,
+        "limit": limit,
+        "has_more": (skip + limit) < total_count if exact_count and not cursor else sent == limit,
+        "exact": exact_count,
+        "collection": collection_type,
+        "next_cursor": _encode_keyset_cursor(last_row) if keyset and last_row is not None and sent == limit else None
+    })
+    # Close the messages array and continue the envelope with the trailer's fields
+    yield head + b"]," + trailer[1:]
+
+
 @app.get("/api/websocket/data")
 async def get_websocket_data(
     exchange: Optional[str] = None,
@@ -2798,9 +3696,16 @@ async def get_websocket_data(
     skip: int = 0,
     collection_type: str = "messages",  # "messages" or "batches"
     sort_by: str = "timestamp",  # Field to sort by
-    sort_order: int = -1  # -1 for descending, 1 for ascending
+    sort_order: int = -1,  # -1 for descending, 1 for ascending
+    cursor: Optional[str] = None,  # next_cursor of the previous page (replaces skip)
+    exact_count: bool = False  # count matching rows now instead of an estimate/cached total
 ):
-    """Retrieve WebSocket data from PostgreSQL with pagination"""
+    """
+    Retrieve WebSocket data from PostgreSQL with pagination.
+    Deep pages should follow next_cursor rather than raise skip: a cursor
+    seeks straight to the page while OFFSET scans every skipped row.
+    "total" is approximate unless exact_count=true (see _websocket_total).
+    """
     try:
         pool = get_pool()
         
@@ -2809,78 +3714,55 @@ async def get_websocket_data(
         skip = max(0, skip)
         
         # Choose table
-        if collection_type == "batches":
-            table_name = "websocket_batches"
-        else:
-            table_name = "websocket_messages"
-        
-        # Build WHERE clause
-        where_conditions = []
-        params = []
-        param_index = 1
-        
-        if exchange:
-            where_conditions.append(f"exchange = ${param_index}")
-            params.append(exchange)
-            param_index += 1
-        
-        if instrument:
-            where_conditions.append(f"instrument = ${param_index}")
-            params.append(instrument)
-            param_index += 1
-        
-        where_clause = "WHERE " + " AND ".join(where_conditions) if where_conditions else ""
+        table_name = _WS_DATA_TABLES["batches" if collection_type == "batches" else "messages"]
         
         # Validate sort field
-        valid_sort_fields = ["timestamp", "message_number", "price", "id"]
-        sort_field = sort_by if sort_by in valid_sort_fields else "timestamp"
-        sort_direction = "DESC" if sort_order < 0 else "ASC"
-        
-        # Get total count
-        count_query = f"SELECT COUNT(*) FROM {table_name} {where_clause}"
-        async with pool.acquire() as conn:
-            total_count = await conn.fetchval(count_query, *params)
-        
-        # Build main query with proper parameterization
-        query = f"""
-            SELECT * FROM {table_name}
-            {where_clause}
-            ORDER BY {sort_field} {sort_direction}
-            LIMIT ${param_index} OFFSET ${param_index + 1}
-        """
-        query_params = params + [limit, skip]
+        sort_field = sort_by if sort_by in _WS_DATA_SORT_FIELDS else "timestamp"
+        descending = sort_order < 0
+        keyset = sort_field in _WS_KEYSET_SORT_FIELDS
+        
+        # Filter parameters first, matching the $n order of the statement
+        params = [value for value in (exchange, instrument) if value]
+        if cursor:
+            if not keyset:
+                raise HTTPException(status_code=400, detail="cursor requires sort_by 'timestamp' or 'id'")
+            cursor_ts, cursor_id = _decode_keyset_cursor(cursor)
+            params += [cursor_id] if sort_field == "id" else [cursor_ts, cursor_id]
+            params.append(limit)
+        else:
+            params += [limit, skip]
+        query = _WS_PAGE_SQL[table_name, bool(exchange), bool(instrument), sort_field, descending, bool(cursor)]
+        
+        # Large pages are streamed from a server-side cursor instead of materialized
+        if limit > WS_DATA_STREAM_MIN_LIMIT:
+            return await _start_stream(
+                _stream_websocket_data(query, params, table_name, exchange, instrument, exact_count,
+                                       cursor, keyset, limit, skip, collection_type)
+            )
         
         async with pool.acquire() as conn:
-            rows = await conn.fetch(query, *query_params)
-        
-        # Convert rows to dicts and serialize
-        def serialize_row(row):
-            """Serialize PostgreSQL row for JSON response"""
-            result = {}
-            for key, value in dict(row).items():
-                if isinstance(value, datetime):
-                    result[key] = value.isoformat()
-                elif isinstance(value, dict):
-                    result[key] = value
-                elif isinstance(value, list):
-                    result[key] = value
-                else:
-                    result[key] = value
-            return result
+            total_count = await _websocket_total(conn, table_name, exchange, instrument, exact_count)
+            rows = await conn.fetch(query, *params)
         
-        serialized_messages = [serialize_row(row) for row in rows]
+        # Records become dicts in C and orjson writes the datetimes; no per-column Python pass
+        serialized_messages = [dict(row) for row in rows]
         
-        return {
+        return Response(content=orjson.dumps({
             "messages": serialized_messages, 
             "count": len(serialized_messages),
             "total": total_count,
             "skip": skip,
             "limit": limit,
-            "has_more": (skip + limit) < total_count,
-            "collection": collection_type
-        }
+            # An estimated or cached total can be off near the end: a full page may have more
+            "has_more": (skip + limit) < total_count if exact_count and not cursor else len(rows) == limit,
+            "exact": exact_count,
+            "collection": collection_type,
+            # Pass back as cursor for the next page (timestamp/id sorts only)
+            "next_cursor": _encode_keyset_cursor(rows[-1]) if keyset and rows and len(rows) == limit else None
+        }, default=_json_default), media_type="application/json")
+    except HTTPException:
+        raise
     except Exception as e:
-        import traceback
         error_details = traceback.format_exc()
         print(f"[ERROR] Error retrieving PostgreSQL data: {e}\n{error_details}")
         raise HTTPException(status_code=500, detail=f"Error retrieving data: {str(e)}")
@@ -2890,42 +3772,22 @@ async def get_websocket_data(
 async def get_websocket_data_count(
     exchange: Optional[str] = None,
     instrument: Optional[str] = None,
-    collection_type: str = "messages"
+    collection_type: str = "messages",
+    exact_count: bool = False  # count matching rows now instead of an estimate/cached total
 ):
-    """Get total count of WebSocket data in PostgreSQL"""
+    """Get total count of WebSocket data in PostgreSQL (approximate unless exact_count=true)"""
     try:
         pool = get_pool()
         
         # Choose table
-        if collection_type == "batches":
-            table_name = "websocket_batches"
-        else:
-            table_name = "websocket_messages"
-        
-        # Build WHERE clause
-        where_conditions = []
-        params = []
-        param_index = 1
-        
-        if exchange:
-            where_conditions.append(f"exchange = ${param_index}")
-            params.append(exchange)
-            param_index += 1
-        
-        if instrument:
-            where_conditions.append(f"instrument = ${param_index}")
-            params.append(instrument)
-            param_index += 1
-        
-        where_clause = "WHERE " + " AND ".join(where_conditions) if where_conditions else ""
-        
-        query = f"SELECT COUNT(*) FROM {table_name} {where_clause}"
+        table_name = _WS_DATA_TABLES["batches" if collection_type == "batches" else "messages"]
         
         async with pool.acquire() as conn:
-            total_count = await conn.fetchval(query, *params)
+            total_count = await _websocket_total(conn, table_name, exchange, instrument, exact_count)
         
         return {
             "total": total_count,
+            "exact": exact_count,
             "collection": collection_type,
             "exchange": exchange,
             "instrument": instrument
@@ -2936,6 +3798,24 @@ async def get_websocket_data_count(
 
 # ==================== Connector Management Endpoints ====================
 
+# api_connectors columns exposed through ConnectorResponse (no encrypted blobs)
+_CONNECTOR_RESPONSE_COLUMNS = """
+    id, connector_id, name, api_url, http_method, auth_type, status,
+    polling_interval, protocol_type, exchange_name, created_at, updated_at
+"""
+
+
+async def _get_connector_secrets(connector_id: str):
+    """Connection settings and encrypted headers/params/credentials of a connector, for starting it"""
+    async with get_pool().acquire() as conn:
+        return await conn.fetchrow("""
+            SELECT api_url, http_method, auth_type, polling_interval,
+                   headers_encrypted, query_params_encrypted, credentials_encrypted
+            FROM api_connectors
+            WHERE connector_id = $1
+        """, connector_id)
+
+
 @app.post("/api/connectors", response_model=ConnectorResponse)
 async def create_connector(connector_data: ConnectorCreate):
     """Create a new API connector"""
@@ -2948,7 +3828,6 @@ async def create_connector(connector_data: ConnectorCreate):
         logger.info(f"📝 Generated connector_id: {connector_id}")
         
         # Detect protocol and exchange
-        from connectors.connector_factory import ConnectorFactory
         protocol_type = ConnectorFactory.detect_protocol(connector_data.api_url)
         exchange_name = ConnectorFactory.detect_exchange(connector_data.api_url)
         logger.info(f"📝 Detected protocol: {protocol_type}, exchange: {exchange_name}")
@@ -2971,38 +3850,29 @@ async def create_connector(connector_data: ConnectorCreate):
             logger.info(f"📝 Added Basic Auth credentials (username: {connector_data.username})")
         
         logger.info(f"📝 Encrypting sensitive data...")
-        # Encrypt sensitive data
-        try:
-            headers_encrypted = encryption_service.encrypt_dict(connector_data.headers or {}) if connector_data.headers else None
-            logger.info(f"📝 Headers encrypted: {headers_encrypted is not None}")
-        except Exception as e:
-            logger.error(f"❌ Error encrypting headers: {e}")
-            raise
-        
+        # Encrypt sensitive data in one batch, in a worker thread instead of on the event loop
         try:
-            query_params_encrypted = encryption_service.encrypt_dict(connector_data.query_params or {}) if connector_data.query_params else None
-            logger.info(f"📝 Query params encrypted: {query_params_encrypted is not None}")
-        except Exception as e:
-            logger.error(f"❌ Error encrypting query params: {e}")
-            raise
-        
-        try:
-            credentials_encrypted = encryption_service.encrypt_credentials(credentials) if credentials else None
-            logger.info(f"📝 Credentials encrypted: {credentials_encrypted is not None}")
+            headers_encrypted, query_params_encrypted, credentials_encrypted = await asyncio.to_thread(
+                encryption_service.encrypt_many,
+                [connector_data.headers, connector_data.query_params, credentials]
+            )
+            logger.info("📝 Encrypted headers: %s, query params: %s, credentials: %s",
+                        headers_encrypted is not None, query_params_encrypted is not None,
+                        credentials_encrypted is not None)
         except Exception as e:
-            logger.error(f"❌ Error encrypting credentials: {e}")
+            logger.error("❌ Error encrypting connector data: %s", e)
             raise
         
         logger.info(f"📝 Saving to database...")
         # Save to database
         async with pool.acquire() as conn:
-            inserted_id = await conn.fetchval("""
+            row = await conn.fetchrow(f"""
                 INSERT INTO api_connectors (
                     connector_id, name, api_url, http_method, headers_encrypted,
                     query_params_encrypted, auth_type, credentials_encrypted,
                     status, polling_interval, protocol_type, exchange_name
                 ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12)
-                RETURNING id
+                RETURNING {_CONNECTOR_RESPONSE_COLUMNS}
             """,
                 connector_id, connector_data.name, connector_data.api_url,
                 connector_data.http_method, headers_encrypted, query_params_encrypted,
@@ -3010,13 +3880,7 @@ async def create_connector(connector_data: ConnectorCreate):
                 ConnectorStatus.INACTIVE.value, connector_data.polling_interval,
                 protocol_type, exchange_name
             )
-            logger.info(f"📝 Saved to database with id: {inserted_id}")
-            
-            # Get created connector
-            row = await conn.fetchrow(
-                "SELECT * FROM api_connectors WHERE id = $1", inserted_id
-            )
-            logger.info(f"📝 Retrieved connector from database")
+            logger.info("📝 Saved to database with id: %s", row['id'])
         
         # Create connector instance (outside database transaction to avoid blocking)
         logger.info(f"📝 Creating connector instance in memory...")
@@ -3036,7 +3900,6 @@ async def create_connector(connector_data: ConnectorCreate):
             logger.error(f"❌ Error creating connector instance: {e}")
             # Don't fail the whole request if connector instance creation fails
             # The connector is already saved in DB, instance can be created later
-            import traceback
             traceback.print_exc()
         
         logger.info(f"✅ Connector created successfully: {connector_id}")
@@ -3057,7 +3920,6 @@ async def create_connector(connector_data: ConnectorCreate):
     
     except Exception as e:
         logger.error(f"❌ Error creating connector: {e}")
-        import traceback
         traceback.print_exc()
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -3068,7 +3930,9 @@ async def get_connectors():
     try:
         pool = get_pool()
         async with pool.acquire() as conn:
-            rows = await conn.fetch("SELECT * FROM api_connectors ORDER BY created_at DESC")
+            rows = await conn.fetch(
+                f"SELECT {_CONNECTOR_RESPONSE_COLUMNS} FROM api_connectors ORDER BY created_at DESC"
+            )
         
         return [ConnectorResponse(**dict(row)) for row in rows]
     except Exception as e:
@@ -3082,7 +3946,7 @@ async def get_connector(connector_id: str):
         pool = get_pool()
         async with pool.acquire() as conn:
             row = await conn.fetchrow(
-                "SELECT * FROM api_connectors WHERE connector_id = $1", connector_id
+                f"SELECT {_CONNECTOR_RESPONSE_COLUMNS} FROM api_connectors WHERE connector_id = $1", connector_id
             )
         
         if not row:
@@ -3104,51 +3968,35 @@ async def update_connector(connector_id: str, connector_data: ConnectorUpdate):
         # Get existing connector
         async with pool.acquire() as conn:
             existing = await conn.fetchrow(
-                "SELECT * FROM api_connectors WHERE connector_id = $1", connector_id
+                f"SELECT {_CONNECTOR_RESPONSE_COLUMNS} FROM api_connectors WHERE connector_id = $1", connector_id
             )
             if not existing:
                 raise HTTPException(status_code=404, detail="Connector not found")
             
-            # Build update query
-            updates = []
-            params = []
-            param_index = 1
-            
-            if connector_data.name is not None:
-                updates.append(f"name = ${param_index}")
-                params.append(connector_data.name)
-                param_index += 1
-            
-            if connector_data.api_url is not None:
-                updates.append(f"api_url = ${param_index}")
-                params.append(connector_data.api_url)
-                param_index += 1
-            
-            if connector_data.status is not None:
-                updates.append(f"status = ${param_index}")
-                params.append(connector_data.status.value)
-                param_index += 1
-            
-            if connector_data.polling_interval is not None:
-                updates.append(f"polling_interval = ${param_index}")
-                params.append(connector_data.polling_interval)
-                param_index += 1
-            
-            updates.append(f"updated_at = ${param_index}")
-            params.append(datetime.utcnow())
-            param_index += 1
-            
-            params.append(connector_id)
-            
-            if updates:
-                await conn.execute(
-                    f"UPDATE api_connectors SET {', '.join(updates)} WHERE connector_id = ${param_index}",
-                    *params
-                )
-            
-            # Get updated connector
+            # Only fields whose value actually changes are written
+            changes = {}
+            if connector_data.name is not None and connector_data.name != existing["name"]:
+                changes["name"] = connector_data.name
+            if connector_data.api_url is not None and connector_data.api_url != existing["api_url"]:
+                changes["api_url"] = connector_data.api_url
+            if connector_data.status is not None and connector_data.status.value != existing["status"]:
+                changes["status"] = connector_data.status.value
+            if (connector_data.polling_interval is not None
+                    and connector_data.polling_interval != existing["polling_interval"]):
+                changes["polling_interval"] = connector_data.polling_interval
+            
+            # Nothing changed: skip the UPDATE (no new row version, WAL or updated_at bump)
+            if not changes:
+                return ConnectorResponse(**dict(existing))
+            
+            changes["updated_at"] = datetime.utcnow()
+            updates = [f"{column} = ${index}" for index, column in enumerate(changes, 1)]
+            
+            # Write and read back the updated connector in one round-trip
             row = await conn.fetchrow(
-                "SELECT * FROM api_connectors WHERE connector_id = $1", connector_id
+                f"UPDATE api_connectors SET {', '.join(updates)} WHERE connector_id = ${len(changes) + 1} "
+                f"RETURNING {_CONNECTOR_RESPONSE_COLUMNS}",
+                *changes.values(), connector_id
             )
         
         return ConnectorResponse(**dict(row))
@@ -3175,68 +4023,122 @@ async def delete_connector(connector_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# api_connectors status writes from start/stop are already made by connector_manager;
+# the endpoints' confirming writes are queued and applied by one flusher task,
+# whatever accumulated while the previous write ran going out as a single UPDATE
+CONNECTOR_STATUS_QUEUE_MAX = 1000
+_connector_status_queue: Optional[asyncio.Queue] = None
+_connector_status_flusher: Optional[asyncio.Task] = None
+
+
+async def _write_connector_statuses(statuses: Dict[str, str]):
+    """Apply connector_id -> status to api_connectors in one statement"""
+    async with get_pool().acquire() as conn:
+        await conn.execute(_SQL_UPDATE_CONNECTOR_STATUSES, list(statuses), list(statuses.values()))
+
+
+def _drain_connector_statuses(queue: asyncio.Queue, statuses: Dict[str, str]):
+    """Move everything queued into statuses; later updates of a connector win"""
+    while not queue.empty():
+        connector_id, status = queue.get_nowait()
+        statuses[connector_id] = status
+
+
+async def _flush_connector_statuses(queue: asyncio.Queue):
+    """Drain the status queue into batched UPDATEs until cancelled"""
+    while True:
+        connector_id, status = await queue.get()
+        statuses = {connector_id: status}
+        _drain_connector_statuses(queue, statuses)
+        try:
+            await _write_connector_statuses(statuses)
+        except Exception as e:
+            logger.error("Connector status flusher error: %s", e)
+
+
+def _queue_connector_status(connector_id: str, status: str):
+    """Queue an api_connectors status write without waiting for it"""
+    global _connector_status_queue, _connector_status_flusher
+    if _connector_status_flusher is None or _connector_status_flusher.done():
+        _connector_status_queue = asyncio.Queue(maxsize=CONNECTOR_STATUS_QUEUE_MAX)
+        _connector_status_flusher = asyncio.create_task(_flush_connector_statuses(_connector_status_queue))
+    try:
+        _connector_status_queue.put_nowait((connector_id, status))
+    except asyncio.QueueFull:
+        # connector_manager has written the status already; this write only confirms it
+        logger.warning("Connector status queue full, skipping status write for %s", connector_id)
+
+
+async def stop_connector_status_flusher():
+    """Cancel the flusher and write whatever is still queued"""
+    global _connector_status_flusher
+    if _connector_status_flusher is None:
+        return
+    _connector_status_flusher.cancel()
+    try:
+        await _connector_status_flusher
+    except asyncio.CancelledError:
+        pass
+    _connector_status_flusher = None
+    statuses = {}
+    _drain_connector_statuses(_connector_status_queue, statuses)
+    if statuses:
+        await _write_connector_statuses(statuses)
+
+
 @app.post("/api/connectors/{connector_id}/start")
 async def start_connector(connector_id: str):
     """Start a connector"""
     try:
-        # Load connector from database
-        pool = get_pool()
-        async with pool.acquire() as conn:
-            row = await conn.fetchrow(
-                "SELECT * FROM api_connectors WHERE connector_id = $1", connector_id
+        # Load connector settings and secrets (connection is released before the connector starts)
+        row = await _get_connector_secrets(connector_id)
+        if not row:
+            raise HTTPException(status_code=404, detail="Connector not found")
+        
+        # Decrypt credentials - handle None and empty strings
+        headers_encrypted = row.get("headers_encrypted")
+        query_params_encrypted = row.get("query_params_encrypted")
+        credentials_encrypted = row.get("credentials_encrypted")
+        
+        try:
+            headers = encryption_service.decrypt_dict(headers_encrypted) if headers_encrypted else {}
+        except Exception as e:
+            logger.warning("Failed to decrypt headers: %s, using empty dict", e)
+            headers = {}
+        
+        try:
+            query_params = encryption_service.decrypt_dict(query_params_encrypted) if query_params_encrypted else {}
+        except Exception as e:
+            logger.warning("Failed to decrypt query_params: %s, using empty dict", e)
+            query_params = {}
+        
+        try:
+            credentials = encryption_service.decrypt_credentials(credentials_encrypted) if credentials_encrypted else {}
+        except Exception as e:
+            logger.warning("Failed to decrypt credentials: %s, using empty dict", e)
+            credentials = {}
+        
+        # Create or get connector instance
+        connector = await connector_manager.get_connector(connector_id)
+        if not connector:
+            connector = await connector_manager.create_connector(
+                connector_id=connector_id,
+                api_url=row["api_url"],
+                http_method=row["http_method"],
+                headers=headers,
+                query_params=query_params,
+                credentials=credentials,
+                auth_type=row["auth_type"],
+                polling_interval=row["polling_interval"]
             )
-            if not row:
-                raise HTTPException(status_code=404, detail="Connector not found")
-            
-            # Decrypt credentials - handle None and empty strings
-            headers_encrypted = row.get("headers_encrypted")
-            query_params_encrypted = row.get("query_params_encrypted")
-            credentials_encrypted = row.get("credentials_encrypted")
-            
-            try:
-                headers = encryption_service.decrypt_dict(headers_encrypted) if headers_encrypted else {}
-            except Exception as e:
-                logger.warning(f"Failed to decrypt headers: {e}, using empty dict")
-                headers = {}
-            
-            try:
-                query_params = encryption_service.decrypt_dict(query_params_encrypted) if query_params_encrypted else {}
-            except Exception as e:
-                logger.warning(f"Failed to decrypt query_params: {e}, using empty dict")
-                query_params = {}
-            
-            try:
-                credentials = encryption_service.decrypt_credentials(credentials_encrypted) if credentials_encrypted else {}
-            except Exception as e:
-                logger.warning(f"Failed to decrypt credentials: {e}, using empty dict")
-                credentials = {}
-            
-            # Create or get connector instance
-            connector = await connector_manager.get_connector(connector_id)
-            if not connector:
-                connector = await connector_manager.create_connector(
-                    connector_id=connector_id,
-                    api_url=row["api_url"],
-                    http_method=row["http_method"],
-                    headers=headers,
-                    query_params=query_params,
-                    credentials=credentials,
-                    auth_type=row["auth_type"],
-                    polling_interval=row["polling_interval"]
-                )
-            
-            # Start connector
-            await connector_manager.start_connector(connector_id)
-            
-            # Update api_connectors status to 'running' (also done in connector_manager, but ensure it's set)
-            async with pool.acquire() as conn:
-                await conn.execute("""
-                    UPDATE api_connectors 
-                    SET status = 'running', updated_at = NOW()
-                    WHERE connector_id = $1
-                """, connector_id)
-            
-            return {"message": "Connector started", "connector_id": connector_id}
+        
+        # Start connector
+        await connector_manager.start_connector(connector_id)
+        
+        # Update api_connectors status to 'running' (also done in connector_manager, but ensure it's set)
+        _queue_connector_status(connector_id, "running")
+        
+        return {"message": "Connector started", "connector_id": connector_id}
     except HTTPException:
         raise
     except Exception as e:
@@ -3251,13 +4153,7 @@ async def stop_connector(connector_id: str):
         await connector_manager.stop_connector(connector_id)
         
         # Update api_connectors status to 'inactive' (also done in connector_manager, but ensure it's set)
-        pool = get_pool()
-        async with pool.acquire() as conn:
-            await conn.execute("""
-                UPDATE api_connectors 
-                SET status = 'inactive', updated_at = NOW()
-                WHERE connector_id = $1
-            """, connector_id)
+        _queue_connector_status(connector_id, "inactive")
         
         return {"message": "Connector stopped", "connector_id": connector_id}
     except Exception as e:
@@ -3463,103 +4359,34 @@ async def list_active_etl_apis(lookback_minutes: int = 90):
         pool = get_pool()
         cutoff = datetime.utcnow() - timedelta(minutes=lookback_minutes)
         async with pool.acquire() as conn:
-            # Fetch pipeline steps for fast lookup
-            pipeline_steps_map = {}
-            try:
-                steps = await conn.fetch("SELECT * FROM pipeline_steps")
-                for step in steps:
-                    pipeline_steps_map[step['pipeline_name']] = dict(step)
-            except Exception as e:
-                logger.warning(f"Could not fetch pipeline_steps: {e}")
-
-            connectors = await conn.fetch(
-                """
-                SELECT connector_id, name, api_url, polling_interval, status, exchange_name
-                FROM api_connectors
-                WHERE status IN ('active', 'running', 'started', 'enabled')
-                ORDER BY connector_id
-                """
-            )
-
-            results = []
-            for row in connectors:
-                row_dict = dict(row)
-                connector_id = row_dict["connector_id"]
-                
-                # Get latest activity timestamps (still useful for liveness check)
-                last_data = await conn.fetchrow(
-                    """
-                    SELECT timestamp, status_code, response_time_ms
-                    FROM api_connector_data
-                    WHERE connector_id = $1
-                    ORDER BY timestamp DESC
-                    LIMIT 1
-                    """,
-                    connector_id,
-                )
-                last_item = await conn.fetchrow(
-                    """
-                    SELECT timestamp
-                    FROM api_connector_items
-                    WHERE connector_id = $1
-                    ORDER BY timestamp DESC
-                    LIMIT 1
-                    """,
-                    connector_id,
-                )
-                
-                # Get counts - prefer pipeline_steps, fallback to slow COUNT(*)
-                if connector_id in pipeline_steps_map:
-                    step_info = pipeline_steps_map[connector_id]
-                    total_data = step_info.get('extract_count', 0)
-                    total_items = step_info.get('transform_count', 0)
-                    # Use status from pipeline_steps if available? 
-                    # User said "Status should change automatically: PENDING -> RUNNING -> COMPLETED"
-                    # But the connector status in api_connectors is 'active'. 
-                    # We might want to show the pipeline status too, but this endpoint returns connector status.
-                    # We'll stick to counts for now to avoid breaking frontend.
-                else:
-                    totals = await conn.fetchrow(
-                        """
-                        SELECT 
-                            (SELECT COUNT(*) FROM api_connector_data WHERE connector_id = $1) AS total_data,
-                            (SELECT COUNT(*) FROM api_connector_items WHERE connector_id = $1) AS total_items
-                        """,
-                        connector_id,
-                    )
-                    totals_dict = dict(totals) if totals else {}
-                    total_data = totals_dict.get("total_data", 0)
-                    total_items = totals_dict.get("total_items", 0)
+            connectors = await conn.fetch(_SQL_ACTIVE_ETL_APIS)
 
-                last_ts_candidates = []
-                if last_data and dict(last_data).get("timestamp"):
-                    last_ts_candidates.append(dict(last_data).get("timestamp"))
-                if last_item and dict(last_item).get("timestamp"):
-                    last_ts_candidates.append(dict(last_item).get("timestamp"))
-                last_ts = max(last_ts_candidates) if last_ts_candidates else None
+        results = []
+        for row in connectors:
+            # Counts come from pipeline_steps, or the COUNT(*) fallback when it has no row
+            last_ts_candidates = [ts for ts in (row["last_data_at"], row["last_item_at"]) if ts]
+            last_ts = max(last_ts_candidates) if last_ts_candidates else None
 
-                # Treat scheduler-managed APIs as ACTIVE as long as connector exists
-                status_label = "ACTIVE"
+            # Treat scheduler-managed APIs as ACTIVE as long as connector exists
+            status_label = "ACTIVE"
 
-                last_data_dict = dict(last_data) if last_data else {}
-
-                results.append(
-                    {
-                        "connector_id": connector_id,
-                        "name": row_dict.get("name"),
-                        "api_url": row_dict.get("api_url"),
-                        "exchange_name": row_dict.get("exchange_name"),
-                        "polling_interval": row_dict.get("polling_interval"),
-                        "status": status_label,
-                        "last_timestamp": last_ts,
-                        "last_status_code": last_data_dict.get("status_code") if last_data_dict else None,
-                        "last_response_time_ms": float(last_data_dict.get("response_time_ms"))
-                        if last_data_dict and last_data_dict.get("response_time_ms") is not None
-                        else None,
-                        "total_records": total_data,
-                        "total_items": total_items,
-                    }
-                )
+            results.append(
+                {
+                    "connector_id": row["connector_id"],
+                    "name": row["name"],
+                    "api_url": row["api_url"],
+                    "exchange_name": row["exchange_name"],
+                    "polling_interval": row["polling_interval"],
+                    "status": status_label,
+                    "last_timestamp": last_ts,
+                    "last_status_code": row["status_code"],
+                    "last_response_time_ms": float(row["response_time_ms"])
+                    if row["response_time_ms"] is not None
+                    else None,
+                    "total_records": row["total_data"],
+                    "total_items": row["total_items"],
+                }
+            )
 
         return results
     except Exception as e:
@@ -3880,30 +4707,17 @@ async def get_connector_data(
             raw_response_field = row_dict.get("raw_response")
             
             # Parse data if it's a string
-            if isinstance(data_field, str):
-                try:
-                    data_field = json.loads(data_field)
-                except:
-                    pass
+            data_field = _loads(data_field)
             
             # Parse raw_response if it's a string
-            if isinstance(raw_response_field, str):
-                try:
-                    raw_response_field = json.loads(raw_response_field)
-                except:
-                    pass
+            raw_response_field = _loads(raw_response_field)
             
-            # Format timestamp
-            timestamp = row_dict.get("timestamp")
-            if isinstance(timestamp, datetime):
-                timestamp = timestamp.isoformat()
-            
-            # Create table-friendly format
+            # Create table-friendly format (orjson writes the timestamp as ISO 8601)
             formatted = {
                 "id": row_dict.get("id"),
                 "source_id": row_dict.get("source_id") or str(row_dict.get("id", "")),
                 "session_id": row_dict.get("session_id") or connector_id,
-                "timestamp": timestamp,
+                "timestamp": row_dict.get("timestamp"),
                 "connector_id": row_dict.get("connector_id") or connector_id,
                 "exchange": row_dict.get("exchange") or "unknown",
                 "instrument": row_dict.get("instrument") or "-",
@@ -3921,7 +4735,7 @@ async def get_connector_data(
         
         logger.info(f"Returning {len(serialized_data)} records for connector {connector_id} (total: {total_count})")
         
-        return {
+        return Response(content=orjson.dumps({
             "data": serialized_data,
             "count": len(serialized_data),
             "total": total_count,
@@ -3929,10 +4743,9 @@ async def get_connector_data(
             "limit": limit,
             "has_more": (skip + limit) < total_count,
             "connector_id": connector_id
-        }
+        }, default=_json_default), media_type="application/json")
     except Exception as e:
         logger.error(f"Error getting connector data: {e}")
-        import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -4040,7 +4853,6 @@ async def connect_websocket_stream(request: WebSocketConnectRequest):
     
     except Exception as e:
         logger.error(f"Error connecting WebSocket stream: {e}")
-        import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -4138,7 +4950,6 @@ async def websocket_endpoint(websocket: WebSocket):
         logger.info("WebSocket client disconnected normally")
     except Exception as e:
         logger.error(f"WebSocket error: {e}")
-        import traceback
         traceback.print_exc()
     finally:
         connection_manager.disconnect(websocket)
@@ -4259,7 +5070,6 @@ async def preview_file(request: Dict[str, str]):
         return {"preview": preview}
     except Exception as e:
         logger.error(f"Error previewing file: {e}")
-        import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -4385,7 +5195,6 @@ async def process_file(request: ProcessFileRequest):
         }
     except Exception as e:
         logger.error(f"Error processing file: {e}")
-        import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -4618,7 +5427,6 @@ async def get_api_gateway_telemetry(
             }
     except Exception as e:
         logger.error(f"[API GATEWAY] Failed to get telemetry: {e}")
-        import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -4959,6 +5767,13 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     args = parser.parse_args()
 
+    # uvloop (epoll-based, shipped with uvicorn[standard]) is unavailable on Windows
+    try:
+        import uvloop  # noqa: F401
+        loop_impl = "uvloop"
+    except ImportError:
+        loop_impl = "asyncio"
+
     if False:  # Placeholder for future command-line arguments
         pass
     else:
@@ -4967,6 +5782,7 @@ if __name__ == "__main__":
             host="0.0.0.0",
             port=int(os.getenv("PORT", 8000)),
             reload=True,
-            reload_dirs=["."]
+            reload_dirs=["."],
+            loop=loop_impl
         )
 
@@ -18,10 +18,13 @@ from datetime import datetime
 
 from services.delta_processor import process_api_data_with_delta, DeltaProcessor
 from services.api_data_transformer import transform_api_response
-from database import get_pool, update_pipeline_counts, get_last_success_ts, update_last_success_ts
+from database import get_pool, update_pipeline_counts, get_last_success_ts, update_last_success_ts, upsert_coins
 
 logger = logging.getLogger(__name__)
 
+# Connector whose markets response is also stored one coin per row in the coins table
+COINS_CONNECTOR_ID = "coingecko_top"
+
 
 async def save_to_database_with_delta(message: dict) -> Dict[str, Any]:
     """
@@ -89,6 +92,16 @@ async def save_to_database_with_delta(message: dict) -> Dict[str, Any]:
         else:
             ingestion_timestamp = datetime.utcnow()
         
+        batch_id = message.get("batch_id") or str(uuid.uuid4())
+        
+        # The full markets response goes to the coins table, unchanged coins included
+        if connector_id == COINS_CONNECTOR_ID and isinstance(raw_data, list):
+            try:
+                coins_saved = await upsert_coins(batch_id, ingestion_timestamp, json.dumps(raw_data))
+                logger.info("[DELTA] %s: Upserted %s coins (batch_id=%s)", connector_id, coins_saved, batch_id)
+            except Exception as coins_error:
+                logger.warning("[DELTA] Failed to upsert coins for %s: %s", connector_id, coins_error)
+        
         # Step 0: Fetch last_success_ts for timestamp-based delta logic
         last_success_ts = None
         try:
@@ -207,9 +220,10 @@ async def save_to_database_with_delta(message: dict) -> Dict[str, Any]:
                             session_id,
                             primary_key,
                             delta_type,
-                            pipeline_run_id
+                            pipeline_run_id,
+                            batch_id
                         )
-                        VALUES ($1, $2, NOW(), $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15)
+                        VALUES ($1, $2, NOW(), $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16)
                         ON CONFLICT (connector_id, primary_key)
                         DO UPDATE SET
                             timestamp = EXCLUDED.timestamp,
@@ -224,7 +238,8 @@ async def save_to_database_with_delta(message: dict) -> Dict[str, Any]:
                             source_id = EXCLUDED.source_id,
                             session_id = EXCLUDED.session_id,
                             delta_type = EXCLUDED.delta_type,
-                            pipeline_run_id = EXCLUDED.pipeline_run_id
+                            pipeline_run_id = EXCLUDED.pipeline_run_id,
+                            batch_id = EXCLUDED.batch_id
                         RETURNING id
                     """,
                         connector_id,
@@ -241,7 +256,8 @@ async def save_to_database_with_delta(message: dict) -> Dict[str, Any]:
                         session_id,
                         primary_key,
                         delta_type,
-                        pipeline_run_id
+                        pipeline_run_id,
+                        batch_id
                     )
                     
                     if row_id:
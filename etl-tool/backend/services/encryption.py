@@ -78,6 +78,10 @@ class EncryptionService:
             except:
                 raise ValueError(f"Failed to decrypt or parse data: {str(e)}")
     
+    def encrypt_many(self, payloads: list) -> list:
+        """Encrypt several dictionaries in one call; empty ones come back as None"""
+        return [self.encrypt_dict(payload) if payload else None for payload in payloads]
+    
     def encrypt_credentials(self, credentials: dict) -> str:
         """Encrypt API credentials dictionary"""
         return self.encrypt_dict(credentials)
@@ -5,6 +5,7 @@ from typing import Dict, Any, Optional, List
 from datetime import datetime
 import logging
 import json
+from services.ws_fields import find_price
 
 logger = logging.getLogger(__name__)
 
@@ -133,43 +134,5 @@ class MessageProcessor:
         if not data:
             return None
         
-        def find_price(obj, depth=0, max_depth=5):
-            """Recursively find price in nested structure"""
-            if not obj or depth > max_depth:
-                return None
-            
-            if isinstance(obj, dict):
-                # Try common price field names
-                for price_field in ["px", "p", "last", "c", "price", "close", "lastPrice", "tradePrice"]:
-                    if price_field in obj and obj[price_field] is not None:
-                        try:
-                            price_val = obj[price_field]
-                            if isinstance(price_val, str):
-                                price_val = price_val.strip()
-                                if price_val and price_val not in ["null", "None", ""]:
-                                    return float(price_val)
-                            elif isinstance(price_val, (int, float)):
-                                return float(price_val)
-                        except (ValueError, TypeError):
-                            continue
-                
-                # Recursively search nested structures
-                if "data" in obj:
-                    nested_price = find_price(obj["data"], depth + 1, max_depth)
-                    if nested_price is not None:
-                        return nested_price
-                
-                for key, value in obj.items():
-                    if key not in ["arg", "stream", "event", "op", "id"]:
-                        nested_price = find_price(value, depth + 1, max_depth)
-                        if nested_price is not None:
-                            return nested_price
-            
-            elif isinstance(obj, list) and len(obj) > 0:
-                # Check first element
-                nested_price = find_price(obj[0], depth + 1, max_depth)
-                if nested_price is not None:
-                    return nested_price
-        
         return find_price(data)
 
@@ -10,6 +10,7 @@ from typing import Dict, Any, Optional, Callable
 from datetime import datetime
 import uuid
 from urllib.parse import urlparse
+from services.ws_fields import find_price
 
 logger = logging.getLogger(__name__)
 
@@ -335,44 +336,7 @@ class WebSocketStreamManager:
         if not isinstance(data, dict):
             return None
         
-        # Recursive price extraction
-        def _find_price(obj, depth=0, max_depth=5):
-            if not obj or depth > max_depth:
-                return None
-            
-            if isinstance(obj, dict):
-                # Try common price fields
-                for price_field in ["px", "p", "last", "c", "price", "close", "lastPrice", "tradePrice"]:
-                    if price_field in obj and obj[price_field] is not None:
-                        try:
-                            price_val = obj[price_field]
-                            if isinstance(price_val, str):
-                                price_val = price_val.strip()
-                                if price_val and price_val not in ["null", "None"]:
-                                    return float(price_val)
-                            elif isinstance(price_val, (int, float)):
-                                return float(price_val)
-                        except (ValueError, TypeError):
-                            continue
-                
-                # Check nested "data" field
-                if "data" in obj:
-                    nested_price = _find_price(obj["data"], depth + 1, max_depth)
-                    if nested_price is not None:
-                        return nested_price
-                
-                # Recursively search
-                for value in obj.values():
-                    nested_price = _find_price(value, depth + 1, max_depth)
-                    if nested_price is not None:
-                        return nested_price
-            
-            elif isinstance(obj, list) and len(obj) > 0:
-                return _find_price(obj[0], depth + 1, max_depth)
-            
-            return None
-        
-        return _find_price(data)
+        return find_price(data)
     
     def _detect_message_type(self, data: Dict[str, Any], connection_info: Dict[str, Any]) -> str:
         """Detect message type from data structure"""
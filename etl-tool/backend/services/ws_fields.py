@@ -0,0 +1,69 @@
+"""
+Price lookup shared by the WebSocket save endpoints, the message processor
+and the WebSocket stream manager
+"""
+from typing import Any, Optional, Tuple
+
+# Price field names tried, in order, by the recursive price search
+PRICE_FIELDS = ("px", "p", "last", "c", "price", "close", "lastPrice", "tradePrice")
+_PRICE_FIELD_SET = frozenset(PRICE_FIELDS)
+# Metadata keys that never hold a price
+_SKIPPED_PRICE_KEYS = frozenset(("arg", "stream", "event", "op", "id"))
+
+
+def to_price(value) -> Optional[float]:
+    """Parse a wire price (number or numeric string); None when absent or invalid"""
+    if isinstance(value, str):
+        value = value.strip()
+        if not value or value == "null" or value == "None":
+            return None
+    elif not isinstance(value, (int, float)):
+        return None
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def first_price(obj: dict, fields: Tuple[str, ...]) -> Optional[float]:
+    """First parseable price among fields of obj"""
+    for field in fields:
+        value = obj.get(field)
+        if value is not None:
+            price = to_price(value)
+            if price is not None:
+                return price
+    return None
+
+
+def find_price(obj: Any, depth: int = 0, max_depth: int = 5) -> Optional[float]:
+    """Recursive price search for messages of unknown shape"""
+    if not obj or depth > max_depth:
+        return None
+    if isinstance(obj, dict):
+        # One set intersection finds the price fields present; most levels have none
+        hits = _PRICE_FIELD_SET.intersection(obj.keys())
+        if hits:
+            for field in PRICE_FIELDS:
+                if field in hits:
+                    price = to_price(obj[field])
+                    if price is not None:
+                        return price
+        # Check "data" field first (common in OKX, Binance stream format)
+        data = obj.get("data")
+        if data:
+            price = find_price(data, depth + 1, max_depth)
+            if price is not None:
+                return price
+        # "data" was searched above; searching it again cannot find a price
+        for key, value in obj.items():
+            if key != "data" and key not in _SKIPPED_PRICE_KEYS:
+                price = find_price(value, depth + 1, max_depth)
+                if price is not None:
+                    return price
+    elif isinstance(obj, list):
+        for item in obj:
+            price = find_price(item, depth + 1, max_depth)
+            if price is not None:
+                return price
+    return None
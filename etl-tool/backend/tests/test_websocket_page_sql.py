@@ -0,0 +1,69 @@
+"""
+/api/websocket/data page SQL placeholder numbering and keyset cursors.
+Pure string building, no database needed: python -m pytest tests
+"""
+import re
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from main import _decode_keyset_cursor, _encode_keyset_cursor, _websocket_page_sql
+
+
+def _placeholders(sql):
+    return [int(n) for n in re.findall(r"\$(\d+)", sql)]
+
+
+def _filter_params(exchange, instrument):
+    """The handler passes the filters first, exchange before instrument"""
+    return [name for name, present in (("exchange", exchange), ("instrument", instrument)) if present]
+
+
+@pytest.mark.parametrize("exchange", [False, True])
+@pytest.mark.parametrize("instrument", [False, True])
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("sort_field", ["timestamp", "message_number", "price", "id"])
+def test_offset_page_placeholders(exchange, instrument, descending, sort_field):
+    sql = _websocket_page_sql("websocket_messages", exchange, instrument, sort_field, descending, False)
+    filters = _filter_params(exchange, instrument)
+    for index, name in enumerate(filters, start=1):
+        assert f"{name} = ${index}" in sql
+    limit_index = len(filters) + 1
+    assert f"LIMIT ${limit_index} OFFSET ${limit_index + 1}" in sql
+    assert sorted(set(_placeholders(sql))) == list(range(1, limit_index + 2))
+
+
+@pytest.mark.parametrize("exchange", [False, True])
+@pytest.mark.parametrize("instrument", [False, True])
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("sort_field", ["timestamp", "id"])
+def test_keyset_page_placeholders(exchange, instrument, descending, sort_field):
+    sql = _websocket_page_sql("websocket_messages", exchange, instrument, sort_field, descending, True)
+    filters = _filter_params(exchange, instrument)
+    for index, name in enumerate(filters, start=1):
+        assert f"{name} = ${index}" in sql
+    cursor_index = len(filters) + 1
+    op = "<" if descending else ">"
+    if sort_field == "id":
+        assert f"id {op} ${cursor_index}" in sql
+        limit_index = cursor_index + 1
+    else:
+        assert f"(timestamp, id) {op} (${cursor_index}, ${cursor_index + 1})" in sql
+        limit_index = cursor_index + 2
+    assert f"LIMIT ${limit_index}" in sql
+    assert "OFFSET" not in sql
+    assert sorted(set(_placeholders(sql))) == list(range(1, limit_index + 1))
+
+
+def test_keyset_cursor_round_trip():
+    timestamp = datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+    cursor = _encode_keyset_cursor({"timestamp": timestamp, "id": 4242})
+    assert _decode_keyset_cursor(cursor) == (timestamp, 4242)
+
+
+@pytest.mark.parametrize("cursor", ["not base64!", "bm8tc2VwYXJhdG9y", "bm90LWEtZGF0ZXwxMg==", "MjAyNC0wNS0wMXh8eQ=="])
+def test_malformed_cursor_is_http_400(cursor):
+    with pytest.raises(HTTPException) as excinfo:
+        _decode_keyset_cursor(cursor)
+    assert excinfo.value.status_code == 400
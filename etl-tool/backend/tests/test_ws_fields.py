@@ -0,0 +1,41 @@
+"""
+_extract_ws_fields on the WebSocket wire formats the save endpoints receive.
+Pure parsing, no database needed: python -m pytest tests
+"""
+from main import _extract_ws_fields
+
+
+def test_okx_push():
+    raw = {
+        "arg": {"channel": "trades", "instId": "BTC-USDT"},
+        "data": [{"instId": "BTC-USDT", "px": "42000.5", "sz": "0.1"}],
+    }
+    assert _extract_ws_fields(raw) == ("BTC-USDT", 42000.5)
+
+
+def test_binance_combined_stream():
+    raw = {"stream": "btcusdt@trade", "data": {"e": "trade", "s": "BTCUSDT", "p": "42000.50"}}
+    assert _extract_ws_fields(raw) == ("BTCUSDT", 42000.5)
+
+
+def test_binance_raw_stream():
+    raw = {"e": "24hrTicker", "s": "ETHUSDT", "c": "2500.1"}
+    assert _extract_ws_fields(raw) == ("ETHUSDT", 2500.1)
+
+
+def test_unknown_dict_uses_recursive_search():
+    raw = {"type": "ticker", "payload": {"ticker": {"lastPrice": "1.5"}}}
+    assert _extract_ws_fields(raw) == (None, 1.5)
+
+
+def test_non_dict_payload():
+    assert _extract_ws_fields([{"price": 3.25}]) == (None, 3.25)
+
+
+def test_known_shape_without_price_falls_back():
+    raw = {"arg": {"instId": "BTC-USDT"}, "data": [{"instId": "BTC-USDT"}], "ticker": {"last": "7"}}
+    assert _extract_ws_fields(raw) == ("BTC-USDT", 7.0)
+
+
+def test_invalid_price():
+    assert _extract_ws_fields({"s": "BTCUSDT", "p": "abc"}) == ("BTCUSDT", None)